@@ -0,0 +1,109 @@
+"""Per-call latency of run triggering.
+
+Compares the bulk stage run insert in RunService.trigger_run against the
+previous one-ORM-object-per-row approach for 10, 100 and 1,000 stage
+pipelines.
+
+Usage (from backend/):
+    DATABASE_URL=sqlite:///:memory: python -m benchmarks.bench_bulk_insert
+"""
+
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.config import settings
+from src.core.database import Base
+from src.models.dto import PipelineCreate, TriggerRunRequest
+from src.models.schema.pipeline import PipelineStage
+from src.models.schema.run import PipelineRun, RunStatus, StageRun
+from src.services import PipelineService, RunService
+
+STAGE_COUNTS = [10, 100, 1000]
+REPEATS = 5
+
+
+def make_engine():
+    if settings.database_url.startswith("sqlite"):
+        return create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    return create_engine(settings.database_url)
+
+
+def make_pipeline_data(stage_count: int) -> PipelineCreate:
+    return PipelineCreate(
+        name=f"bench-{stage_count}",
+        stages=[
+            {
+                "name": f"stage-{i}",
+                "stage_type": "CUSTOM",
+                "custom_name": "x",
+                "order": i,
+            }
+            for i in range(stage_count)
+        ],
+    )
+
+
+def legacy_trigger_run(db, pipeline_id) -> PipelineRun:
+    db_run = PipelineRun(pipeline_id=pipeline_id, status=RunStatus.PENDING)
+    db.add(db_run)
+    db.flush()
+    for stage in db.query(PipelineStage).filter_by(pipeline_id=pipeline_id).all():
+        db.add(StageRun(pipeline_run_id=db_run.id, stage_id=stage.id))
+    db.commit()
+    return db_run
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_benchmark():
+    engine = make_engine()
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    print(f"{'stages':>7} {'path':>7} {'trigger ms':>11}")
+    for stage_count in STAGE_COUNTS:
+        pipeline_data = make_pipeline_data(stage_count)
+
+        for path in ("legacy", "bulk"):
+            trigger_times = []
+            for _ in range(REPEATS):
+                db = Session()
+                pipeline_id = uuid.UUID(
+                    PipelineService(db).create_pipeline(pipeline_data).id
+                )
+                if path == "bulk":
+                    trigger_times.append(
+                        timed(
+                            RunService(db).trigger_run, pipeline_id, TriggerRunRequest()
+                        )
+                    )
+                else:
+                    trigger_times.append(timed(legacy_trigger_run, db, pipeline_id))
+                db.close()
+
+            print(
+                f"{stage_count:>7} {path:>7} "
+                f"{statistics.median(trigger_times):>11.2f}"
+            )
+
+    # trigger_run schedules the simulated executor; don't let it run on
+    for task in asyncio.all_tasks() - {asyncio.current_task()}:
+        task.cancel()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,105 @@
+"""Serialization cost of a run list page.
+
+Compares FastAPI's response_model path (dump the DTOs, validate them again
+against the response model, run jsonable_encoder, json.dumps) with the single
+pass through a prebuilt TypeAdapter used by the list endpoints, for pages of
+100 and 1,000 runs. DTOs are built up front; only serialization is timed.
+
+Usage (from backend/):
+    DATABASE_URL=sqlite:///:memory: python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.core.serialization import serialized_response
+from src.models.dto import PaginationResponse, PipelineRunResponse
+from src.models.schema.run import PipelineRun, RunStatus, TriggerType
+from src.services.run_service import run_response
+
+PAGE_SIZES = [100, 1000]
+REPEATS = 20
+
+RESPONSE_TYPE = PaginationResponse[PipelineRunResponse]
+
+
+def make_page(size: int) -> PaginationResponse:
+    now = datetime.utcnow()
+    pipeline_id = uuid.uuid4()
+    runs = [
+        PipelineRun(
+            id=uuid.uuid4(),
+            pipeline_id=pipeline_id,
+            status=RunStatus.COMPLETED,
+            trigger_type=TriggerType.MANUAL,
+            triggered_by="ci",
+            started_at=now - timedelta(minutes=5),
+            completed_at=now,
+            execution_time=300.5,
+            run_config={"batchSize": 64, "optimizer": {"name": "adam", "lr": 1e-3}},
+            environment="production",
+            max_memory_usage=512.0,
+            max_cpu_usage=73.2,
+            success_count=8,
+            failed_count=0,
+            output_data={"message": "Pipeline completed successfully"},
+            tags=["nightly", "gpu"],
+            created_at=now,
+            updated_at=now,
+            version=3,
+        )
+        for _ in range(size)
+    ]
+    return PaginationResponse.create(
+        items=[run_response(run) for run in runs],
+        total=size,
+        page=1,
+        size=size,
+    )
+
+
+async def response_model_path(field, page) -> bytes:
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+def fast_path(page) -> bytes:
+    return serialized_response(page, RESPONSE_TYPE).body
+
+
+async def run_benchmark():
+    field = create_model_field("Response_list", RESPONSE_TYPE, mode="serialization")
+
+    print(
+        f"{'items':>6} {'response_model ms':>18} {'type adapter ms':>16} {'speedup':>8}"
+    )
+    for size in PAGE_SIZES:
+        page = make_page(size)
+        assert json.loads(await response_model_path(field, page)) == json.loads(
+            fast_path(page)
+        )
+
+        slow, fast = [], []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            await response_model_path(field, page)
+            slow.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            fast_path(page)
+            fast.append((time.perf_counter() - start) * 1000)
+
+        slow_ms, fast_ms = statistics.median(slow), statistics.median(fast)
+        print(f"{size:>6} {slow_ms:>18.2f} {fast_ms:>16.2f} {slow_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,91 @@
+"""Cold start of an API worker, from interpreter start to first request served.
+
+Each sample is a fresh Python process that imports ``src.server``, runs the
+application's startup (lifespan) and serves ``GET /health/``, timing each
+step, the same work a newly spawned gunicorn worker does before it can take
+traffic. With ``--imports`` the third-party packages that take longest to
+import (``python -X importtime``) are listed too.
+
+Usage (from backend/):
+    DATABASE_URL=sqlite:///:memory: python -m benchmarks.bench_startup [--imports]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPEATS = 7
+SLOWEST_IMPORTS = 15
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+import src.server
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(src.server.app) as client:
+    ready = time.perf_counter()
+    status = client.get("/health/").status_code
+    served = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "startup": ready - imported,
+    "first_request": served - ready,
+    "status": status,
+}))
+"""
+
+
+def sample() -> dict:
+    """One cold start, wall clock from process spawn included"""
+    spawned = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", CHILD],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    assert timings.pop("status") == 200
+    timings["total"] = time.perf_counter() - spawned
+    return timings
+
+
+def slowest_imports() -> list:
+    stderr = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", "import src.server"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if "." in name or name == "src" or name.startswith("_"):
+            continue
+        modules.append((int(cumulative), name))
+    return sorted(modules, reverse=True)[:SLOWEST_IMPORTS]
+
+
+def run_benchmark():
+    samples = [sample() for _ in range(REPEATS)]
+    print(f"{'step':>14} {'median ms':>10} {'min ms':>8}")
+    for step in ("import", "startup", "first_request", "total"):
+        values = [s[step] * 1000 for s in samples]
+        print(f"{step:>14} {statistics.median(values):>10.1f} {min(values):>8.1f}")
+
+    if "--imports" in sys.argv:
+        print("\nSlowest top-level imports (cumulative us):")
+        for cumulative, name in slowest_imports():
+            print(f"{cumulative:>10} {name}")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    run_benchmark()
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from .debug import router as debug_router
 from .health import router as health_router
 from .v1 import v1_router
 
@@ -7,5 +8,6 @@ router = APIRouter()
 
 router.include_router(health_router, prefix="/health")
 router.include_router(v1_router, prefix="/v1")
+router.include_router(debug_router, prefix="/debug")
 
 __all__ = ["router"]
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from src.core.profiling import profile_path, profiling_allowed
+
+router = APIRouter()
+
+
+def _stored_profile(request: Request, profile_id: str, suffix: str):
+    # Without access the profiles don't exist, as far as callers can tell
+    path = profile_path(profile_id, suffix)
+    if not profiling_allowed(request.headers) or path is None or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found",
+        )
+    return path
+
+
+@router.get("/profiles/{profile_id}", tags=["Debug"])
+async def get_profile_report(request: Request, profile_id: str):
+    """Text report of a profile stored with ``?profile=store``"""
+    return FileResponse(
+        _stored_profile(request, profile_id, ".txt"),
+        media_type="text/plain; charset=utf-8",
+    )
+
+
+@router.get("/profiles/{profile_id}/pstats", tags=["Debug"])
+async def download_profile(request: Request, profile_id: str):
+    """Raw cProfile data, for ``python -m pstats`` or snakeviz"""
+    return FileResponse(
+        _stored_profile(request, profile_id, ".prof"),
+        media_type="application/octet-stream",
+        filename=f"{profile_id}.prof",
+    )
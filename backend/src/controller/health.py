@@ -1,13 +1,8 @@
-import time
-from datetime import datetime
-
-import psutil
 from fastapi import APIRouter, status
-from sqlalchemy import text
+from fastapi.responses import JSONResponse
 
-from src.core.config import settings
-from src.core.database.database import get_db
-from src.models.dto.health import HealthCheck, MemoryUsage
+from src.core.health import health_sampler
+from src.models.dto import HealthCheck, ProbeStatus
 
 router = APIRouter()
 
@@ -16,23 +11,40 @@ router = APIRouter()
     "/", status_code=status.HTTP_200_OK, response_model=HealthCheck, tags=["Health"]
 )
 async def health_check():
-    try:
-        db = next(get_db())
-        db.execute(text("SELECT 1"))
-        database = "connected"
-    except Exception as e:
-        database = f"failed: {str(e)}"
-
-    return HealthCheck(
-        status="healthy",
-        version=settings.version,
-        database=database,
-        uptime=time.time(),
-        timestamp=datetime.now(),
-        environment=settings.environment,
-        memory_usage=MemoryUsage(
-            used=f"{round(psutil.virtual_memory().used / 1024 / 1024, 2)} MB",
-            available=f"{round(psutil.virtual_memory().available / 1024 / 1024, 2)} MB",
-            percent=f"{psutil.virtual_memory().percent}%",
-        ),
-    )
+    """Latest health snapshot: database, memory, pool, replica and loop lag
+
+    Served from the background sampler without touching the database, so
+    the values can be up to ``HEALTH_SAMPLE_INTERVAL_SECONDS`` old; the
+    ``timestamp`` says when they were taken.
+    """
+    return health_sampler.snapshot or await health_sampler.refresh()
+
+
+@router.get(
+    "/live",
+    status_code=status.HTTP_200_OK,
+    response_model=ProbeStatus,
+    tags=["Health"],
+)
+async def liveness():
+    """Liveness probe: the process is up and its event loop is answering"""
+    return ProbeStatus(status="alive")
+
+
+@router.get(
+    "/ready",
+    status_code=status.HTTP_200_OK,
+    response_model=ProbeStatus,
+    responses={503: {"model": ProbeStatus}},
+    tags=["Health"],
+)
+async def readiness():
+    """Readiness probe: 503 while the database is unreachable or the
+    health snapshot has gone stale"""
+    reason = health_sampler.not_ready_reason()
+    if reason is not None:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=ProbeStatus(status="not_ready", reason=reason).model_dump(),
+        )
+    return ProbeStatus(status="ready")
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from src.core.database import get_db
+from src.core.cache import body_key, pipeline_key
+from src.core.database import get_db, get_read_db
+from src.core.etag import etag_matches, make_etag, not_modified
 from src.core.exceptions import PipelineNotFoundError, PipelineValidationError
+from src.core.fields import FieldSelection, field_selection, project
+from src.core.ratelimit import limit_reads
+from src.core.serialization import serialized_response
 from src.models.dto import (
     PaginationResponse,
     PipelineCreate,
     PipelineResponse,
+    PipelineStatsResponse,
     PipelineWithStages,
 )
 from src.services.pipeline_service import PipelineService
+from src.services.stats_service import StatsService
 
 pipeline_router = APIRouter(prefix="/pipelines", tags=["Pipelines"])
 
@@ -31,13 +38,33 @@ async def create_pipeline(pipeline_data: PipelineCreate, db: Session = Depends(g
         )
 
 
-@pipeline_router.get("/", response_model=PaginationResponse[PipelineResponse])
-async def list_pipelines(page: int = 1, size: int = 100, db: Session = Depends(get_db)):
-    """List all registered pipelines with pagination"""
+@pipeline_router.get(
+    "/",
+    response_model=PaginationResponse[PipelineResponse],
+    dependencies=[Depends(limit_reads)],
+)
+async def list_pipelines(
+    page: int = 1,
+    size: int = 100,
+    selection: FieldSelection = Depends(field_selection),
+    db: Session = Depends(get_read_db),
+):
+    """List all registered pipelines with pagination
+
+    ``fields``/``exclude`` select the returned fields; omitted heavy columns
+    (``config``, ``description``) are not read from the database.
+    """
+    projection = project(selection, PipelineResponse)
     try:
         service = PipelineService(db)
-        pipelines = service.list_pipelines_paginated(page=page, size=size)
-        return pipelines
+        pipelines = service.list_pipelines_paginated(
+            page=page, size=size, projection=projection
+        )
+        return serialized_response(
+            pipelines,
+            PaginationResponse[PipelineResponse],
+            exclude=projection.items_exclude if projection else None,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to list pipelines: {str(e)}"
@@ -45,20 +72,70 @@ async def list_pipelines(page: int = 1, size: int = 100, db: Session = Depends(g
 
 
 @pipeline_router.get("/{pipeline_id}", response_model=PipelineWithStages)
-async def get_pipeline(pipeline_id: str, db: Session = Depends(get_db)):
-    """Get detailed information about a specific pipeline"""
+async def get_pipeline(
+    pipeline_id: str,
+    request: Request,
+    selection: FieldSelection = Depends(field_selection),
+    db: Session = Depends(get_read_db),
+):
+    """Get detailed information about a specific pipeline
+
+    Supports conditional requests: a matching ``If-None-Match`` is answered
+    with 304 from the cached definition or the pipeline's version alone,
+    without loading its stages. ``fields``/``exclude`` select the returned
+    fields, e.g. ``exclude=stages`` skips loading the stages altogether.
+    """
+    projection = project(selection, PipelineWithStages)
     try:
         service = PipelineService(db)
-        pipeline = service.get_pipeline_with_stages(pipeline_id)
-        if not pipeline:
-            raise PipelineNotFoundError(pipeline_id)
-        return pipeline
+        pipeline = service.get_cached_pipeline(pipeline_id)
+        if pipeline is None:
+            version = service.get_pipeline_version(pipeline_id)
+            if version is None:
+                raise PipelineNotFoundError(pipeline_id)
+            if etag_matches(request, make_etag(version)):
+                return not_modified(make_etag(version))
+
+            pipeline = service.get_pipeline_with_stages(pipeline_id, projection)
+            if not pipeline:
+                raise PipelineNotFoundError(pipeline_id)
+
+        etag = make_etag(pipeline.version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return serialized_response(
+            pipeline,
+            PipelineWithStages,
+            exclude=projection.exclude if projection else None,
+            headers={"ETag": etag},
+            # Full representations are compressed once per version
+            cache_key=(
+                None
+                if projection
+                else body_key(pipeline_key(pipeline_id), pipeline.version)
+            ),
+            accept_encoding=request.headers.get("accept-encoding"),
+        )
     except PipelineNotFoundError:
         raise HTTPException(status_code=404, detail=f"Pipeline {pipeline_id} not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get pipeline: {str(e)}")
 
 
+@pipeline_router.get("/{pipeline_id}/stats", response_model=PipelineStatsResponse)
+async def get_pipeline_stats(pipeline_id: str, db: Session = Depends(get_read_db)):
+    """Get success rate and duration quantiles for a pipeline and its stages"""
+    try:
+        service = StatsService(db)
+        return service.get_pipeline_stats(pipeline_id)
+    except PipelineNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Pipeline {pipeline_id} not found")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get pipeline stats: {str(e)}"
+        )
+
+
 @pipeline_router.delete("/{pipeline_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_pipeline(pipeline_id: str, db: Session = Depends(get_db)):
     """Delete a pipeline and all its associated data"""
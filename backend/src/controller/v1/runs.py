@@ -1,18 +1,206 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
-from src.core.database import get_db
-from src.core.exceptions import PipelineNotFoundError, PipelineRunNotFoundError
+from src.core.cache import body_key, run_key
+from src.core.config import settings
+from src.core.database import get_db, get_read_db
+from src.core.etag import etag_matches, make_etag, not_modified
+from src.core.events import run_events, sse_stream
+from src.core.exceptions import (
+    PipelineNotFoundError,
+    PipelineRunNotFoundError,
+    StageRunNotFoundError,
+)
+from src.core.export import MEDIA_TYPES, export_stream
+from src.core.fields import FieldSelection, field_selection, project
+from src.core.ratelimit import (
+    client_ip,
+    enforce_rate_limit,
+    limit_reads,
+    trigger_limiter,
+)
+from src.core.serialization import serialized_response
 from src.models.dto import (
+    BatchGetRunsRequest,
+    BatchGetRunsResponse,
+    ExportFormat,
     PaginationResponse,
     PipelineRunResponse,
     PipelineRunWithStages,
+    RunEvent,
+    RunEventType,
+    RunFilter,
     TriggerRunRequest,
 )
+from src.models.dto.run import RunStatus
+from src.models.schema.run import is_terminal
+from src.services.log_service import StageLogService
 from src.services.run_service import RunService
 
 run_router = APIRouter(tags=["Pipeline Runs"])
 
+CONFIG_FILTER_PREFIX = "config."
+
+LOG_MEDIA_TYPE = "text/plain; charset=utf-8"
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_config_filters(request: Request) -> Dict[str, Any]:
+    """Collect ``config.<key>=<value>`` query parameters into a nested document
+
+    Dotted keys address nested config (``config.optimizer.lr=0.1``) and values
+    are read as JSON when possible so numbers and booleans match their stored
+    types; anything else is compared as a string. Empty keys and a key used
+    both as a value and as a prefix (``config.a=1&config.a.b=2``) are
+    rejected with 400.
+    """
+    config: Dict[str, Any] = {}
+    leaves: Set[Tuple[str, ...]] = set()
+    prefixes: Set[Tuple[str, ...]] = set()
+    for name, raw in request.query_params.multi_items():
+        if not name.startswith(CONFIG_FILTER_PREFIX):
+            continue
+        keys = tuple(name[len(CONFIG_FILTER_PREFIX) :].split("."))
+        if "" in keys:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid config filter {name}: empty key"
+            )
+        if keys in prefixes or any(keys[:i] in leaves for i in range(1, len(keys))):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Config filter {name} conflicts with another config filter",
+            )
+        leaves.add(keys)
+        prefixes.update(keys[:i] for i in range(1, len(keys)))
+
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        node = config
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    return config
+
+
+def _parse_byte_range(header: str) -> Optional[Tuple[int, Optional[int]]]:
+    """A single ``Range: bytes=`` spec as (offset, length), None if unsupported
+
+    ``bytes=-N`` is the last N bytes, i.e. a negative offset. ``bytes=-0``
+    selects no bytes, which reads nothing and so is answered with 416.
+    """
+    match = BYTE_RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        return (-int(last), None) if int(last) else (0, 0)
+    if not last:
+        return int(first), None
+    if int(last) < int(first):
+        return None
+    return int(first), int(last) - int(first) + 1
+
+
+def _log_response(
+    start: int, data: bytes, size: int, status_code: int = 200
+) -> Response:
+    headers = {"X-Log-Offset": str(start), "X-Log-Size": str(size)}
+    if status_code == status.HTTP_206_PARTIAL_CONTENT:
+        headers["Content-Range"] = f"bytes {start}-{start + len(data) - 1}/{size}"
+    return Response(
+        data, status_code=status_code, media_type=LOG_MEDIA_TYPE, headers=headers
+    )
+
+
+def run_filters(
+    request: Request,
+    status: Optional[RunStatus] = None,
+    tags: Optional[List[str]] = Query(None),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> RunFilter:
+    """Query parameters shared by the run list endpoints
+
+    ``tags`` may be repeated or comma separated; runs must carry every tag.
+    """
+    return RunFilter(
+        status=status,
+        tags=[t for tag in tags for t in tag.split(",") if t] if tags else None,
+        config=_parse_config_filters(request) or None,
+        created_after=created_after,
+        created_before=created_before,
+    )
+
+
+@run_router.get(
+    "/runs",
+    response_model=PaginationResponse[PipelineRunResponse],
+    dependencies=[Depends(limit_reads)],
+)
+async def list_runs(
+    page: int = 1,
+    size: int = 100,
+    filters: RunFilter = Depends(run_filters),
+    selection: FieldSelection = Depends(field_selection),
+    db: Session = Depends(get_read_db),
+):
+    """List runs across all pipelines, filtered by status, time, tags or config"""
+    projection = project(selection, PipelineRunResponse)
+    try:
+        service = RunService(db)
+        runs = service.list_runs_paginated(
+            page=page, size=size, filters=filters, projection=projection
+        )
+        return serialized_response(
+            runs,
+            PaginationResponse[PipelineRunResponse],
+            exclude=projection.items_exclude if projection else None,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list runs: {str(e)}")
+
+
+@run_router.post(
+    "/runs/batch_get",
+    response_model=BatchGetRunsResponse,
+    dependencies=[Depends(limit_reads)],
+)
+async def batch_get_runs(
+    request_data: BatchGetRunsRequest,
+    selection: FieldSelection = Depends(field_selection),
+    db: Session = Depends(get_read_db),
+):
+    """Get many runs with their stage runs in one request
+
+    Takes ``runIds`` and/or ``runs`` as ``{pipelineId, runId}`` pairs; runs
+    moved out by retention are found through the archived run index. Runs
+    that don't exist are listed in ``missing`` instead of failing the
+    request. ``fields``/``exclude`` apply to each run.
+    """
+    projection = project(selection, PipelineRunWithStages)
+    try:
+        service = RunService(db)
+        runs, missing = service.get_runs_with_stages(
+            [(None, run_id) for run_id in request_data.run_ids]
+            + [(ref.pipeline_id, ref.run_id) for ref in request_data.runs],
+            projection=projection,
+        )
+        return serialized_response(
+            BatchGetRunsResponse(runs=runs, missing=missing),
+            BatchGetRunsResponse,
+            exclude=projection.list_exclude("runs") if projection else None,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get runs: {str(e)}")
+
 
 @run_router.post(
     "/pipelines/{pipeline_id}/trigger_run",
@@ -20,9 +208,20 @@ run_router = APIRouter(tags=["Pipeline Runs"])
     status_code=status.HTTP_201_CREATED,
 )
 async def trigger_pipeline_run(
-    pipeline_id: str, trigger_data: TriggerRunRequest, db: Session = Depends(get_db)
+    pipeline_id: str,
+    trigger_data: TriggerRunRequest,
+    request: Request,
+    db: Session = Depends(get_db),
 ):
-    """Start a new pipeline run"""
+    """Start a new pipeline run
+
+    Rate limited per client IP and, when set, per ``triggeredBy``; over
+    either limit the answer is 429 with Retry-After.
+    """
+    keys = [f"ip:{client_ip(request)}"]
+    if trigger_data.triggered_by:
+        keys.append(f"by:{trigger_data.triggered_by}")
+    enforce_rate_limit(trigger_limiter, *keys)
     try:
         service = RunService(db)
         run = service.trigger_run(pipeline_id, trigger_data)
@@ -36,34 +235,157 @@ async def trigger_pipeline_run(
 @run_router.get(
     "/pipelines/{pipeline_id}/runs",
     response_model=PaginationResponse[PipelineRunResponse],
+    dependencies=[Depends(limit_reads)],
 )
 async def list_pipeline_runs(
-    pipeline_id: str, page: int = 1, size: int = 100, db: Session = Depends(get_db)
+    pipeline_id: str,
+    page: int = 1,
+    size: int = 100,
+    filters: RunFilter = Depends(run_filters),
+    selection: FieldSelection = Depends(field_selection),
+    db: Session = Depends(get_read_db),
 ):
     """List all runs for a specific pipeline with pagination"""
+    projection = project(selection, PipelineRunResponse)
     try:
         service = RunService(db)
-        runs = service.list_pipeline_runs_paginated(pipeline_id, page=page, size=size)
-        return runs
+        runs = service.list_pipeline_runs_paginated(
+            pipeline_id, page=page, size=size, filters=filters, projection=projection
+        )
+        return serialized_response(
+            runs,
+            PaginationResponse[PipelineRunResponse],
+            exclude=projection.items_exclude if projection else None,
+        )
     except PipelineNotFoundError:
         raise HTTPException(status_code=404, detail=f"Pipeline {pipeline_id} not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list runs: {str(e)}")
 
 
+@run_router.get(
+    "/pipelines/{pipeline_id}/runs/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(limit_reads)],
+    responses={
+        200: {"content": {media: {} for media in MEDIA_TYPES.values()}},
+    },
+)
+async def export_pipeline_runs(
+    pipeline_id: str,
+    format: ExportFormat = ExportFormat.NDJSON,
+    include_stages: bool = False,
+    filters: RunFilter = Depends(run_filters),
+    selection: FieldSelection = Depends(field_selection),
+    db: Session = Depends(get_read_db),
+):
+    """Export a pipeline's whole run history as NDJSON or CSV
+
+    Rows are read through a server-side cursor and written as they arrive, so
+    memory stays flat however many runs there are. Accepts the run list
+    filters and ``fields``/``exclude``; ``include_stages`` adds each run's
+    stage runs inline (a JSON column in CSV).
+    """
+    model = PipelineRunWithStages if include_stages else PipelineRunResponse
+    projection = project(selection, model)
+    try:
+        # The generator keeps using this session after FastAPI has closed it
+        # (a closed Session reconnects on use) and ends its transaction itself
+        runs = RunService(db).iter_pipeline_runs(
+            pipeline_id,
+            filters=filters,
+            projection=projection,
+            include_stages=include_stages,
+        )
+    except PipelineNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Pipeline {pipeline_id} not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to export runs: {str(e)}")
+
+    return StreamingResponse(
+        export_stream(
+            runs, model, format, exclude=projection.exclude if projection else None
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="runs-{pipeline_id}.{format.value}"'
+            )
+        },
+    )
+
+
+@run_router.get(
+    "/pipelines/{pipeline_id}/archived_runs",
+    response_model=PaginationResponse[PipelineRunWithStages],
+    dependencies=[Depends(limit_reads)],
+)
+async def list_archived_pipeline_runs(
+    pipeline_id: str,
+    page: int = 1,
+    size: int = 100,
+    db: Session = Depends(get_read_db),
+):
+    """List runs moved to the archive by the retention policy"""
+    try:
+        service = RunService(db)
+        runs = service.list_archived_runs_paginated(pipeline_id, page=page, size=size)
+        return serialized_response(runs, PaginationResponse[PipelineRunWithStages])
+    except PipelineNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Pipeline {pipeline_id} not found")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to list archived runs: {str(e)}"
+        )
+
+
 @run_router.get(
     "/pipelines/{pipeline_id}/runs/{run_id}", response_model=PipelineRunWithStages
 )
 async def get_pipeline_run(
-    pipeline_id: str, run_id: str, db: Session = Depends(get_db)
+    pipeline_id: str,
+    run_id: str,
+    request: Request,
+    selection: FieldSelection = Depends(field_selection),
+    db: Session = Depends(get_read_db),
 ):
-    """Get detailed information about a specific pipeline run"""
+    """Get detailed information about a specific pipeline run
+
+    Supports conditional requests: a matching ``If-None-Match`` is answered
+    with 304 from the cached run or the run's version alone, without loading
+    its stage runs. ``fields``/``exclude`` select the returned fields, e.g.
+    ``exclude=stageRuns.logs`` leaves the stage logs unread.
+    """
+    projection = project(selection, PipelineRunWithStages)
     try:
         service = RunService(db)
-        run = service.get_run_with_stages(pipeline_id, run_id)
-        if not run:
-            raise PipelineRunNotFoundError(run_id)
-        return run
+        run = service.get_cached_run(pipeline_id, run_id)
+        if run is None:
+            etag = make_etag(service.get_run_version(pipeline_id, run_id))
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+            run = service.get_run_with_stages(pipeline_id, run_id, projection)
+            if not run:
+                raise PipelineRunNotFoundError(run_id)
+
+        etag = make_etag(run.version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        # Finished runs no longer change, so their bodies are compressed once
+        cacheable = projection is None and is_terminal(run.status)
+        return serialized_response(
+            run,
+            PipelineRunWithStages,
+            exclude=projection.exclude if projection else None,
+            headers={"ETag": etag} if etag is not None else None,
+            cache_key=(
+                body_key(run_key(pipeline_id, run_id), run.version)
+                if cacheable
+                else None
+            ),
+            accept_encoding=request.headers.get("accept-encoding"),
+        )
     except PipelineNotFoundError:
         raise HTTPException(status_code=404, detail=f"Pipeline {pipeline_id} not found")
     except PipelineRunNotFoundError:
@@ -72,6 +394,109 @@ async def get_pipeline_run(
         raise HTTPException(status_code=500, detail=f"Failed to get run: {str(e)}")
 
 
+@run_router.get(
+    "/pipelines/{pipeline_id}/runs/{run_id}/wait",
+    response_model=PipelineRunWithStages,
+    responses={304: {"description": "Run unchanged before the timeout"}},
+)
+async def wait_for_pipeline_run(
+    pipeline_id: str,
+    run_id: str,
+    version: Optional[int] = None,
+    timeout: float = Query(30.0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Long-poll until the run's version exceeds ``version``
+
+    Returns the run immediately when it is already newer (or no version is
+    given), otherwise blocks until it changes or ``timeout`` seconds pass and
+    answers 304. Clients pass the ``version`` of the last response they saw.
+    """
+    try:
+        service = RunService(db)
+        run = await service.wait_for_run_change(
+            pipeline_id,
+            run_id,
+            version,
+            min(timeout, settings.run_wait_max_timeout_seconds),
+        )
+        if run is None:
+            if service.get_run_version(pipeline_id, run_id) is None:
+                raise PipelineRunNotFoundError(run_id)
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        return run
+    except PipelineRunNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to wait for run: {str(e)}")
+
+
+@run_router.get("/pipelines/{pipeline_id}/runs/{run_id}/events")
+async def stream_pipeline_run_events(
+    pipeline_id: str,
+    run_id: str,
+    request: Request,
+    last_event_id: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Stream run and stage state transitions as Server-Sent Events
+
+    A new connection starts with a ``snapshot`` event holding the full run.
+    Clients resuming with ``Last-Event-ID`` (or ``?last_event_id=``) get the
+    events they missed instead, or a fresh snapshot when those are no longer
+    held in memory or the id came from another worker. The stream closes once
+    the run finishes.
+    """
+    header = request.headers.get("last-event-id")
+    if header:
+        last_event_id = header
+
+    # Subscribe before reading state so no transition falls in between
+    subscription = run_events.subscribe(run_id)
+    try:
+        snapshot_id = run_events.last_id
+        replayed = (
+            run_events.replay(run_id, last_event_id)
+            if last_event_id is not None
+            else None
+        )
+
+        if replayed is None:
+            run = RunService(db).get_run_with_stages(pipeline_id, run_id)
+            if not run:
+                raise PipelineRunNotFoundError(run_id)
+            initial = [
+                RunEvent(
+                    id=snapshot_id,
+                    type=RunEventType.SNAPSHOT,
+                    pipeline_id=run.pipeline_id,
+                    run_id=run.id,
+                    status=run.status,
+                    timestamp=run.updated_at,
+                    data=run.model_dump(mode="json", by_alias=True),
+                )
+            ]
+        else:
+            initial = replayed
+            snapshot_id = max(
+                [snapshot_id] + [e.id for e in replayed], key=run_events.sequence
+            )
+    except PipelineRunNotFoundError:
+        subscription.close()
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    except Exception as e:
+        subscription.close()
+        raise HTTPException(
+            status_code=500, detail=f"Failed to stream run events: {str(e)}"
+        )
+
+    return StreamingResponse(
+        sse_stream(subscription, initial, snapshot_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @run_router.delete(
     "/pipelines/{pipeline_id}/runs/{run_id}", status_code=status.HTTP_204_NO_CONTENT
 )
@@ -90,3 +515,138 @@ async def cancel_pipeline_run(
         raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to cancel run: {str(e)}")
+
+
+@run_router.get(
+    "/pipelines/{pipeline_id}/runs/{run_id}/stages/{stage_run_id}/logs",
+    response_class=Response,
+    dependencies=[Depends(limit_reads)],
+    responses={
+        200: {"content": {"text/plain": {}}},
+        206: {"description": "The requested byte range"},
+        416: {"description": "Range starts past the end of the log"},
+    },
+)
+async def get_stage_run_logs(
+    pipeline_id: str,
+    run_id: str,
+    stage_run_id: str,
+    request: Request,
+    offset: int = 0,
+    length: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_read_db),
+):
+    """Read a byte range of a stage run's log
+
+    ``offset`` (negative counts back from the end) and ``length`` pick the
+    bytes; a ``Range: bytes=...`` header does the same and is answered with
+    206. Reads are capped at ``STAGE_LOG_MAX_READ_BYTES``; ``X-Log-Offset``
+    and ``X-Log-Size`` tell where the returned bytes start and how long the
+    log is, so clients can page through it.
+    """
+    header = request.headers.get("range")
+    byte_range = _parse_byte_range(header) if header else None
+    if byte_range is not None:
+        offset, length = byte_range
+    try:
+        service = StageLogService(db)
+        stage_run = service.get_stage_run(pipeline_id, run_id, stage_run_id)
+        start, data, size = service.read(stage_run.id, offset, length)
+    except StageRunNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"Stage run {stage_run_id} not found"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to read stage logs: {str(e)}"
+        )
+
+    if byte_range is None:
+        return _log_response(start, data, size)
+    if not data:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return _log_response(start, data, size, status.HTTP_206_PARTIAL_CONTENT)
+
+
+@run_router.get(
+    "/pipelines/{pipeline_id}/runs/{run_id}/stages/{stage_run_id}/logs/tail",
+    response_class=Response,
+    dependencies=[Depends(limit_reads)],
+    responses={200: {"content": {"text/plain": {}}}},
+)
+async def tail_stage_run_logs(
+    pipeline_id: str,
+    run_id: str,
+    stage_run_id: str,
+    lines: int = Query(100, ge=1, le=10_000),
+    db: Session = Depends(get_read_db),
+):
+    """The last ``lines`` lines of a stage run's log
+
+    Only the chunks at the end of the log are read. ``X-Log-Offset`` is where
+    the returned text starts, ``X-Log-Size`` where a follow should resume.
+    """
+    try:
+        service = StageLogService(db)
+        stage_run = service.get_stage_run(pipeline_id, run_id, stage_run_id)
+        return _log_response(*service.tail(stage_run.id, lines))
+    except StageRunNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"Stage run {stage_run_id} not found"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to tail stage logs: {str(e)}"
+        )
+
+
+@run_router.get(
+    "/pipelines/{pipeline_id}/runs/{run_id}/stages/{stage_run_id}/logs/follow",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/plain": {}}}},
+)
+async def follow_stage_run_logs(
+    pipeline_id: str,
+    run_id: str,
+    stage_run_id: str,
+    request: Request,
+    offset: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """Stream a stage run's log as it is written, like ``tail -f``
+
+    Starts at ``offset`` (negative counts back from the end), or at the
+    current end of the log when omitted, and ends once the stage run has
+    finished and all of its output was sent.
+    """
+    try:
+        service = StageLogService(db)
+        stage_run = service.get_stage_run(pipeline_id, run_id, stage_run_id)
+        size = service.size(stage_run.id)
+        if offset is None:
+            start = size
+        else:
+            start = max(0, size + offset) if offset < 0 else min(offset, size)
+    except StageRunNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"Stage run {stage_run_id} not found"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to follow stage logs: {str(e)}"
+        )
+
+    # The generator keeps using this session after FastAPI has closed it and
+    # closes it again between polls
+    return StreamingResponse(
+        service.follow(stage_run.id, start, request.is_disconnected),
+        media_type=LOG_MEDIA_TYPE,
+        headers={
+            "X-Log-Offset": str(start),
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
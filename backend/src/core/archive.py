@@ -0,0 +1,107 @@
+import gzip
+import json
+import logging
+import re
+import shutil
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.core.config import settings
+from src.models.dto import PipelineRunWithStages
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+# Records start with the run id (the first field of the DTO), so lines of
+# runs that aren't wanted can be skipped without parsing them
+RECORD_ID = re.compile(r'^\{"id": "([^"]+)"')
+
+
+def archive_month(created_at: datetime) -> str:
+    """Month of a run's archive file"""
+    return created_at.strftime("%Y-%m")
+
+
+class RunArchive:
+    """
+    Append-only store of archived pipeline runs.
+
+    Runs are written as gzip-compressed JSON lines, one file per pipeline per
+    month of creation: ``<root>/<pipeline_id>/<YYYY-MM>.jsonl.gz``. Each batch
+    is appended as a new gzip member, so archiving never rewrites old data.
+    Every record is a full ``PipelineRunWithStages`` payload so archived runs
+    can be served back through the API unchanged. Which runs are archived,
+    and in which month, is kept in the ``archived_runs`` index table; reads
+    only open the files that index points at.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.run_archive_path)
+
+    def write_runs(self, runs: List[PipelineRunWithStages]) -> int:
+        """Append runs to their monthly archive files"""
+        grouped: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        for run in runs:
+            grouped[(run.pipeline_id, archive_month(run.created_at))].append(
+                json.dumps(run.model_dump(mode="json"))
+            )
+
+        for (pipeline_id, month), lines in grouped.items():
+            path = self._path(pipeline_id, month)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+        return len(runs)
+
+    def read_runs(
+        self, pipeline_id: str, months: Dict[str, Set[str]]
+    ) -> Dict[str, PipelineRunWithStages]:
+        """Load specific archived runs, keyed by run id
+
+        ``months`` maps archive months (``YYYY-MM``) to the run ids wanted
+        from each, as recorded in the archived run index. Only those files
+        are opened and only the records of wanted runs are parsed.
+        """
+        found = {}
+        for month, run_ids in months.items():
+            path = self._path(pipeline_id, month)
+            if not path.exists():
+                continue
+
+            records = {}
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    match = RECORD_ID.match(line)
+                    if match is not None and match.group(1) not in run_ids:
+                        continue
+                    record = json.loads(line)
+                    # A retried batch may have been appended twice; the
+                    # latest copy wins
+                    if record["id"] in run_ids:
+                        records[record["id"]] = record
+
+            for run_id, record in records.items():
+                found[run_id] = PipelineRunWithStages.model_validate(record)
+        return found
+
+    def delete_pipeline(self, pipeline_id: str) -> None:
+        """Remove every archived run of a pipeline"""
+        path = self._pipeline_dir(pipeline_id)
+        if path.exists():
+            shutil.rmtree(path)
+            logger.info(f"Deleted run archive for pipeline {pipeline_id}")
+
+    def _pipeline_dir(self, pipeline_id: str) -> Path:
+        # Raises ValueError for anything but a UUID, so an id taken from a
+        # request can never point outside the archive
+        return self.root / str(uuid.UUID(str(pipeline_id)))
+
+    def _path(self, pipeline_id: str, month: str) -> Path:
+        return self._pipeline_dir(pipeline_id) / f"{month}{ARCHIVE_SUFFIX}"
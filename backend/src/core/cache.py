@@ -0,0 +1,385 @@
+import itertools
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Set, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when cached payload shapes change so old entries are ignored
+KEY_PREFIX = "ml-pipeline-thing:v1:"
+GENERATION_PREFIX = KEY_PREFIX + "gen:"
+
+# How long to stop talking to Redis after it failed
+REDIS_RETRY_SECONDS = 30.0
+MAX_PENDING_INVALIDATIONS = 10_000
+MAX_LOCAL_GENERATIONS = 10_000
+
+# Store an entry only if none of its generation keys moved since the guard
+# was taken; ARGV holds the value, its TTL and the expected generations
+_GUARDED_SET_SCRIPT = """
+for i = 2, #KEYS do
+    local current = redis.call('GET', KEYS[i]) or ''
+    if current ~= ARGV[i + 1] then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+Value = Union[str, bytes]
+
+
+def _id(value) -> str:
+    # UUIDs arrive both as objects and as path strings in any case
+    return str(value).lower()
+
+
+def pipeline_key(pipeline_id) -> str:
+    return f"pipeline:{_id(pipeline_id)}"
+
+
+def run_key(pipeline_id, run_id) -> str:
+    return f"run:{_id(pipeline_id)}:{_id(run_id)}"
+
+
+def pipeline_runs_prefix(pipeline_id) -> str:
+    return f"run:{_id(pipeline_id)}:"
+
+
+def body_key(key: str, version) -> str:
+    """Response body of one version of a cached entity (suffixed per encoding)"""
+    return f"{key}:v{version}:body"
+
+
+class FillGuard(NamedTuple):
+    """Generations of the keys an entry depends on, taken before reading it"""
+
+    keys: Tuple[str, ...]
+    local: Tuple[int, ...]
+    shared: Optional[Tuple[str, ...]]  # None when Redis couldn't be asked
+
+
+class LRUCache:
+    """Thread-safe, size-bounded in-process cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Value]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Value]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Value, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + min(ttl or self.ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class Cache:
+    """
+    Two-tier cache for immutable-ish API payloads.
+
+    Reads check a small in-process LRU first, then Redis (shared by all
+    workers), and fill the LRU from Redis hits. Writes go to both tiers.
+    The LRU keeps entries only for ``cache_local_ttl`` seconds because other
+    workers can't invalidate it; Redis entries live for ``cache_ttl`` and are
+    invalidated explicitly by the services that change the underlying rows.
+
+    A read that missed the cache may load a row just before a write
+    invalidates it. Such fills take a ``fill_guard()`` before reading: every
+    invalidation moves the generation of its key or prefix, and a guarded
+    ``set`` is dropped when a generation moved in between.
+
+    Redis is optional: when the client library is missing or the server is
+    unreachable the cache keeps working with the local tier alone and retries
+    Redis after a back-off.
+    """
+
+    def __init__(self, redis_client=None, enabled: Optional[bool] = None):
+        self.enabled = settings.cache_enabled if enabled is None else enabled
+        self.ttl = settings.cache_ttl
+        self.local = LRUCache(
+            settings.cache_local_max_entries, settings.cache_local_ttl
+        )
+        self._redis = redis_client
+        self._redis_disabled_until = 0.0
+        self._pending_keys: Set[str] = set()
+        self._pending_prefixes: Set[str] = set()
+        self._lock = threading.Lock()
+        self._script = None
+        # Drawn from one counter, so a generation that was evicted and set
+        # again never repeats a value some guard may still hold
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._generation_counter = itertools.count(1)
+        self._generation_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._get(key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Binary entry such as a pre-compressed response body"""
+        value = self._get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    def _get(self, key: str) -> Optional[Value]:
+        if not self.enabled:
+            return None
+
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        redis = self._client()
+        if redis is None:
+            return None
+        try:
+            raw = redis.get(KEY_PREFIX + key)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if raw is None:
+            return None
+
+        try:
+            value = raw.decode() if isinstance(raw, bytes) else raw
+        except UnicodeDecodeError:
+            # Binary entry (e.g. a compressed body); get_bytes returns it as-is
+            value = raw
+        self.local.set(key, value)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Value,
+        ttl: Optional[int] = None,
+        guard: Optional[FillGuard] = None,
+    ) -> None:
+        """Store an entry; with a ``guard`` only if not invalidated since"""
+        if not self.enabled:
+            return
+
+        redis = self._client()
+        # Without generations from Redis a guarded fill can't be checked there
+        if redis is not None and (guard is None or guard.shared is not None):
+            try:
+                if guard is None:
+                    redis.set(KEY_PREFIX + key, value, ex=ttl or self.ttl)
+                elif not self._guarded_set(redis, key, value, ttl, guard):
+                    return
+            except Exception as e:
+                self._redis_failed(e)
+
+        with self._generation_lock:
+            if guard is None or self._local_generations(guard.keys) == guard.local:
+                self.local.set(key, value, ttl)
+
+    def fill_guard(self, *keys: str) -> Optional[FillGuard]:
+        """Take before reading the rows of an entry that depends on ``keys``
+
+        Passed to ``set``/``set_model`` it keeps the entry out of the cache
+        if any of ``keys`` (entry keys or prefixes) was invalidated meanwhile.
+        """
+        return self.fill_guards([keys])[0]
+
+    def fill_guards(
+        self, key_groups: List[Tuple[str, ...]]
+    ) -> List[Optional[FillGuard]]:
+        """``fill_guard`` for many entries with a single Redis round trip"""
+        if not self.enabled:
+            return [None] * len(key_groups)
+
+        with self._generation_lock:
+            local = [self._local_generations(keys) for keys in key_groups]
+        shared: List[Optional[Tuple[str, ...]]] = [None] * len(key_groups)
+        redis = self._client()
+        if redis is not None and key_groups:
+            try:
+                values = iter(
+                    redis.mget(
+                        [GENERATION_PREFIX + key for keys in key_groups for key in keys]
+                    )
+                )
+                shared = [
+                    tuple(
+                        value.decode() if isinstance(value, bytes) else value or ""
+                        for value in itertools.islice(values, len(keys))
+                    )
+                    for keys in key_groups
+                ]
+            except Exception as e:
+                self._redis_failed(e)
+        return [
+            FillGuard(tuple(keys), local_generations, shared_generations)
+            for keys, local_generations, shared_generations in zip(
+                key_groups, local, shared
+            )
+        ]
+
+    def delete(self, *keys: str) -> None:
+        with self._generation_lock:
+            for key in keys:
+                self._bump_generation(key)
+                self.local.delete(key)
+        if keys:
+            self._redis_delete(keys=keys)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Invalidate every entry under a key prefix (e.g. all runs of a pipeline)"""
+        with self._generation_lock:
+            self._bump_generation(prefix)
+            self.local.delete_prefix(prefix)
+        self._redis_delete(prefixes=[prefix])
+
+    def get_model(self, key: str, model: Type[ModelT]) -> Optional[ModelT]:
+        value = self.get(key)
+        if value is None:
+            return None
+        try:
+            return model.model_validate_json(value)
+        except ValueError:
+            # Entry written by an incompatible version; treat as a miss
+            self.delete(key)
+            return None
+
+    def set_model(
+        self,
+        key: str,
+        value: BaseModel,
+        ttl: Optional[int] = None,
+        guard: Optional[FillGuard] = None,
+    ):
+        self.set(key, value.model_dump_json(), ttl, guard)
+
+    def _guarded_set(self, redis, key, value, ttl, guard: FillGuard) -> bool:
+        if self._script is None:
+            self._script = redis.register_script(_GUARDED_SET_SCRIPT)
+        stored = self._script(
+            keys=[KEY_PREFIX + key, *[GENERATION_PREFIX + k for k in guard.keys]],
+            args=[value, ttl or self.ttl, *guard.shared],
+        )
+        return bool(int(stored))
+
+    def _local_generations(self, keys: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(key, 0) for key in keys)
+
+    def _bump_generation(self, key: str) -> None:
+        self._generations[key] = next(self._generation_counter)
+        self._generations.move_to_end(key)
+        while len(self._generations) > MAX_LOCAL_GENERATIONS:
+            self._generations.popitem(last=False)
+
+    def _client(self):
+        if not self.enabled or time.monotonic() < self._redis_disabled_until:
+            return None
+
+        if self._redis is None:
+            with self._lock:
+                if self._redis is None:
+                    try:
+                        import redis
+                    except ImportError:
+                        logger.info("redis not installed, using local cache only")
+                        self._redis_disabled_until = float("inf")
+                        return None
+                    self._redis = redis.Redis.from_url(
+                        settings.redis_url,
+                        socket_timeout=settings.cache_redis_timeout,
+                        socket_connect_timeout=settings.cache_redis_timeout,
+                    )
+
+        if self._pending_keys or self._pending_prefixes:
+            # Invalidations missed while Redis was down must land before any
+            # read, or Redis could serve entries that were deleted meanwhile
+            keys, self._pending_keys = self._pending_keys, set()
+            prefixes, self._pending_prefixes = self._pending_prefixes, set()
+            if not self._redis_delete(keys, prefixes, connected=True):
+                return None
+        return self._redis
+
+    def _redis_delete(self, keys=(), prefixes=(), connected: bool = False) -> bool:
+        redis = self._redis if connected else self._client()
+        try:
+            if redis is None:
+                raise ConnectionError("Redis unavailable")
+            # Generations move first: a guarded fill racing this either
+            # lands before the delete or is refused
+            for key in [*keys, *prefixes]:
+                redis.set(GENERATION_PREFIX + key, uuid.uuid4().hex, ex=self.ttl)
+            stale = [KEY_PREFIX + key for key in keys]
+            for prefix in prefixes:
+                stale.extend(
+                    key
+                    for key in redis.scan_iter(
+                        match=f"{KEY_PREFIX}{prefix}*", count=500
+                    )
+                    if not _is_generation_key(key)
+                )
+            if stale:
+                redis.delete(*stale)
+            return True
+        except Exception as e:
+            if self.enabled and self._redis_disabled_until != float("inf"):
+                self._pending_keys.update(keys)
+                self._pending_prefixes.update(prefixes)
+                if len(self._pending_keys) > MAX_PENDING_INVALIDATIONS:
+                    # Too much missed; drop everything we own on reconnect
+                    self._pending_keys = set()
+                    self._pending_prefixes = {""}
+            if redis is not None:
+                self._redis_failed(e)
+            return False
+
+    def _redis_failed(self, error: Exception) -> None:
+        if time.monotonic() >= self._redis_disabled_until:
+            logger.warning(
+                f"Redis cache unavailable, using local cache only for "
+                f"{REDIS_RETRY_SECONDS:.0f}s: {error}"
+            )
+        self._redis_disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+
+def _is_generation_key(key: Union[str, bytes]) -> bool:
+    if isinstance(key, bytes):
+        key = key.decode(errors="replace")
+    return key.startswith(GENERATION_PREFIX)
+
+
+cache = Cache()
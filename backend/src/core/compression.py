@@ -0,0 +1,217 @@
+import gzip
+import zlib
+from typing import Callable, Dict, Iterable, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.core.cache import cache
+from src.core.config import settings
+
+# Bodies at least this large are compressed off the event loop
+THREADPOOL_MINIMUM_SIZE = 256 * 1024
+
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _zstd(data: bytes) -> bytes:
+    # Compressor objects are not thread-safe; they are cheap to create
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 keeps output identical across requests and workers
+    return gzip.compress(data, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+# Supported encodings, most preferred first
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = _zstd
+if brotli is not None:
+    ENCODERS["br"] = _brotli
+ENCODERS["gzip"] = _gzip
+
+
+def choose_encoding(
+    accept_encoding: Optional[str], supported: Iterable[str] = ENCODERS
+) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header
+
+    The client's q-values decide first, our preference order breaks ties.
+    Returns None when nothing acceptable is supported.
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for name in supported:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip() in settings.compression_content_types
+
+
+def cached_compressed_body(
+    key: str, encoding: str, render: Callable[[], bytes]
+) -> Optional[bytes]:
+    """Compressed body for a cacheable response, compressing at most once
+
+    ``key`` must identify the exact representation and encoding.
+    Returns None when the rendered body is too small to be worth compressing.
+    """
+    body = cache.get_bytes(key)
+    if body is not None:
+        return body
+
+    raw = render()
+    if len(raw) < settings.compression_minimum_size:
+        return None
+    body = ENCODERS[encoding](raw)
+    cache.set(key, body)
+    return body
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses whose content type is on the allow list.
+
+    Complete bodies below ``compression_minimum_size`` go out unchanged;
+    larger ones are encoded with the client's preferred supported encoding.
+    Streamed bodies (exports) are gzip-compressed chunk by chunk with a sync
+    flush so clients can decode rows as they arrive. Responses that already
+    carry a Content-Encoding, such as pre-compressed cached bodies, are left
+    alone.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        stream_gzip = choose_encoding(accept_encoding, ["gzip"]) is not None
+        responder = _CompressionResponder(send, encoding, stream_gzip)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str, stream_gzip: bool):
+        self._send = send
+        self.encoding = encoding
+        self.stream_gzip = stream_gzip
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        if self.compressor is not None:
+            await self._send_streamed(message)
+            return
+
+        headers = MutableHeaders(raw=list(self.start_message.get("headers", [])))
+        self.start_message["headers"] = headers.raw
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if (
+            self.start_message["status"] in (204, 304)
+            or "content-encoding" in headers
+            or "content-range" in headers
+            or not is_compressible(headers.get("content-type"))
+        ):
+            self.passthrough = True
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            if not self.stream_gzip:
+                # Only gzip is streamed; other encodings need the full body
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+            # wbits=31 selects the gzip container
+            self.compressor = zlib.compressobj(
+                settings.compression_gzip_level, wbits=31
+            )
+            headers["Content-Encoding"] = "gzip"
+            del headers["Content-Length"]
+            await self._send(self.start_message)
+            await self._send_streamed(message)
+            return
+
+        self.passthrough = True
+        if len(body) >= settings.compression_minimum_size:
+            encode = ENCODERS[self.encoding]
+            if len(body) >= THREADPOOL_MINIMUM_SIZE:
+                body = await run_in_threadpool(encode, body)
+            else:
+                body = encode(body)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            message = {**message, "body": body}
+        await self._send(self.start_message)
+        await self._send(message)
+
+    async def _send_streamed(self, message):
+        more_body = message.get("more_body", False)
+        data = self.compressor.compress(message.get("body", b""))
+        data += self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        await self._send(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
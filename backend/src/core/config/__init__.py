@@ -1,11 +1,28 @@
-from .environments import (
-    DevelopmentSettings,
-    ProductionSettings,
-    StagingSettings,
-    get_settings,
-)
+import importlib
+
 from .settings import Settings, settings
 
+# Per-environment settings classes are rarely needed; build them on first use
+_LAZY_MODULES = {
+    name: "src.core.config.environments"
+    for name in (
+        "DevelopmentSettings",
+        "StagingSettings",
+        "ProductionSettings",
+        "get_settings",
+    )
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "Settings",
     "settings",
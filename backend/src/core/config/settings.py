@@ -28,10 +28,22 @@ class Settings(BaseSettings):
     database_max_overflow: int = 20
     database_pool_timeout: int = 30
     use_migrations: bool = True
+    database_migration_lock_timeout: float = 300.0  # Wait for another worker
+    database_slow_query_seconds: float = 0.5  # Logged with call site; 0 disables
+    database_server_timing: bool = True  # Query totals in a Server-Timing header
+
+    # Read replica settings (reads stay on the primary when unset)
+    database_replica_url: Optional[str] = None
+    database_replica_sticky_seconds: float = 5.0  # Read-your-writes window
+    database_replica_max_lag_seconds: float = 30.0
 
     # Redis/Cache settings
     redis_url: str = "redis://localhost:6379/0"
     cache_ttl: int = 3600
+    cache_enabled: bool = True
+    cache_local_ttl: int = 5  # In-process tier; other workers can't invalidate it
+    cache_local_max_entries: int = 1024
+    cache_redis_timeout: float = 0.25  # Seconds before falling back to local only
 
     # ML Pipeline settings
     max_concurrent_pipelines: int = 5
@@ -40,11 +52,74 @@ class Settings(BaseSettings):
     data_storage_path: str = "./data"
     artifact_storage_path: str = "./artifacts"
 
+    # Run history retention
+    run_retention_days: int = 90  # Terminal runs older than this are archived
+    run_archive_path: str = "./archive/runs"
+    run_archive_batch_size: int = 500
+
+    # Run event streaming
+    run_event_history_size: int = 1000  # Events kept for Last-Event-ID resume
+    run_event_keepalive_seconds: float = 15.0
+    run_event_relay_enabled: bool = True  # Share events between workers via Redis
+    run_wait_max_timeout_seconds: float = 60.0  # Upper bound for long-polls
+
+    # Run export
+    run_export_batch_size: int = 1000  # Rows fetched per server-side cursor batch
+
+    # Stage logs (compressed, append-only chunks)
+    stage_log_chunk_bytes: int = 256 * 1024  # Uncompressed bytes per chunk
+    stage_log_compression_level: int = 6
+    stage_log_max_read_bytes: int = 1024 * 1024  # Per range, tail or follow read
+    stage_log_follow_poll_seconds: float = 1.0
+
+    # Per-stage resource sampling (peak RSS, CPU time, I/O bytes)
+    resource_sample_interval_seconds: float = 1.0
+    resource_series_max_points: int = 120  # Longer stages are downsampled
+
+    # Response compression (zstd and brotli are used when installed)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024  # Smaller bodies are sent as-is
+    compression_gzip_level: int = 6
+    compression_content_types: List[str] = Field(
+        default=["application/json", "application/x-ndjson", "text/csv", "text/plain"]
+    )
+
+    # Rate limiting (token buckets) and load shedding
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "local"  # "redis" shares buckets across workers
+    rate_limit_trigger_per_minute: float = 30.0  # Per client IP and per triggeredBy
+    rate_limit_trigger_burst: int = 10
+    rate_limit_read_per_minute: float = 600.0  # List/export/batch reads per IP
+    rate_limit_read_burst: int = 100
+    load_shed_enabled: bool = True
+    load_shed_loop_lag_seconds: float = 0.5
+    load_shed_pool_wait_seconds: float = 1.0
+    load_shed_retry_after_seconds: int = 5
+
+    # Health checks (probes read a snapshot refreshed in the background)
+    health_sample_interval_seconds: float = 5.0
+    health_stale_after_seconds: float = 30.0  # Older snapshots fail readiness
+
     # Monitoring and Logging
     log_level: str = "INFO"
     enable_metrics: bool = True
     metrics_port: int = 9090
 
+    # Tracing (W3C trace context, spans exported as OTLP JSON)
+    tracing_enabled: bool = False
+    tracing_exporter: str = "file"  # "file", or "otlp" for an OTLP/HTTP collector
+    tracing_file_path: str = "./logs/traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318"
+    tracing_service_name: str = "ml-pipeline-thing-api"
+    tracing_export_interval_seconds: float = 5.0
+    tracing_max_queue_size: int = 2048  # Ended spans buffered between exports
+
+    # Request profiling (?profile= or X-Profile), allowed in debug mode or
+    # with X-Profile-Token set to the admin token
+    profiling_admin_token: Optional[str] = None
+    profiling_output_path: str = "./profiles"
+    profiling_report_lines: int = 40  # Functions listed in a text report
+
     # Security settings
     secret_key: str = Field(
         default="your-secret-key-change-in-production", min_length=32
@@ -93,6 +168,12 @@ class Settings(BaseSettings):
             )
         return v
 
+    @validator("rate_limit_backend")
+    def validate_rate_limit_backend(cls, v):
+        if v not in ["local", "redis"]:
+            raise ValueError("Rate limit backend must be one of: local, redis")
+        return v
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,166 @@
+import typing
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+from sqlalchemy.engine import Row
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+Coerce = Optional[Callable[[Any], Any]]
+
+_setattr = object.__setattr__
+
+
+def _to_str(value: Any) -> str:
+    # UUID primary keys and enum-typed columns behind plain ``str`` fields
+    if isinstance(value, str):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _to_enum(enum: Type[Enum]) -> Callable[[Any], Enum]:
+    # ORM enums are separate classes from the DTO enums with the same values;
+    # there are only a handful of members, so remember each one's match
+    members: Dict[Any, Enum] = {}
+
+    def coerce(value: Any) -> Enum:
+        try:
+            return members[value]
+        except KeyError:
+            member = enum(value.value if isinstance(value, Enum) else value)
+            members[value] = member
+            return member
+
+    return coerce
+
+
+def _coercer(annotation: Any) -> Coerce:
+    """Conversion a column value needs to fit a DTO field, None for none"""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            annotation = args[0]
+    if annotation is str:
+        return _to_str
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _to_enum(annotation)
+    return None
+
+
+def _children(skip: Set[str], name: str) -> Set[str]:
+    prefix = f"{name}."
+    return {path[len(prefix) :] for path in skip if path.startswith(prefix)}
+
+
+class DTOConverter(Generic[ModelT]):
+    """
+    Builds one DTO type from ORM objects or result rows.
+
+    The field plan (which values to copy, which to coerce, which fields are
+    nested collections) is worked out once per DTO class. Converting a row
+    then reads the values straight from the instance's loaded state, or the
+    ``Row`` mapping for a ``select()`` of labelled columns, instead of going
+    through an attribute descriptor per field. Attributes that aren't loaded
+    (e.g. expired after a commit) are read normally.
+
+    By default values are trusted: they come from typed columns and are only
+    coerced where the types differ (UUID keys, the ORM's enum classes), and
+    the DTO is assembled without validation, like ``model_construct`` but
+    without its per-field overhead. ``trusted=False`` runs the DTO's compiled
+    validator instead, for sources that may not match the declared types.
+
+    Fields named in ``skip`` are not read and come back as None (or an empty
+    list for nested collections). Deferred columns must be skipped, since
+    reading them would load each one with an extra query.
+    """
+
+    def __init__(
+        self,
+        model: Type[ModelT],
+        nested: Optional[Dict[str, "DTOConverter"]] = None,
+        sort_key: Optional[Callable[[BaseModel], Any]] = None,
+        trusted: bool = True,
+    ):
+        self.model = model
+        self.nested = nested or {}
+        self.sort_key = sort_key
+        self.trusted = trusted
+        self._names: List[str] = [
+            name for name in model.model_fields if name not in self.nested
+        ]
+        self._coerced: List[Tuple[str, Callable[[Any], Any]]] = [
+            (name, coerce)
+            for name in self._names
+            if (coerce := _coercer(model.model_fields[name].annotation)) is not None
+        ]
+        self._fields_set = frozenset(model.model_fields)
+        self._validate = model.__pydantic_validator__.validate_python
+
+    def __call__(self, source: Any, skip: Set[str] = frozenset()) -> ModelT:
+        state = source._mapping if isinstance(source, Row) else source.__dict__
+        try:
+            if skip:
+                values = {
+                    name: None if name in skip else state[name] for name in self._names
+                }
+            else:
+                values = {name: state[name] for name in self._names}
+        except KeyError:
+            values = {
+                name: (
+                    None
+                    if name in skip
+                    else state[name] if name in state else getattr(source, name)
+                )
+                for name in self._names
+            }
+
+        for name, coerce in self._coerced:
+            value = values[name]
+            if value is not None:
+                values[name] = coerce(value)
+
+        for name, converter in self.nested.items():
+            if name in skip:
+                values[name] = []
+            else:
+                values[name] = converter.many(
+                    getattr(source, name), _children(skip, name)
+                )
+
+        if self.trusted:
+            return self._construct(values)
+        return self._validate(values)
+
+    def many(
+        self, sources: Iterable[Any], skip: Set[str] = frozenset()
+    ) -> List[ModelT]:
+        """Convert a collection, ordered by ``sort_key`` when one is set"""
+        items = [self(source, skip) for source in sources]
+        if self.sort_key is not None:
+            items.sort(key=self.sort_key)
+        return items
+
+    def _construct(self, values: Dict[str, Any]) -> ModelT:
+        # What model_construct does when every field is given
+        instance = self.model.__new__(self.model)
+        _setattr(instance, "__dict__", values)
+        _setattr(instance, "__pydantic_fields_set__", set(self._fields_set))
+        _setattr(instance, "__pydantic_extra__", None)
+        _setattr(instance, "__pydantic_private__", None)
+        return instance
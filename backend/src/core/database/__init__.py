@@ -1,5 +1,5 @@
 from src.core.database.base import Base, DatabaseModel
-from src.core.database.database import SessionLocal, engine, get_db
+from src.core.database.database import SessionLocal, engine, get_db, replica_engine
 from src.core.database.init import (
     check_database_connection,
     create_tables,
@@ -7,11 +7,32 @@ from src.core.database.init import (
     init_database,
     reset_database,
 )
+from src.core.database.queries import (
+    QueryStats,
+    QueryStatsMiddleware,
+    current_query_stats,
+    track_queries,
+)
+from src.core.database.routing import (
+    ReadYourWritesMiddleware,
+    get_read_db,
+    is_replica_session,
+    replica_monitor,
+)
 
 __all__ = [
     "engine",
+    "replica_engine",
     "SessionLocal",
     "get_db",
+    "get_read_db",
+    "is_replica_session",
+    "replica_monitor",
+    "ReadYourWritesMiddleware",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "current_query_stats",
+    "track_queries",
     "Base",
     "DatabaseModel",
     "init_database",
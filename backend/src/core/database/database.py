@@ -3,19 +3,23 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from src.core.config import settings
+from src.core.database.pool import TimedQueuePool
+
+
+def _create_engine(database_url: str):
+    """Create an SQLAlchemy engine with the pool settings for its dialect"""
+    if database_url.startswith("sqlite"):
+        # SQLite specific configuration
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
 
-# Create SQLAlchemy engine
-if settings.database_url.startswith("sqlite"):
-    # SQLite specific configuration
-    engine = create_engine(
-        settings.database_url,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-else:
     # PostgreSQL/other databases
-    engine = create_engine(
-        settings.database_url,
+    return create_engine(
+        database_url,
+        poolclass=TimedQueuePool,
         pool_size=settings.database_pool_size,
         max_overflow=settings.database_max_overflow,
         pool_timeout=settings.database_pool_timeout,
@@ -23,9 +27,25 @@ else:
         echo=settings.debug,
     )
 
+
+# Create SQLAlchemy engine
+engine = _create_engine(settings.database_url)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica, used only for read-only endpoints
+replica_engine = (
+    _create_engine(settings.database_replica_url)
+    if settings.database_replica_url
+    else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None
+    else None
+)
+
 
 def get_db():
     """Database dependency for FastAPI"""
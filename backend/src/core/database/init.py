@@ -1,5 +1,4 @@
 import logging
-import subprocess
 
 from sqlalchemy import text
 
@@ -16,17 +15,13 @@ def create_tables():
             logger.info("Skipping database tables creation in production")
             return
 
-        result = subprocess.run(
-            ["alembic", "upgrade", "head"], capture_output=True, text=True, check=True
-        )
+        # Alembic is only needed here; production workers never import it
+        from src.core.database.migrate import upgrade_database
+
+        upgrade_database(engine)
         logger.info("Database tables created successfully using Alembic")
-        logger.debug(f"Migration output: {result.stdout}")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         logger.error(f"Error creating database tables: {e}")
-        logger.error(f"Migration stderr: {e.stderr}")
-        raise
-    except FileNotFoundError:
-        logger.error("Alembic not found, cannot create tables")
         raise
 
 
@@ -125,21 +120,18 @@ def check_database_connection():
 
 
 def run_migrations():
-    """Run Alembic migrations"""
+    """Run Alembic migrations in-process, one worker at a time"""
+    from src.core.database.migrate import upgrade_database
+
     try:
-        result = subprocess.run(
-            ["alembic", "upgrade", "head"], capture_output=True, text=True, check=True
-        )
-        logger.info("Database migrations applied successfully")
-        logger.debug(f"Migration output: {result.stdout}")
+        if upgrade_database(engine):
+            logger.info("Database migrations applied successfully")
+        else:
+            logger.info("Database schema is up to date")
         return True
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         logger.error(f"Error running migrations: {e}")
-        logger.error(f"Migration stderr: {e.stderr}")
         raise
-    except FileNotFoundError:
-        logger.warning("Alembic not found, skipping migrations")
-        return False
 
 
 def should_use_migrations():
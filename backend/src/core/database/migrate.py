@@ -0,0 +1,118 @@
+import logging
+import time
+from pathlib import Path
+from typing import Optional, Set
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PATH = Path(__file__).parent / "migrations"
+
+# pg_advisory_lock key held by the worker applying migrations ("mlpt")
+MIGRATION_LOCK_KEY = 0x6D6C7074
+LOCK_POLL_SECONDS = 0.1
+
+_script_heads: Optional[Set[str]] = None
+
+
+def alembic_config() -> Config:
+    """Alembic configuration for in-process use
+
+    Built without alembic.ini so the API doesn't depend on the working
+    directory (the image only ships ``src/``) and Alembic's logging setup
+    doesn't replace the application's.
+    """
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_PATH))
+    return config
+
+
+def script_heads() -> Set[str]:
+    """Head revisions of the migration scripts, read once per process"""
+    global _script_heads
+    if _script_heads is None:
+        _script_heads = set(ScriptDirectory.from_config(alembic_config()).get_heads())
+    return _script_heads
+
+
+def current_heads(connection: Connection) -> Set[str]:
+    """Revisions the database is stamped with"""
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def is_up_to_date(connection: Connection) -> bool:
+    return current_heads(connection) == script_heads()
+
+
+def upgrade_database(engine: Engine, timeout: Optional[float] = None) -> bool:
+    """Bring the schema to the latest revision; True if this call migrated it
+
+    Checking the version is one query, so an up to date database (every
+    restart after the first) costs next to nothing. On PostgreSQL the upgrade
+    runs under an advisory lock: one worker migrates while the others wait
+    for the lock, then find the schema current and carry on. Waiting longer
+    than ``timeout`` seconds raises TimeoutError.
+    """
+    timeout = settings.database_migration_lock_timeout if timeout is None else timeout
+
+    with engine.connect() as connection:
+        if is_up_to_date(connection):
+            connection.rollback()
+            return False
+
+        locking = connection.dialect.name == "postgresql"
+        if locking:
+            _acquire_lock(connection, timeout)
+        try:
+            # Another worker may have finished while we waited for the lock
+            if is_up_to_date(connection):
+                connection.rollback()
+                return False
+
+            started = time.monotonic()
+            connection.rollback()
+            config = alembic_config()
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+            connection.commit()
+            logger.info(
+                f"Migrated database to {', '.join(sorted(script_heads()))} in "
+                f"{time.monotonic() - started:.2f}s"
+            )
+            return True
+        finally:
+            if locking:
+                connection.rollback()
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+                )
+                connection.commit()
+
+
+def _acquire_lock(connection: Connection, timeout: float) -> None:
+    """Poll for the migration lock without holding a transaction open"""
+    deadline = time.monotonic() + timeout
+    waited = False
+    while True:
+        locked = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        ).scalar()
+        connection.commit()
+        if locked:
+            return
+        if not waited:
+            logger.info("Another worker is migrating the database, waiting")
+            waited = True
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"Database migration lock not acquired within {timeout:.0f}s"
+            )
+        time.sleep(LOCK_POLL_SECONDS)
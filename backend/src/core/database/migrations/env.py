@@ -5,7 +5,7 @@ from sqlalchemy import engine_from_config, pool
 
 from src.core.config import settings
 from src.core.database.base import Base
-from src.models.schema import artifact, pipeline, run
+from src.models.schema import artifact, pipeline, run, stats
 
 config = context.config
 
@@ -46,6 +46,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # The API passes its own connection when migrating in-process
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     config.set_main_option("sqlalchemy.url", settings.database_url)
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
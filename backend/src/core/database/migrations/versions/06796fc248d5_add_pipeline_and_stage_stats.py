@@ -0,0 +1,86 @@
+"""Add pipeline and stage stats
+
+Revision ID: 06796fc248d5
+Revises: e74c91cf18da
+Create Date: 2026-10-19 11:40:08.529113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "06796fc248d5"
+down_revision: Union[str, Sequence[str], None] = "e74c91cf18da"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "pipeline_stats",
+        sa.Column("pipeline_id", sa.UUID(), nullable=False),
+        sa.Column("total_runs", sa.Integer(), nullable=False),
+        sa.Column("completed_runs", sa.Integer(), nullable=False),
+        sa.Column("failed_runs", sa.Integer(), nullable=False),
+        sa.Column("cancelled_runs", sa.Integer(), nullable=False),
+        sa.Column("total_execution_time", sa.Float(), nullable=False),
+        sa.Column("total_memory_usage", sa.Float(), nullable=False),
+        sa.Column("total_cpu_usage", sa.Float(), nullable=False),
+        sa.Column("resource_samples", sa.Integer(), nullable=False),
+        sa.Column("duration_sketch", sa.JSON(), nullable=True),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["pipeline_id"],
+            ["pipelines.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("pipeline_id"),
+    )
+    op.create_index(
+        op.f("ix_pipeline_stats_id"), "pipeline_stats", ["id"], unique=False
+    )
+    op.create_table(
+        "stage_stats",
+        sa.Column("stage_id", sa.UUID(), nullable=False),
+        sa.Column("pipeline_id", sa.UUID(), nullable=False),
+        sa.Column("total_runs", sa.Integer(), nullable=False),
+        sa.Column("completed_runs", sa.Integer(), nullable=False),
+        sa.Column("failed_runs", sa.Integer(), nullable=False),
+        sa.Column("cancelled_runs", sa.Integer(), nullable=False),
+        sa.Column("total_execution_time", sa.Float(), nullable=False),
+        sa.Column("duration_sketch", sa.JSON(), nullable=True),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["pipeline_id"],
+            ["pipelines.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["stage_id"],
+            ["pipeline_stages.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("stage_id"),
+    )
+    op.create_index(op.f("ix_stage_stats_id"), "stage_stats", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_stage_stats_pipeline_id"), "stage_stats", ["pipeline_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_stage_stats_pipeline_id"), table_name="stage_stats")
+    op.drop_index(op.f("ix_stage_stats_id"), table_name="stage_stats")
+    op.drop_table("stage_stats")
+    op.drop_index(op.f("ix_pipeline_stats_id"), table_name="pipeline_stats")
+    op.drop_table("pipeline_stats")
@@ -0,0 +1,70 @@
+"""JSONB documents and GIN indexes
+
+Revision ID: 3b1f7c2d9a40
+Revises: 06796fc248d5
+Create Date: 2026-10-19 13:05:27.402117
+
+Switches the JSON document columns to JSONB and indexes pipeline_runs.tags
+and pipeline_runs.run_config with GIN (jsonb_path_ops) so containment
+filters on run lists can use an index (PostgreSQL only; other databases keep
+plain JSON).
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b1f7c2d9a40"
+down_revision: Union[str, Sequence[str], None] = "06796fc248d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSONB_COLUMNS = {
+    "pipelines": ["config"],
+    "pipeline_stages": ["config", "metrics"],
+    "pipeline_runs": ["run_config", "output_data", "tags"],
+    "stage_runs": ["output_data"],
+}
+
+GIN_INDEXES = {
+    "ix_pipeline_runs_tags": ("pipeline_runs", "tags"),
+    "ix_pipeline_runs_run_config": ("pipeline_runs", "run_config"),
+}
+
+
+def _alter_columns(type_name: str) -> None:
+    for table, columns in JSONB_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"TYPE {type_name} USING {column}::{type_name}"
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    _alter_columns("jsonb")
+    for name, (table, column) in GIN_INDEXES.items():
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "jsonb_path_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name, (table, _) in GIN_INDEXES.items():
+        op.drop_index(name, table_name=table)
+    _alter_columns("json")
@@ -0,0 +1,31 @@
+"""Add pipeline run version
+
+Revision ID: 9c4d2e8f1a67
+Revises: 3b1f7c2d9a40
+Create Date: 2026-10-19 14:22:51.730264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4d2e8f1a67"
+down_revision: Union[str, Sequence[str], None] = "3b1f7c2d9a40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "pipeline_runs",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("pipeline_runs", "version")
@@ -0,0 +1,31 @@
+"""Add pipeline version
+
+Revision ID: b7e3a5c9d210
+Revises: 9c4d2e8f1a67
+Create Date: 2026-10-19 15:08:14.662390
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3a5c9d210"
+down_revision: Union[str, Sequence[str], None] = "9c4d2e8f1a67"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "pipelines",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("pipelines", "version")
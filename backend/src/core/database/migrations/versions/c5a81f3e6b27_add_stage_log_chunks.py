@@ -0,0 +1,49 @@
+"""Add stage log chunks
+
+Revision ID: c5a81f3e6b27
+Revises: b7e3a5c9d210
+Create Date: 2026-10-19 18:42:51.204117
+
+Stage run output moves out of the stage_runs.logs text column into
+compressed, append-only chunks. stage_run_id has no foreign key: stage_runs
+is partitioned on PostgreSQL, so the relationship is kept by the ORM.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a81f3e6b27"
+down_revision: Union[str, Sequence[str], None] = "b7e3a5c9d210"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "stage_log_chunks",
+        sa.Column("stage_run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("byte_offset", sa.BigInteger(), nullable=False),
+        sa.Column("byte_length", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "stage_run_id", "byte_offset", name="uq_stage_log_chunks_offset"
+        ),
+    )
+    op.create_index(
+        op.f("ix_stage_log_chunks_id"), "stage_log_chunks", ["id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_stage_log_chunks_id"), table_name="stage_log_chunks")
+    op.drop_table("stage_log_chunks")
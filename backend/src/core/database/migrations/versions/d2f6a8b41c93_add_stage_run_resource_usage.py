@@ -0,0 +1,46 @@
+"""Add stage run resource usage
+
+Revision ID: d2f6a8b41c93
+Revises: c5a81f3e6b27
+Create Date: 2026-10-19 21:07:13.582046
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f6a8b41c93"
+down_revision: Union[str, Sequence[str], None] = "c5a81f3e6b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("stage_runs", sa.Column("cpu_time", sa.Float(), nullable=True))
+    op.add_column(
+        "stage_runs", sa.Column("io_read_bytes", sa.BigInteger(), nullable=True)
+    )
+    op.add_column(
+        "stage_runs", sa.Column("io_write_bytes", sa.BigInteger(), nullable=True)
+    )
+    op.add_column(
+        "stage_runs",
+        sa.Column(
+            "resource_series",
+            sa.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("stage_runs", "resource_series")
+    op.drop_column("stage_runs", "io_write_bytes")
+    op.drop_column("stage_runs", "io_read_bytes")
+    op.drop_column("stage_runs", "cpu_time")
@@ -0,0 +1,30 @@
+"""Add pipeline run traceparent
+
+Revision ID: e1b7c4a90f52
+Revises: d2f6a8b41c93
+Create Date: 2026-10-19 23:16:40.918327
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1b7c4a90f52"
+down_revision: Union[str, Sequence[str], None] = "d2f6a8b41c93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "pipeline_runs", sa.Column("traceparent", sa.String(length=55), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("pipeline_runs", "traceparent")
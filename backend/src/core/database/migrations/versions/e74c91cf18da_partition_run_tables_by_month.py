@@ -0,0 +1,123 @@
+"""Partition run tables by month
+
+Revision ID: e74c91cf18da
+Revises: 8354490d267e
+Create Date: 2026-10-19 10:12:41.118204
+
+Converts pipeline_runs and stage_runs into range-partitioned tables keyed on
+created_at (PostgreSQL only). Partitioned tables need the partition key in
+every unique constraint, so the primary keys become (id, created_at) and the
+foreign keys pointing *at* the run tables (stage_runs.pipeline_run_id and
+artifacts.stage_run_id) are dropped; those relationships are kept by the ORM.
+
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e74c91cf18da"
+down_revision: Union[str, Sequence[str], None] = "8354490d267e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+RUN_TABLES = {
+    "pipeline_runs": {
+        "indexes": {
+            "ix_pipeline_runs_id": ["id"],
+            "ix_pipeline_runs_status": ["status"],
+        },
+        "foreign_keys": [("pipeline_id", "pipelines")],
+    },
+    "stage_runs": {
+        "indexes": {"ix_stage_runs_id": ["id"]},
+        "foreign_keys": [("stage_id", "pipeline_stages")],
+    },
+}
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _recreate_indexes(table: str) -> None:
+    for name, columns in RUN_TABLES[table]["indexes"].items():
+        op.create_index(name, table, columns, unique=False)
+    for column, target in RUN_TABLES[table]["foreign_keys"]:
+        op.create_foreign_key(None, table, target, [column], ["id"])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_constraint("stage_runs_pipeline_run_id_fkey", "stage_runs", "foreignkey")
+    op.drop_constraint("artifacts_stage_run_id_fkey", "artifacts", "foreignkey")
+
+    for table in RUN_TABLES:
+        legacy = f"{table}_unpartitioned"
+        op.rename_table(table, legacy)
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        oldest = (
+            op.get_bind()
+            .execute(sa.text(f"SELECT min(created_at) FROM {legacy}"))
+            .scalar()
+        )
+        now = datetime.utcnow()
+        month = datetime((oldest or now).year, (oldest or now).month, 1)
+        while month <= _add_months(datetime(now.year, now.month, 1), MONTHS_AHEAD):
+            op.execute(
+                f"CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} "
+                f"PARTITION OF {table} FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+        op.drop_table(legacy)
+
+        op.create_primary_key(f"{table}_pkey", table, ["id", "created_at"])
+        _recreate_indexes(table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table in RUN_TABLES:
+        partitioned = f"{table}_partitioned"
+        op.rename_table(table, partitioned)
+        op.execute(f"CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {partitioned}")
+        op.execute(f"DROP TABLE {partitioned} CASCADE")
+
+        op.create_primary_key(f"{table}_pkey", table, ["id"])
+        _recreate_indexes(table)
+
+    op.create_foreign_key(
+        "stage_runs_pipeline_run_id_fkey",
+        "stage_runs",
+        "pipeline_runs",
+        ["pipeline_run_id"],
+        ["id"],
+    )
+    op.create_foreign_key(
+        "artifacts_stage_run_id_fkey",
+        "artifacts",
+        "stage_runs",
+        ["stage_run_id"],
+        ["id"],
+    )
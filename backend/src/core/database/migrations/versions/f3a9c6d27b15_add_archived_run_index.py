@@ -0,0 +1,48 @@
+"""Add archived run index
+
+Revision ID: f3a9c6d27b15
+Revises: e1b7c4a90f52
+Create Date: 2026-10-20 09:12:37.540193
+
+Records which runs retention moved to the archive (and in which month's
+file), so lookups of missing runs no longer scan the archive.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9c6d27b15"
+down_revision: Union[str, Sequence[str], None] = "e1b7c4a90f52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "archived_runs",
+        sa.Column("pipeline_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["pipeline_id"], ["pipelines.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_archived_runs_id"), "archived_runs", ["id"], unique=False)
+    op.create_index(
+        "ix_archived_runs_pipeline_created",
+        "archived_runs",
+        ["pipeline_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_archived_runs_pipeline_created", table_name="archived_runs")
+    op.drop_index(op.f("ix_archived_runs_id"), table_name="archived_runs")
+    op.drop_table("archived_runs")
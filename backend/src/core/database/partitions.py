@@ -0,0 +1,127 @@
+import logging
+import re
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# Run tables are range-partitioned by created_at month on PostgreSQL
+PARTITIONED_RUN_TABLES = ("pipeline_runs", "stage_runs")
+
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(connection: Connection, table: str) -> bool:
+    """Whether a table is a partitioned parent table"""
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(
+        connection.execute(
+            text(
+                """
+                SELECT EXISTS (
+                    SELECT 1 FROM pg_partitioned_table pt
+                    JOIN pg_class c ON c.oid = pt.partrelid
+                    WHERE c.relname = :table
+                )
+                """
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def ensure_run_partitions(
+    connection: Connection, months_ahead: int = 3, start: datetime = None
+) -> List[str]:
+    """Create monthly partitions from ``start`` up to ``months_ahead`` months out"""
+    created = []
+    first_month = month_start(start or datetime.utcnow())
+
+    for table in PARTITIONED_RUN_TABLES:
+        if not is_partitioned(connection, table):
+            continue
+
+        month = first_month
+        while month <= add_months(month_start(datetime.utcnow()), months_ahead):
+            name = partition_name(table, month)
+            exists = connection.execute(
+                text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+            ).scalar()
+            if not exists:
+                connection.execute(
+                    text(
+                        f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                        f"FOR VALUES FROM ('{month.isoformat()}') "
+                        f"TO ('{add_months(month, 1).isoformat()}')"
+                    )
+                )
+                created.append(name)
+            month = add_months(month, 1)
+
+    if created:
+        logger.info(f"Created run partitions: {', '.join(created)}")
+    return created
+
+
+def drop_expired_partitions(connection: Connection, cutoff: datetime) -> List[str]:
+    """Drop monthly partitions that end before ``cutoff`` and hold no rows
+
+    Retention archives rows first, so an expired partition is normally empty by
+    the time it is dropped. Partitions still holding rows that could not be
+    archived (for example runs that are still referenced) are left alone.
+    """
+    dropped = []
+
+    for table in PARTITIONED_RUN_TABLES:
+        if not is_partitioned(connection, table):
+            continue
+
+        partitions = connection.execute(
+            text(
+                """
+                SELECT c.relname FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = :table
+                """
+            ),
+            {"table": table},
+        ).scalars()
+
+        for name in partitions:
+            match = _PARTITION_SUFFIX.search(name)
+            if not match:
+                continue
+            month = datetime(int(match.group(1)), int(match.group(2)), 1)
+            if add_months(month, 1) > cutoff:
+                continue
+
+            has_rows = connection.execute(
+                text(f'SELECT EXISTS (SELECT 1 FROM "{name}")')
+            ).scalar()
+            if has_rows:
+                continue
+
+            connection.execute(text(f'DROP TABLE "{name}"'))
+            dropped.append(name)
+
+    if dropped:
+        logger.info(f"Dropped expired run partitions: {', '.join(dropped)}")
+    return dropped
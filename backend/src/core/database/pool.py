@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+from sqlalchemy.pool import QueuePool
+
+from src.core.metrics import DB_POOL_WAIT
+
+# Waits older than this no longer count as current pressure
+WAIT_WINDOW_SECONDS = 5.0
+
+
+class PoolWaitTracker:
+    """Recent connection checkout waits, for load shedding and monitoring"""
+
+    def __init__(self, window: float = WAIT_WINDOW_SECONDS):
+        self.window = window
+        self._waits: Deque[Tuple[float, float]] = deque(maxlen=1024)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._waits.append((time.monotonic(), seconds))
+
+    def recent_max(self) -> float:
+        """Longest checkout wait within the window, 0 when there was none"""
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            while self._waits and self._waits[0][0] < cutoff:
+                self._waits.popleft()
+            return max((wait for _, wait in self._waits), default=0.0)
+
+
+pool_wait = PoolWaitTracker()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            pool_wait.record(waited)
+            DB_POOL_WAIT.observe(waited)
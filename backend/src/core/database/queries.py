@@ -0,0 +1,166 @@
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from src.core.config import settings
+from src.core.metrics import (
+    DB_QUERY_DURATION,
+    DB_SLOW_QUERIES,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DB_SECONDS,
+    route_label,
+)
+
+logger = logging.getLogger(__name__)
+
+# Frames from these directories are what a slow query is attributed to
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+SERVICES_PACKAGE = os.path.join(APP_ROOT, "services")
+DATABASE_PACKAGE = os.path.dirname(__file__)
+
+# Column lists say little about a statement's shape and make it unreadable
+SELECT_LIST = re.compile(
+    r"\bSELECT\s+(?:DISTINCT\s+)?(?!count\()(.+?)\s+FROM\b", re.I | re.S
+)
+# Expanded IN lists and multi-row VALUES: (?, ?, ?) or (%(id_1)s, %(id_2)s)
+PARAMETER_LIST = re.compile(
+    r"\((?:\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*\)"
+)
+
+
+def normalize_statement(statement: str) -> str:
+    """One line per statement shape: column lists and IN lists collapsed"""
+    statement = " ".join(statement.split())
+    statement = SELECT_LIST.sub("SELECT … FROM", statement)
+    return PARAMETER_LIST.sub("(…)", statement)
+
+
+class QueryStats:
+    """SQL statements executed on behalf of one unit of work (a request)"""
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        self.keep_statements = keep_statements
+        self.statements: List[Tuple[str, float]] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if self.keep_statements:
+            self.statements.append((statement, seconds))
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries(stats: Optional[QueryStats] = None) -> Iterator[QueryStats]:
+    """Count the queries run in this context, threadpool work included"""
+    stats = stats or QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def call_site() -> str:
+    """Where application code issued the statement being executed
+
+    The innermost frame in ``src/services`` (PipelineService, RunService...),
+    else the innermost application frame outside the database package.
+    """
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_ROOT) and not filename.startswith(DATABASE_PACKAGE):
+            path = os.path.relpath(filename, os.path.dirname(APP_ROOT))
+            location = f"{path}:{frame.f_lineno} in {frame.f_code.co_qualname}"
+            if filename.startswith(SERVICES_PACKAGE):
+                return location
+            fallback = fallback or location
+        frame = frame.f_back
+    return fallback or "unknown"
+
+
+# Registered on the Engine class, so every engine (primary, replica, the
+# ones tests create) is covered
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    DB_QUERY_DURATION.observe(elapsed)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    threshold = settings.database_slow_query_seconds
+    if threshold and elapsed >= threshold:
+        DB_SLOW_QUERIES.inc()
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f} ms) from {call_site()}: "
+            f"{normalize_statement(statement)}"
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    Counts and times the SQL each request issues.
+
+    Totals go into a ``Server-Timing: db;dur=<ms>;desc="<n> queries"``
+    header, visible in browser dev tools, and into per-route histograms.
+    The header covers statements run before the response starts; the
+    metrics cover the whole request, streamed bodies included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if (
+                message["type"] == "http.response.start"
+                and settings.database_server_timing
+            ):
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        # Share the statements list when a profiled request already tracks them
+        with track_queries(current_query_stats() or QueryStats()) as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_label(scope)
+                HTTP_REQUEST_DB_QUERIES.labels(route).observe(stats.count)
+                HTTP_REQUEST_DB_SECONDS.labels(route).observe(stats.seconds)
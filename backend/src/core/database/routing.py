@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database.database import (
+    ReplicaSessionLocal,
+    SessionLocal,
+    replica_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+# Cookie carrying the end of the read-your-writes window, so stickiness also
+# holds when the follow-up read lands on a different worker process
+STICKY_COOKIE_NAME = "ml_pipeline_rw_until"
+CLIENT_ID_HEADER = "x-client-id"
+
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+_REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+def client_key(request: Request) -> str:
+    """Identify the client a request belongs to for read-your-writes tracking
+
+    X-Client-Id is supplied by the client and not authenticated, so it is only
+    a stickiness hint: the worst a spoofed value can do is move reads to the
+    primary. The sticky cookie set after a write is checked before this key.
+    """
+    client_id = request.headers.get(CLIENT_ID_HEADER)
+    if client_id:
+        return client_id
+    return request.client.host if request.client else "unknown"
+
+
+class ReadYourWritesTracker:
+    """Remembers which clients wrote recently so their reads hit the primary"""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._sticky_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark_write(self, key: str) -> float:
+        """Record a write for a client and return when its window ends"""
+        until = time.time() + self.window_seconds
+        with self._lock:
+            self._sticky_until[key] = until
+            if len(self._sticky_until) > 10_000:
+                self._prune()
+        return until
+
+    def is_sticky(self, key: str) -> bool:
+        """Whether the client is still inside its read-your-writes window"""
+        until = self._sticky_until.get(key)
+        return until is not None and until > time.time()
+
+    def _prune(self) -> None:
+        now = time.time()
+        for key in [k for k, until in self._sticky_until.items() if until <= now]:
+            del self._sticky_until[key]
+
+
+class ReplicaMonitor:
+    """Caches replica health and lag so routing decisions stay cheap"""
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self._checked_at = 0.0
+        self._status: Dict[str, Optional[object]] = {
+            "status": "not_configured",
+            "lag_seconds": None,
+        }
+        self._lock = threading.Lock()
+
+    def status(self) -> Dict[str, Optional[object]]:
+        """Return the last replica status, refreshing it when it is stale"""
+        if replica_engine is None:
+            return self._status
+
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            with self._lock:
+                if time.monotonic() - self._checked_at >= self.check_interval:
+                    self._status = self._check()
+                    self._checked_at = time.monotonic()
+        return self._status
+
+    def is_usable(self) -> bool:
+        """Whether reads can safely be routed to the replica"""
+        return self.status()["status"] == "connected"
+
+    def _check(self) -> Dict[str, Optional[object]]:
+        try:
+            with replica_engine.connect() as connection:
+                if replica_engine.dialect.name == "postgresql":
+                    lag = float(connection.execute(_REPLICA_LAG_SQL).scalar() or 0)
+                else:
+                    connection.execute(text("SELECT 1"))
+                    lag = 0.0
+        except Exception as e:
+            logger.warning(f"Read replica check failed: {e}")
+            return {"status": f"failed: {str(e)}", "lag_seconds": None}
+
+        if lag > settings.database_replica_max_lag_seconds:
+            return {"status": "lagging", "lag_seconds": lag}
+        return {"status": "connected", "lag_seconds": lag}
+
+
+read_your_writes = ReadYourWritesTracker(settings.database_replica_sticky_seconds)
+replica_monitor = ReplicaMonitor()
+
+
+def _is_sticky(request: Request) -> bool:
+    cookie = request.cookies.get(STICKY_COOKIE_NAME)
+    if cookie:
+        try:
+            if float(cookie) > time.time():
+                return True
+        except ValueError:
+            pass
+    return read_your_writes.is_sticky(client_key(request))
+
+
+def is_replica_session(db: Session) -> bool:
+    """Whether a session reads from the replica (and may see lagging data)"""
+    return replica_engine is not None and db.get_bind() is replica_engine
+
+
+def get_read_db(request: Request):
+    """Database dependency for read-only endpoints
+
+    Routes to the read replica when one is configured and healthy, unless the
+    client wrote recently, in which case a primary session is used so the
+    client always sees its own writes. Only the session that is used is
+    opened, so replica reads cost the primary nothing.
+    """
+    if (
+        ReplicaSessionLocal is not None
+        and not _is_sticky(request)
+        and replica_monitor.is_usable()
+    ):
+        db = ReplicaSessionLocal()
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class ReadYourWritesMiddleware:
+    """Starts a client's read-your-writes window after each successful write"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in UNSAFE_METHODS
+            or ReplicaSessionLocal is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = read_your_writes.mark_write(client_key(request))
+                cookie = (
+                    f"{STICKY_COOKIE_NAME}={until:.3f}; "
+                    f"Max-Age={int(settings.database_replica_sticky_seconds) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
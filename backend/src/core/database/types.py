@@ -0,0 +1,6 @@
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+# JSONB on PostgreSQL so documents can be indexed (GIN) and queried with
+# containment operators; plain JSON everywhere else (e.g. SQLite in tests)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
@@ -0,0 +1,29 @@
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(version: Optional[int]) -> Optional[str]:
+    """Weak ETag for a resource version
+
+    Weak because the same version may be served with different encodings
+    (e.g. compressed), which must not invalidate a client's cached copy.
+    """
+    if version is None:
+        return None
+    return f'W/"{version}"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Whether the request's If-None-Match covers ``etag`` (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,320 @@
+import asyncio
+import itertools
+import json
+import logging
+import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from src.core.config import settings
+from src.models.dto import RunEvent, RunEventType
+from src.models.schema.run import is_terminal
+
+logger = logging.getLogger(__name__)
+
+# Redis pub/sub channel relaying run events between worker processes
+RELAY_CHANNEL = "ml_pipeline:run_events"
+RELAY_RETRY_SECONDS = 5.0
+
+
+class RunEventSubscription:
+    """A subscriber's queue of events for one run"""
+
+    def __init__(self, bus: "RunEventBus", run_id: str):
+        self.bus = bus
+        self.run_id = run_id
+        self.queue: "asyncio.Queue[RunEvent]" = asyncio.Queue()
+        self.loop = asyncio.get_running_loop()
+
+    def deliver(self, event: RunEvent) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.queue.put_nowait(event)
+        else:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[RunEvent]:
+        """Wait for the next event, or None when the timeout expires first"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+    def __enter__(self) -> "RunEventSubscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RunEventBus:
+    """
+    In-process publish/subscribe for run and stage run state transitions.
+
+    Every event gets an id ``<boot id>-<n>``: a random id for this bus (so
+    for this process) and a monotonically increasing sequence number. The most
+    recent ``history_size`` events are kept so a reconnecting client can resume
+    from the last id it saw. An id from another boot, i.e. another worker or
+    an earlier process, can't be replayed, so that client gets a fresh
+    snapshot instead.
+
+    With a ``relay`` the events are also passed to the subscribers in other
+    worker processes, see RunEventRelay.
+    """
+
+    def __init__(self, history_size: Optional[int] = None, relay: bool = False):
+        self._history: Deque[RunEvent] = deque(
+            maxlen=history_size or settings.run_event_history_size
+        )
+        self._subscribers: Dict[str, Set[RunEventSubscription]] = defaultdict(set)
+        self.boot_id = secrets.token_hex(6)
+        self._ids = itertools.count(1)
+        self._last_sequence = 0
+        self._lock = threading.Lock()
+        self.relay = RunEventRelay(self) if relay else None
+
+    def publish(
+        self,
+        type: RunEventType,
+        pipeline_id,
+        run_id,
+        status,
+        stage_run_id=None,
+        stage_id=None,
+        version: Optional[int] = None,
+        data: Optional[dict] = None,
+    ) -> RunEvent:
+        """Record an event and hand it to every subscriber of the run"""
+        with self._lock:
+            self._last_sequence = next(self._ids)
+            event = RunEvent(
+                id=self._event_id(self._last_sequence),
+                type=type,
+                pipeline_id=str(pipeline_id),
+                run_id=str(run_id),
+                status=status.value,
+                stage_run_id=str(stage_run_id) if stage_run_id else None,
+                stage_id=str(stage_id) if stage_id else None,
+                version=version,
+                timestamp=datetime.now(timezone.utc),
+                data=data,
+            )
+            self._history.append(event)
+
+        self.deliver(event)
+        if self.relay is not None:
+            self.relay.send(event)
+        return event
+
+    def deliver(self, event: RunEvent) -> None:
+        """Hand an event to every subscriber of its run in this process"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.run_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.deliver(event)
+            except RuntimeError:
+                # Subscriber's event loop is gone; it will be unsubscribed on exit
+                logger.debug(f"Dropped event {event.id} for closed subscriber")
+
+    def subscribe(self, run_id: str) -> RunEventSubscription:
+        """Start receiving events for a run; must be called inside an event loop"""
+        subscription = RunEventSubscription(self, str(run_id))
+        with self._lock:
+            self._subscribers[subscription.run_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: RunEventSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.run_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.run_id]
+
+    def sequence(self, event_id: str) -> Optional[int]:
+        """The sequence number of an id issued by this bus, None for any other"""
+        boot_id, _, number = str(event_id).rpartition("-")
+        if boot_id != self.boot_id or not number.isdigit():
+            return None
+        return int(number)
+
+    def replay(self, run_id: str, after_id: str) -> Optional[List[RunEvent]]:
+        """Events for a run newer than ``after_id``
+
+        Returns None when ``after_id`` has already fallen out of the history
+        or was issued by another process (another worker, or before a
+        restart), meaning the caller needs a fresh snapshot.
+        """
+        run_id = str(run_id)
+        after = self.sequence(after_id)
+        with self._lock:
+            history = list(self._history)
+            last = self._last_sequence
+        if after is None or after > last:
+            return None
+        if history and after < self.sequence(history[0].id) - 1:
+            return None
+        return [
+            e for e in history if e.run_id == run_id and self.sequence(e.id) > after
+        ]
+
+    @property
+    def last_id(self) -> str:
+        with self._lock:
+            return self._event_id(self._last_sequence)
+
+    def _event_id(self, sequence: int) -> str:
+        return f"{self.boot_id}-{sequence}"
+
+
+class RunEventRelay:
+    """
+    Relays run events between worker processes through Redis pub/sub.
+
+    Published events go out on ``RELAY_CHANNEL`` and a listener thread hands
+    other processes' events to this process's subscribers, so long-polls and
+    event streams wake up whichever worker executes the run. Relayed events
+    keep their origin's id and aren't added to the local history, so resuming
+    from one starts with a snapshot here. When Redis is unavailable events
+    stay local and waiters fall back to re-reading the run on timeout.
+    """
+
+    def __init__(self, bus: RunEventBus, redis_client=None):
+        self.bus = bus
+        self._redis = redis_client
+        self._disabled_until = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        """Start listening for other processes' events"""
+        if self._thread is not None or not settings.run_event_relay_enabled:
+            return
+        if self._client() is None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name="run-event-relay", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def send(self, event: RunEvent) -> None:
+        """Publish an event for the other processes; never raises"""
+        if self._redis is None or time.monotonic() < self._disabled_until:
+            return
+        try:
+            self._redis.publish(RELAY_CHANNEL, self.encode(event))
+        except Exception as e:
+            logger.warning(f"Run event relay unavailable: {e}")
+            self._disabled_until = time.monotonic() + RELAY_RETRY_SECONDS
+
+    def encode(self, event: RunEvent) -> str:
+        return json.dumps(
+            {"origin": self.bus.boot_id, "event": event.model_dump(mode="json")}
+        )
+
+    def receive(self, message) -> None:
+        """Deliver a relayed event locally, unless this process sent it"""
+        payload = json.loads(message)
+        if payload["origin"] != self.bus.boot_id:
+            self.bus.deliver(RunEvent.model_validate(payload["event"]))
+
+    def _listen(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(RELAY_CHANNEL)
+                try:
+                    while not self._stopping.is_set():
+                        message = pubsub.get_message(timeout=1.0)
+                        if message is not None:
+                            self.receive(message["data"])
+                finally:
+                    pubsub.close()
+            except Exception as e:
+                logger.warning(f"Run event relay listener failed: {e}")
+                self._stopping.wait(RELAY_RETRY_SECONDS)
+
+    def _client(self):
+        if self._redis is None:
+            try:
+                import redis
+            except ImportError:
+                logger.info("redis not installed, run events stay in process")
+                return None
+            self._redis = redis.Redis.from_url(
+                settings.redis_url,
+                socket_timeout=settings.cache_redis_timeout,
+                socket_connect_timeout=settings.cache_redis_timeout,
+            )
+        return self._redis
+
+
+run_events = RunEventBus(relay=True)
+
+
+def format_sse(event: RunEvent) -> str:
+    """Encode an event as a Server-Sent Events message"""
+    payload = event.model_dump_json(by_alias=True)
+    return f"id: {event.id}\nevent: {event.type.value}\ndata: {payload}\n\n"
+
+
+def is_final(event: RunEvent) -> bool:
+    """Whether no further events can follow for the run"""
+    return event.type != RunEventType.STAGE and is_terminal(event.status)
+
+
+async def sse_stream(
+    subscription: RunEventSubscription,
+    initial: List[RunEvent],
+    last_id: str,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    keepalive: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """Yield SSE messages: the initial snapshot/replay, then live events
+
+    The stream ends once the run reaches a terminal state or the client goes
+    away. Comment lines are sent while idle to keep proxies from timing out.
+    """
+    keepalive = keepalive or settings.run_event_keepalive_seconds
+    bus = subscription.bus
+    last_sequence = bus.sequence(last_id) or 0
+    try:
+        for event in initial:
+            yield format_sse(event)
+            if is_final(event):
+                return
+
+        while not await is_disconnected():
+            event = await subscription.get(timeout=keepalive)
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            sequence = bus.sequence(event.id)
+            if sequence is not None:
+                # Relayed events from other processes aren't in our sequence
+                if sequence <= last_sequence:
+                    continue
+                last_sequence = sequence
+            yield format_sse(event)
+            if is_final(event):
+                return
+    finally:
+        subscription.close()
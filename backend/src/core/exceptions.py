@@ -31,6 +31,15 @@ class PipelineRunNotFoundError(APIException):
         )
 
 
+class StageRunNotFoundError(APIException):
+    def __init__(self, stage_run_id: str):
+        super().__init__(
+            detail=f"Stage run with id {stage_run_id} not found",
+            status_code=404,
+            error_type="stage_run_not_found",
+        )
+
+
 class PipelineValidationError(APIException):
     def __init__(self, detail: str):
         super().__init__(detail=detail, status_code=422, error_type="validation_error")
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Type
+
+from pydantic import BaseModel
+
+from src.core.serialization import type_adapter
+from src.models.dto import ExportFormat
+
+# Rows are buffered into chunks of about this size before being sent
+CHUNK_BYTES = 64 * 1024
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _chunked(lines: Iterable[bytes]) -> Iterator[bytes]:
+    buffer = bytearray()
+    for line in lines:
+        buffer += line
+        if len(buffer) >= CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def ndjson_rows(
+    items: Iterable[BaseModel],
+    model: Type[BaseModel],
+    exclude: Optional[Dict[str, Any]] = None,
+) -> Iterator[bytes]:
+    """One camelCase JSON document per line"""
+    adapter = type_adapter(model)
+    for item in items:
+        yield adapter.dump_json(item, by_alias=True, exclude=exclude) + b"\n"
+
+
+def csv_rows(
+    items: Iterable[BaseModel],
+    model: Type[BaseModel],
+    exclude: Optional[Dict[str, Any]] = None,
+) -> Iterator[bytes]:
+    """A header row of camelCase field names, then one row per item
+
+    Nested values (config documents, tags, inline stage runs) are written as
+    JSON strings and missing values as empty cells.
+    """
+    exclude = exclude or {}
+    columns = [
+        field.alias or name
+        for name, field in model.model_fields.items()
+        if exclude.get(name) is not True
+    ]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+
+    def flush() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writeheader()
+    yield flush()
+    for item in items:
+        row = item.model_dump(mode="json", by_alias=True, exclude=exclude)
+        writer.writerow(
+            {
+                key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                for key, value in row.items()
+            }
+        )
+        yield flush()
+
+
+def export_stream(
+    items: Iterable[BaseModel],
+    model: Type[BaseModel],
+    format: ExportFormat,
+    exclude: Optional[Dict[str, Any]] = None,
+) -> Iterator[bytes]:
+    """Encode items incrementally as NDJSON or CSV, in chunks ready to send"""
+    rows = csv_rows if format == ExportFormat.CSV else ndjson_rows
+    return _chunked(rows(items, model, exclude))
@@ -0,0 +1,145 @@
+import typing
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from pydantic.alias_generators import to_snake
+
+
+def _parse(value: Optional[str]) -> Set[str]:
+    """Split ``a,b.c`` into snake_case paths; camelCase names are accepted"""
+    if not value:
+        return set()
+    return {
+        ".".join(to_snake(part) for part in name.strip().split("."))
+        for name in value.split(",")
+        if name.strip()
+    }
+
+
+def _nested_model(model: Type[BaseModel], name: str) -> Optional[Type[BaseModel]]:
+    """The model inside a field such as ``List[StageRunResponse]``"""
+    annotation = model.model_fields[name].annotation
+    candidates = [annotation, *typing.get_args(annotation)]
+    for candidate in candidates:
+        for inner in [candidate, *typing.get_args(candidate)]:
+            if isinstance(inner, type) and issubclass(inner, BaseModel):
+                return inner
+    return None
+
+
+class Projection:
+    """A field selection resolved against a response model"""
+
+    def __init__(self, exclude: Dict[str, Any]):
+        self.exclude = exclude or None
+
+    def omits(self, path: str) -> bool:
+        """Whether a field (``output_data``, ``stage_runs.logs``) is left out"""
+        if not self.exclude:
+            return False
+        parent, _, child = path.partition(".")
+        spec = self.exclude.get(parent)
+        if spec is True:
+            return True
+        return bool(child and spec and spec["__all__"].get(child))
+
+    def omitted(self, paths: Iterable[str]) -> Set[str]:
+        return {path for path in paths if self.omits(path)}
+
+    def list_exclude(self, field: str) -> Optional[Dict[str, Any]]:
+        """Exclude spec for a wrapper whose list ``field`` uses this projection"""
+        return {field: {"__all__": self.exclude}} if self.exclude else None
+
+    @property
+    def items_exclude(self) -> Optional[Dict[str, Any]]:
+        """Exclude spec for a PaginationResponse whose items use this projection"""
+        return self.list_exclude("items")
+
+
+class FieldSelection:
+    """
+    Sparse fieldset requested with ``fields=`` and ``exclude=``.
+
+    Both take comma-separated field names in camelCase or snake_case, and one
+    level of nesting for child collections (``stageRuns.logs``). ``fields``
+    keeps only the named fields; ``exclude`` then removes fields. Services use
+    the resolved Projection to defer the omitted columns, so heavy documents
+    such as logs and output data are never read from the database.
+    """
+
+    def __init__(self, fields: Optional[Set[str]] = None, exclude: Set[str] = None):
+        self.fields = fields
+        self.exclude = exclude or set()
+
+    @classmethod
+    def parse(cls, fields: Optional[str], exclude: Optional[str]) -> "FieldSelection":
+        return cls(_parse(fields) or None, _parse(exclude))
+
+    def __bool__(self) -> bool:
+        return bool(self.fields or self.exclude)
+
+    def project(self, model: Type[BaseModel]) -> Projection:
+        """Resolve against ``model``; unknown names raise ValueError"""
+        self._validate(model)
+        spec: Dict[str, Any] = {}
+
+        if self.fields:
+            wanted = {path.split(".")[0] for path in self.fields}
+            for name in model.model_fields:
+                if name not in wanted:
+                    spec[name] = True
+            for parent in wanted - self.fields:
+                # Only nested fields were named, e.g. fields=stageRuns.status
+                children = {
+                    path.split(".", 1)[1]
+                    for path in self.fields
+                    if path.startswith(f"{parent}.")
+                }
+                nested = _nested_model(model, parent)
+                spec[parent] = {
+                    "__all__": {
+                        name: True
+                        for name in nested.model_fields
+                        if name not in children
+                    }
+                }
+
+        for path in self.exclude:
+            parent, _, child = path.partition(".")
+            if not child:
+                spec[parent] = True
+            elif spec.get(parent) is not True:
+                spec.setdefault(parent, {"__all__": {}})["__all__"][child] = True
+
+        return Projection(spec)
+
+    def _validate(self, model: Type[BaseModel]) -> None:
+        unknown: List[str] = []
+        for path in (self.fields or set()) | self.exclude:
+            parent, _, child = path.partition(".")
+            if parent not in model.model_fields:
+                unknown.append(path)
+            elif child:
+                nested = _nested_model(model, parent)
+                if nested is None or child not in nested.model_fields:
+                    unknown.append(path)
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+
+def field_selection(
+    fields: Optional[str] = None, exclude: Optional[str] = None
+) -> FieldSelection:
+    """Query parameters for sparse fieldsets on list and detail endpoints"""
+    return FieldSelection.parse(fields, exclude)
+
+
+def project(selection: FieldSelection, model: Type[BaseModel]) -> Optional[Projection]:
+    """Resolve a selection for an endpoint, answering 400 for unknown fields"""
+    if not selection:
+        return None
+    try:
+        return selection.project(model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+from src.core.config import settings
+from src.core.database.database import engine as default_engine
+from src.core.database.pool import pool_wait
+from src.core.database.routing import replica_monitor
+from src.core.metrics import DB_POOL_CONNECTIONS
+from src.core.overload import loop_lag
+from src.models.dto import HealthCheck, MemoryUsage, PoolStatus, ReplicaStatus
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class HealthSampler:
+    """
+    Refreshes a health snapshot in the background so probes do no I/O.
+
+    Every ``interval`` seconds a worker thread pings the database over its
+    own unpooled connection, reads host memory once and collects pool and
+    replica statistics. The ping never waits on the application pool, so an
+    exhausted pool neither fails readiness nor feeds load shedding. Probes
+    only read the latest snapshot, so however often Kubernetes calls them
+    they never hold a pool connection.
+    """
+
+    def __init__(self, engine: Engine = default_engine, interval: float = None):
+        self.engine = engine
+        # Same database, but a connection of its own for every ping
+        self._ping_engine = create_engine(engine.url, poolclass=NullPool)
+        self.interval = (
+            settings.health_sample_interval_seconds if interval is None else interval
+        )
+        self.snapshot: Optional[HealthCheck] = None
+        self._started = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Take a first sample, then keep refreshing until stopped"""
+        if self._task is None:
+            await self.refresh()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self) -> HealthCheck:
+        self.snapshot = await asyncio.to_thread(self.sample)
+        return self.snapshot
+
+    def sample(self) -> HealthCheck:
+        """Collect a snapshot; blocking, so it runs off the event loop"""
+        import psutil  # Only the sampler uses it
+
+        started = time.perf_counter()
+        try:
+            with self._ping_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            database = "connected"
+            latency = round((time.perf_counter() - started) * 1000, 2)
+        except Exception as e:
+            database = f"failed: {str(e)}"
+            latency = None
+
+        memory = psutil.virtual_memory()
+        return HealthCheck(
+            status="healthy" if database == "connected" else "degraded",
+            version=settings.version,
+            database=database,
+            database_latency_ms=latency,
+            uptime=round(time.monotonic() - self._started, 3),
+            timestamp=datetime.now(),
+            environment=settings.environment,
+            memory_usage=MemoryUsage(
+                used=f"{round(memory.used / MB, 2)} MB",
+                available=f"{round(memory.available / MB, 2)} MB",
+                percent=f"{memory.percent}%",
+            ),
+            replica=ReplicaStatus(**replica_monitor.status()),
+            pool=self._pool_status(),
+            loop_lag_seconds=round(loop_lag.lag, 4),
+        )
+
+    def not_ready_reason(self) -> Optional[str]:
+        """Why the process shouldn't get traffic, None when it should"""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return "starting"
+        if snapshot.database != "connected":
+            return f"database {snapshot.database}"
+        age = (datetime.now() - snapshot.timestamp).total_seconds()
+        if age > settings.health_stale_after_seconds:
+            return f"health snapshot is {age:.0f}s old"
+        return None
+
+    def _pool_status(self) -> PoolStatus:
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            return PoolStatus(wait_seconds=pool_wait.recent_max())
+        status = PoolStatus(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=max(0, pool.overflow()),
+            wait_seconds=pool_wait.recent_max(),
+        )
+        for state in ("size", "checked_out", "overflow"):
+            DB_POOL_CONNECTIONS.labels(state).set(getattr(status, state))
+        return status
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Health sampling failed: {e}")
+
+
+health_sampler = HealthSampler()
@@ -0,0 +1,173 @@
+import logging
+import os
+import time
+from typing import Optional
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Set (by gunicorn_conf.py) when several worker processes share one exporter
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Requests whose path matched no route share one label value, so scanners
+# probing random URLs can't grow the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+# Pipeline runs and stages take seconds to hours, not milliseconds
+EXECUTION_BUCKETS = (1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code",
+    ["method", "route", "status"],
+)
+RUN_DURATION = Histogram(
+    "pipeline_run_duration_seconds",
+    "Pipeline run execution time by final status",
+    ["status"],
+    buckets=EXECUTION_BUCKETS,
+)
+STAGE_DURATION = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Stage execution time by stage type and final status",
+    ["stage_type", "status"],
+    buckets=EXECUTION_BUCKETS,
+)
+RUN_ADMISSION_WAIT = Histogram(
+    "pipeline_run_admission_wait_seconds",
+    "Time from a run being triggered to it starting",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900),
+)
+RUNS_QUEUED = Gauge(
+    "pipeline_runs_queued",
+    "Runs triggered but not started yet",
+    multiprocess_mode="livesum",
+)
+RUNS_RUNNING = Gauge(
+    "pipeline_runs_running",
+    "Runs currently executing",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Primary database pool connections: pool size, checked out and overflow",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Execution time of single SQL statements",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than DATABASE_SLOW_QUERY_SECONDS",
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements issued per HTTP request, by route template",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL per HTTP request, by route template",
+    ["route"],
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds",
+    "How late the event loop woke up from its last periodic sleep",
+    multiprocess_mode="livemax",
+)
+
+_server_started = False
+
+
+def route_label(scope) -> str:
+    """Route template of a handled request (set once routing matched it)"""
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+def is_multiprocess() -> bool:
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def collector_registry() -> CollectorRegistry:
+    """Registry to export: every worker's values when running under gunicorn"""
+    if not is_multiprocess():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def start_metrics_server(port: Optional[int] = None) -> bool:
+    """Serve Prometheus text format on ``port``; True if this call started it
+
+    Under gunicorn the master process serves the aggregated values of all
+    workers (see ``src/gunicorn_conf.py``); otherwise the application's own
+    process serves them. Failing to bind only logs a warning, metrics must
+    never stop the API from starting.
+    """
+    global _server_started
+    port = settings.metrics_port if port is None else port
+    if _server_started or not settings.enable_metrics or not port:
+        return False
+    try:
+        start_http_server(port, registry=collector_registry())
+    except OSError as e:
+        logger.warning(f"Metrics exporter not started on port {port}: {e}")
+        return False
+    _server_started = True
+    logger.info(f"Serving Prometheus metrics on port {port}")
+    return True
+
+
+class MetricsMiddleware:
+    """
+    Records the latency of every HTTP request by route template.
+
+    The route label is the matched path template (``/v1/pipelines/{pipeline_id}``),
+    not the concrete URL, so series stay bounded however many pipelines and
+    runs exist. Streaming responses are timed until their last byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], route_label(scope), str(status_code)
+            ).observe(time.perf_counter() - started)
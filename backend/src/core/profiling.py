@@ -0,0 +1,167 @@
+import asyncio
+import cProfile
+import hmac
+import io
+import logging
+import pstats
+import re
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.core.config import settings
+from src.core.database import QueryStats, track_queries
+from src.core.database.queries import normalize_statement
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PARAM = "profile"
+PROFILE_HEADER = "x-profile"
+TOKEN_HEADER = "x-profile-token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Requested value -> mode; "text" answers with the report instead of the
+# response, "store" answers normally and keeps the profile for download
+MODES = {"1": "text", "true": "text", "text": "text", "store": "store"}
+
+STATEMENT_WIDTH = 160
+SLOWEST_STATEMENTS = 15
+PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def profiling_allowed(headers: Headers) -> bool:
+    """Profiling is open in debug mode, otherwise it needs the admin token"""
+    if settings.debug:
+        return True
+    token = settings.profiling_admin_token
+    return bool(token) and hmac.compare_digest(
+        headers.get(TOKEN_HEADER, "").encode(), token.encode()
+    )
+
+
+def requested_mode(scope) -> Optional[str]:
+    headers = Headers(scope=scope)
+    value = headers.get(PROFILE_HEADER)
+    if value is None:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        value = (query.get(PROFILE_PARAM) or [None])[0]
+    if value is None:
+        return None
+    mode = MODES.get(value.lower())
+    return mode if mode and profiling_allowed(headers) else None
+
+
+def profile_path(profile_id: str, suffix: str) -> Optional[Path]:
+    """Where a stored profile lives, None for ids that can't be ours"""
+    if not PROFILE_ID.match(profile_id):
+        return None
+    return Path(settings.profiling_output_path) / f"{profile_id}{suffix}"
+
+
+def render_report(
+    scope, status: int, seconds: float, profiler: cProfile.Profile, queries: QueryStats
+) -> str:
+    """Plain text report: timings, SQL grouped by statement, then cProfile"""
+    lines = [
+        f"{scope['method']} {scope['path']} -> {status} in {seconds * 1000:.1f} ms",
+        f"SQL: {queries.count} queries, {queries.seconds * 1000:.1f} ms "
+        f"({queries.seconds / seconds * 100 if seconds else 0:.0f}% of the request)",
+    ]
+
+    # The same statement many times over is what an N+1 looks like
+    grouped = defaultdict(lambda: [0, 0.0])
+    for statement, elapsed in queries.statements:
+        entry = grouped[normalize_statement(statement)]
+        entry[0] += 1
+        entry[1] += elapsed
+    if grouped:
+        lines += ["", f"{'total ms':>9} {'calls':>5}  statement"]
+        slowest = sorted(grouped.items(), key=lambda item: item[1][1], reverse=True)
+        for statement, (calls, elapsed) in slowest[:SLOWEST_STATEMENTS]:
+            lines.append(
+                f"{elapsed * 1000:>9.2f} {calls:>5}  {statement[:STATEMENT_WIDTH]}"
+            )
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(settings.profiling_report_lines)
+    return "\n".join(lines) + "\n\n" + stream.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests on demand with cProfile and SQL timing.
+
+    ``?profile=1`` (or ``X-Profile: 1``) answers with a text report instead
+    of the response; ``store`` answers normally, saves the profile under
+    ``PROFILING_OUTPUT_PATH`` and returns its id in ``X-Profile-Id``. Both
+    only work in debug mode or with the admin token; otherwise the flag is
+    ignored. Profiled requests run one at a time, but cProfile sees the
+    whole event loop thread, so work of concurrent requests can show up.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def __call__(self, scope, receive, send):
+        mode = requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if mode == "store":
+                    MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            if mode == "store":
+                await send(message)
+
+        async with self._lock:
+            profiler = cProfile.Profile()
+            with track_queries(QueryStats(keep_statements=True)) as queries:
+                started = time.perf_counter()
+                profiler.enable()
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    profiler.disable()
+                    elapsed = time.perf_counter() - started
+
+        report = render_report(scope, status_code, elapsed, profiler, queries)
+        if mode == "store":
+            await asyncio.to_thread(self._store, profile_id, profiler, report)
+            return
+
+        body = report.encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _store(profile_id: str, profiler: cProfile.Profile, report: str) -> None:
+        directory = Path(settings.profiling_output_path)
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(profile_path(profile_id, ".prof")))
+        profile_path(profile_id, ".txt").write_text(report)
+        logger.info(f"Stored request profile {profile_id}")
@@ -0,0 +1,176 @@
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ml-pipeline-thing:ratelimit:"
+
+# How long to stop talking to Redis after it failed
+REDIS_RETRY_SECONDS = 30.0
+MAX_LOCAL_BUCKETS = 10_000
+
+# Refill and take atomically, on Redis' clock so every worker agrees
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket per key: ``burst`` requests at once, refilled at ``rate``
+    per second.
+
+    Buckets live in process memory by default. With ``shared`` set they live
+    in Redis so all workers draw from the same buckets; if Redis is
+    unreachable the limiter falls back to per-process buckets for a while
+    rather than rejecting or letting everything through.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        shared: Optional[bool] = None,
+        redis_client=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.shared = (
+            settings.rate_limit_backend == "redis" if shared is None else shared
+        )
+        self.clock = clock
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._redis = redis_client
+        self._script = None
+        self._redis_disabled_until = 0.0
+
+    def take(self, key: str, cost: float = 1.0) -> float:
+        """Spend tokens for a request; returns 0 if allowed, else seconds to wait"""
+        if self.shared:
+            redis = self._client()
+            if redis is not None:
+                try:
+                    if self._script is None:
+                        self._script = redis.register_script(_TAKE_SCRIPT)
+                    wait = self._script(
+                        keys=[f"{KEY_PREFIX}{self.name}:{key}"],
+                        args=[self.rate, self.burst, cost],
+                    )
+                    return float(wait)
+                except Exception as e:
+                    self._redis_failed(e)
+        return self._take_local(key, cost)
+
+    def _take_local(self, key: str, cost: float) -> float:
+        now = self.clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > MAX_LOCAL_BUCKETS:
+                self._prune(now)
+        return wait
+
+    def _prune(self, now: float) -> None:
+        # Buckets that have refilled completely hold no information
+        full_after = self.burst / self.rate
+        for key in [
+            k for k, (_, ts) in self._buckets.items() if now - ts >= full_after
+        ]:
+            del self._buckets[key]
+
+    def _client(self):
+        if time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            try:
+                import redis
+            except ImportError:
+                logger.warning("redis not installed, rate limits are per process")
+                self._redis_disabled_until = float("inf")
+                return None
+            self._redis = redis.Redis.from_url(
+                settings.redis_url,
+                socket_timeout=settings.cache_redis_timeout,
+                socket_connect_timeout=settings.cache_redis_timeout,
+            )
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        if time.monotonic() >= self._redis_disabled_until:
+            logger.warning(
+                f"Redis rate limit store unavailable, limiting per process for "
+                f"{REDIS_RETRY_SECONDS:.0f}s: {error}"
+            )
+        self._redis_disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+
+trigger_limiter = TokenBucketLimiter(
+    "trigger",
+    rate=settings.rate_limit_trigger_per_minute / 60,
+    burst=settings.rate_limit_trigger_burst,
+)
+read_limiter = TokenBucketLimiter(
+    "read",
+    rate=settings.rate_limit_read_per_minute / 60,
+    burst=settings.rate_limit_read_burst,
+)
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def enforce_rate_limit(limiter: TokenBucketLimiter, *keys: str) -> None:
+    """Raise 429 with Retry-After when any of the keys' buckets is empty
+
+    Every bucket is charged, so a caller can't dodge one key's limit by
+    varying another.
+    """
+    if not settings.rate_limit_enabled:
+        return
+    wait = max(limiter.take(key) for key in keys)
+    if wait > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+
+def limit_reads(request: Request) -> None:
+    """Dependency for expensive read endpoints, limited per client IP"""
+    enforce_rate_limit(read_limiter, client_ip(request))
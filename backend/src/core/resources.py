@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class ResourceSampler:
+    """
+    Measures what one stage costs: peak RSS, CPU time and I/O bytes.
+
+    With a ``pid`` the whole process tree under it is tracked. A child that
+    exits and is waited for by a tracked parent is counted through the
+    parent's cumulative children figures; one whose parent is gone keeps
+    what it had at its last sample. Without one the stage runs in this
+    process, and only the process itself is sampled (no child scan), so the
+    sampler costs a few microseconds per tick on the event loop. In that case
+    the figures are deltas of the shared API process and include whatever
+    else it did meanwhile.
+
+    Every ``interval`` seconds a point ``[elapsed s, RSS MB, CPU %]`` is
+    added to ``series``. Once ``max_points`` are stored neighbouring points
+    are merged (peak RSS, mean CPU) and later samples are combined two at a
+    time, so a stage of any length keeps a fixed size series of even
+    resolution.
+    """
+
+    def __init__(
+        self,
+        pid: Optional[int] = None,
+        interval: Optional[float] = None,
+        max_points: Optional[int] = None,
+    ):
+        import psutil  # Not needed until a stage runs
+
+        self._psutil = psutil
+        self.process = psutil.Process(pid or os.getpid())
+        self.include_children = pid is not None
+        self.interval = (
+            settings.resource_sample_interval_seconds if interval is None else interval
+        )
+        self.max_points = max(
+            2, settings.resource_series_max_points if max_points is None else max_points
+        )
+
+        self.peak_rss = 0
+        self.cpu_time = 0.0
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.series: List[List[float]] = []
+
+        # Last (ppid, CPU s, read, written) per live pid, and what processes
+        # that left the tree had used
+        self._usage: Dict[int, tuple] = {}
+        self._exited = (0.0, 0, 0)
+        self._baseline = (0.0, 0, 0)
+        self._pending: List[List[float]] = []
+        self._stride = 1
+        self._started = 0.0
+        self._stopped: Optional[float] = None
+        self._last = (0.0, 0.0)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return round(self.peak_rss / MB, 2)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds sampled so far, or in total once stopped"""
+        return (self._stopped or time.perf_counter()) - self._started
+
+    @property
+    def cpu_percent(self) -> float:
+        """Mean CPU use over the stage, 100 per fully used core"""
+        elapsed = self.elapsed
+        return round(self.cpu_time / elapsed * 100, 2) if elapsed > 0 else 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self.sample()
+            self._baseline = (self.cpu_time, self.read_bytes, self.write_bytes)
+            self.cpu_time, self.read_bytes, self.write_bytes = 0.0, 0, 0
+            self._started = time.perf_counter()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Take a final sample and stop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self._sample()
+            self._stopped = time.perf_counter()
+            if self._pending:
+                self.series.append(self._combine(self._pending))
+                self._pending = []
+
+    def sample(self) -> None:
+        """Read the tracked processes once and fold the figures in"""
+        processes = [self.process]
+        if self.include_children:
+            try:
+                processes += self.process.children(recursive=True)
+            except self._psutil.Error:
+                pass
+
+        rss = 0
+        usage = {}
+        for process in processes:
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    times = process.cpu_times()
+                    cpu = times.user + times.system
+                    if self.include_children:
+                        # Descendants that already exited and were waited for
+                        cpu += times.children_user + times.children_system
+                    read, written = self._io_counters(process)
+                    usage[process.pid] = (process.ppid(), cpu, read, written)
+            except self._psutil.Error:
+                continue  # Exited between listing and reading
+
+        for pid, (ppid, *used) in self._usage.items():
+            if pid not in usage and ppid not in usage:
+                # Nobody tracked reaped it, so nobody else will count it
+                self._exited = tuple(a + b for a, b in zip(self._exited, used))
+        self._usage = usage
+
+        totals = [
+            exited + sum(used[i + 1] for used in usage.values())
+            for i, exited in enumerate(self._exited)
+        ]
+        self.cpu_time, self.read_bytes, self.write_bytes = (
+            max(0, total - base) for total, base in zip(totals, self._baseline)
+        )
+        self.peak_rss = max(self.peak_rss, rss)
+
+        if self._started:
+            self._record(rss)
+
+    def _record(self, rss: int) -> None:
+        elapsed = self.elapsed
+        last_elapsed, last_cpu = self._last
+        window = elapsed - last_elapsed
+        cpu = (self.cpu_time - last_cpu) / window * 100 if window > 0 else 0.0
+        self._last = (elapsed, self.cpu_time)
+        self._pending.append([round(elapsed, 2), round(rss / MB, 1), round(cpu, 1)])
+
+        if len(self._pending) < self._stride:
+            return
+        self.series.append(self._combine(self._pending))
+        self._pending = []
+        if len(self.series) >= self.max_points:
+            self.series = [
+                self._combine(self.series[i : i + 2])
+                for i in range(0, len(self.series), 2)
+            ]
+            self._stride *= 2
+
+    @staticmethod
+    def _combine(points: List[List[float]]) -> List[float]:
+        """One point for several: last time, peak RSS, mean CPU"""
+        return [
+            points[-1][0],
+            max(point[1] for point in points),
+            round(sum(point[2] for point in points) / len(points), 1),
+        ]
+
+    def _io_counters(self, process) -> tuple:
+        try:
+            io = process.io_counters()
+        except (AttributeError, self._psutil.AccessDenied):
+            return 0, 0  # Not available on every platform
+        return io.read_bytes, io.write_bytes
+
+    async def _sample(self) -> None:
+        if self.include_children:
+            # Walking a process tree reads /proc for every member
+            await asyncio.to_thread(self.sample)
+        else:
+            self.sample()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._sample()
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
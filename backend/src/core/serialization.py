@@ -0,0 +1,60 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from src.core.compression import cached_compressed_body, choose_encoding
+from src.core.config import settings
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type: Any) -> TypeAdapter:
+    """Build (once) the TypeAdapter used to serialize a response type"""
+    return TypeAdapter(response_type)
+
+
+def serialized_response(
+    content: Any,
+    response_type: Any,
+    status_code: int = 200,
+    exclude: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    cache_key: Optional[str] = None,
+    accept_encoding: Optional[str] = None,
+) -> Response:
+    """Encode a payload to JSON in a single pass
+
+    Returning a plain Response makes FastAPI skip its response_model handling,
+    which would otherwise dump the already-built DTOs to dicts, validate them
+    again and walk the result with jsonable_encoder before encoding it. Keep
+    ``response_model`` on the route for the OpenAPI schema; the output is the
+    same camelCase JSON. ``exclude`` drops fields (see Projection.exclude).
+
+    With a ``cache_key`` naming this exact representation (cache.body_key),
+    the body is compressed for ``accept_encoding`` once and then served from
+    the cache, so hot responses skip both serialization and compression.
+    """
+    adapter = type_adapter(response_type)
+
+    def render() -> bytes:
+        return adapter.dump_json(content, by_alias=True, exclude=exclude)
+
+    encoding = choose_encoding(accept_encoding) if cache_key else None
+    if encoding and settings.compression_enabled:
+        headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+        body = cached_compressed_body(f"{cache_key}:{encoding}", encoding, render)
+        if body is not None:
+            return Response(
+                content=body,
+                status_code=status_code,
+                headers={**headers, "Content-Encoding": encoding},
+                media_type="application/json",
+            )
+
+    return Response(
+        content=render(),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
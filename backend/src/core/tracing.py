@@ -0,0 +1,353 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.core.config import settings
+from src.core.metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+TRACE_ID_HEADER = "X-Trace-Id"
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT, PRODUCER, CONSUMER = 1, 2, 3, 4, 5
+STATUS_ERROR = 2
+
+
+class SpanContext:
+    """Identifies a span across process boundaries (W3C trace context)"""
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """Span context from a ``traceparent`` value, None if absent or invalid"""
+    match = TRACEPARENT.match(value or "")
+    if match is None or set(match.group(1)) == {"0"}:
+        return None
+    return SpanContext(match.group(1), match.group(2))
+
+
+_current: ContextVar[Optional[SpanContext]] = ContextVar("span", default=None)
+
+
+class Span:
+    """One timed operation; recorded by the tracer when it ends"""
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str],
+        kind: int,
+        attributes: Optional[Dict[str, Any]],
+        start_ns: int,
+    ):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = start_ns
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        return self.context.traceparent
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error is not None:
+            span["status"] = {"code": STATUS_ERROR, "message": self.error}
+        return span
+
+
+class _NoopSpan:
+    """Stands in for spans while tracing is off"""
+
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def otlp_request(spans: List[Span]) -> Dict[str, Any]:
+    """An OTLP ExportTraceServiceRequest in its JSON encoding"""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes(
+                        {
+                            "service.name": settings.tracing_service_name,
+                            "service.version": settings.version,
+                            "deployment.environment": settings.environment,
+                            "process.pid": os.getpid(),
+                        }
+                    )
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class FileSpanExporter:
+    """Appends each batch as one line of OTLP JSON
+
+    The format of the OpenTelemetry Collector's ``otlpjsonfile`` receiver,
+    so a file can be replayed into any tracing backend.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(otlp_request(spans), separators=(",", ":"))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a") as file:
+                file.write(line + "\n")
+
+
+class OTLPHttpSpanExporter:
+    """Posts batches to an OTLP/HTTP collector (``/v1/traces``, JSON)"""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(otlp_request(spans)).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def exporter_from_settings():
+    if settings.tracing_exporter == "otlp":
+        return OTLPHttpSpanExporter(settings.tracing_otlp_endpoint)
+    return FileSpanExporter(settings.tracing_file_path)
+
+
+class Tracer:
+    """
+    Records spans and exports them in batches.
+
+    A span's parent is the span current in the calling context, unless one
+    is given: a ``traceparent`` stored with a run lets whichever process
+    executes it continue the trace that triggered it. Ended spans wait in a
+    bounded buffer (the oldest are dropped when it is full) and are exported
+    every ``TRACING_EXPORT_INTERVAL_SECONDS`` off the event loop. With
+    tracing disabled ``span()`` hands out a shared no-op span.
+    """
+
+    def __init__(self, exporter=None, enabled: Optional[bool] = None):
+        self._exporter = exporter
+        self._enabled = enabled
+        self._pending: Deque[Span] = deque(maxlen=settings.tracing_max_queue_size)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.tracing_enabled if self._enabled is None else self._enabled
+
+    @property
+    def exporter(self):
+        if self._exporter is None:
+            self._exporter = exporter_from_settings()
+        return self._exporter
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: int = INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+    ) -> Iterator[Span]:
+        """Time the enclosed block; exceptions mark the span as failed"""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        span = self._new_span(name, kind, attributes, parent, time.time_ns())
+        token = _current.set(span.context)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            self.end(span)
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        kind: int = INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+    ) -> None:
+        """Record a span after the fact, e.g. the time a run spent queued"""
+        if self.enabled:
+            span = self._new_span(name, kind, attributes, parent, start_ns)
+            self.end(span, end_ns)
+
+    def end(self, span: Span, end_ns: Optional[int] = None) -> None:
+        span.end_ns = end_ns or time.time_ns()
+        with self._lock:
+            self._pending.append(span)
+
+    def flush(self) -> None:
+        """Export every ended span; blocking"""
+        with self._lock:
+            spans = list(self._pending)
+            self._pending.clear()
+        if not spans:
+            return
+        try:
+            self.exporter.export(spans)
+        except Exception as e:
+            logger.warning(f"Dropped {len(spans)} spans, export failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None and self.enabled:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    def _new_span(self, name, kind, attributes, parent, start_ns) -> Span:
+        parent = parent or _current.get()
+        trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        return Span(
+            name,
+            SpanContext(trace_id, os.urandom(8).hex()),
+            parent.span_id if parent else None,
+            kind,
+            attributes,
+            start_ns,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.tracing_export_interval_seconds)
+            await asyncio.to_thread(self.flush)
+
+
+tracer = Tracer()
+
+
+class TracingMiddleware:
+    """
+    Opens a server span per request, continuing the caller's trace.
+
+    An incoming ``traceparent`` header makes the request part of the
+    caller's trace; the trace id is returned in ``X-Trace-Id`` either way,
+    so a slow response can be looked up in the tracing backend.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        parent = parse_traceparent(Headers(scope=scope).get(TRACEPARENT_HEADER))
+        attributes = {"http.method": scope["method"], "url.path": scope["path"]}
+        with tracer.span(scope["method"], SERVER, attributes, parent) as span:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    MutableHeaders(scope=message)[TRACE_ID_HEADER] = (
+                        span.context.trace_id
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_label(scope)
+                span.name = f"{scope['method']} {route}"
+                span.set_attribute("http.route", route)
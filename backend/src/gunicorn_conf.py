@@ -0,0 +1,38 @@
+"""Gunicorn settings for running the API with several workers
+
+    gunicorn src.main:app -c src/gunicorn_conf.py -w 4 -k uvicorn.workers.UvicornWorker
+
+Each worker writes its Prometheus metrics to memory-mapped files in
+``PROMETHEUS_MULTIPROC_DIR``; the master process serves the aggregate of all
+of them on ``METRICS_PORT``, so one scrape sees the whole server.
+"""
+
+import os
+import shutil
+import tempfile
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def on_starting(server):
+    # Before any worker (or prometheus_client) is loaded; files left by a
+    # previous server would be counted again
+    directory = os.environ.get(MULTIPROC_DIR_ENV) or os.path.join(
+        tempfile.gettempdir(), "ml-pipeline-thing-metrics"
+    )
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    os.environ[MULTIPROC_DIR_ENV] = directory
+
+
+def when_ready(server):
+    from src.core.metrics import start_metrics_server
+
+    start_metrics_server()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    # Drops the worker's live gauges (queue depth, pool, loop lag)
+    multiprocess.mark_process_dead(worker.pid)
@@ -30,6 +30,7 @@ from src.models.schema.pipeline import (
     get_expected_artifact_types,
 )
 from src.models.schema.run import PipelineRun, RunStatus, StageRun, TriggerType
+from src.models.schema.stats import PipelineStats, StageStats
 
 __all__ = [
     "Base",
@@ -43,6 +44,8 @@ __all__ = [
     "StageRun",
     "RunStatus",
     "TriggerType",
+    "PipelineStats",
+    "StageStats",
     "Artifact",
     "Dataset",
     "Model",
@@ -1,15 +1,13 @@
-from src.models.dto.artifact import (
-    ArtifactCreate,
-    ArtifactResponse,
-    ArtifactType,
-    ArtifactUpload,
-    DatasetCreate,
-    DatasetResponse,
-    ModelCreate,
-    ModelResponse,
-    StorageType,
+import importlib
+
+from src.models.dto.event import RunEvent, RunEventType
+from src.models.dto.health import (
+    HealthCheck,
+    MemoryUsage,
+    PoolStatus,
+    ProbeStatus,
+    ReplicaStatus,
 )
-from src.models.dto.health import HealthCheck, MemoryUsage
 from src.models.dto.pagination import PaginationResponse
 from src.models.dto.pipeline import (
     PipelineCreate,
@@ -21,12 +19,44 @@ from src.models.dto.pipeline import (
     StageType,
 )
 from src.models.dto.run import (
+    BatchGetRunsRequest,
+    BatchGetRunsResponse,
+    ExportFormat,
     PipelineRunCreate,
     PipelineRunResponse,
     PipelineRunWithStages,
+    RunFilter,
+    RunRef,
     StageRunResponse,
     TriggerRunRequest,
 )
+from src.models.dto.stats import PipelineStatsResponse, StageStatsResponse
+
+# Not used by any endpoint yet, so they are only built when first imported
+_LAZY_MODULES = {
+    name: "src.models.dto.artifact"
+    for name in (
+        "ArtifactCreate",
+        "ArtifactResponse",
+        "ArtifactType",
+        "ArtifactUpload",
+        "DatasetCreate",
+        "DatasetResponse",
+        "ModelCreate",
+        "ModelResponse",
+        "StorageType",
+    )
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "ArtifactCreate",
@@ -38,8 +68,13 @@ __all__ = [
     "ModelCreate",
     "ModelResponse",
     "StorageType",
+    "RunEvent",
+    "RunEventType",
     "HealthCheck",
     "MemoryUsage",
+    "PoolStatus",
+    "ProbeStatus",
+    "ReplicaStatus",
     "PaginationResponse",
     "PipelineCreate",
     "PipelineResponse",
@@ -48,9 +83,16 @@ __all__ = [
     "PipelineWithStages",
     "StageStatus",
     "StageType",
+    "ExportFormat",
     "PipelineRunCreate",
     "PipelineRunResponse",
     "StageRunResponse",
     "PipelineRunWithStages",
+    "RunFilter",
+    "RunRef",
+    "BatchGetRunsRequest",
+    "BatchGetRunsResponse",
     "TriggerRunRequest",
+    "PipelineStatsResponse",
+    "StageStatsResponse",
 ]
@@ -0,0 +1,27 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from src.models.core import CoreModel
+from src.models.dto.run import RunStatus
+
+
+class RunEventType(str, Enum):
+    SNAPSHOT = "snapshot"  # Full current state, sent when history can't be replayed
+    RUN = "run"
+    STAGE = "stage"
+
+
+class RunEvent(CoreModel):
+    """A run or stage run state transition"""
+
+    id: str  # <boot id>-<sequence>, see RunEventBus
+    type: RunEventType
+    pipeline_id: str
+    run_id: str
+    status: RunStatus
+    stage_run_id: Optional[str] = None
+    stage_id: Optional[str] = None
+    version: Optional[int] = None  # Run version after the change
+    timestamp: datetime
+    data: Optional[Dict[str, Any]] = None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from ..core import CoreModel
 
@@ -12,13 +12,40 @@ class MemoryUsage(CoreModel):
     percent: str
 
 
+class ReplicaStatus(CoreModel):
+    """Read replica status model"""
+
+    status: str
+    lag_seconds: Optional[float] = None
+
+
+class PoolStatus(CoreModel):
+    """Database connection pool model"""
+
+    size: Optional[int] = None  # None for pools without a fixed size (SQLite)
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    wait_seconds: float = 0.0  # Longest recent checkout wait
+
+
 class HealthCheck(CoreModel):
     """Health check response model"""
 
     status: str = "healthy"
     version: str
     database: str = "connected"
-    uptime: float
+    database_latency_ms: Optional[float] = None
+    uptime: float  # Seconds since the process started
     environment: str
-    timestamp: datetime
+    timestamp: datetime  # When the snapshot was sampled
     memory_usage: MemoryUsage
+    replica: ReplicaStatus
+    pool: PoolStatus = PoolStatus()
+    loop_lag_seconds: float = 0.0
+
+
+class ProbeStatus(CoreModel):
+    """Liveness/readiness probe model"""
+
+    status: str
+    reason: Optional[str] = None
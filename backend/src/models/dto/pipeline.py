@@ -98,6 +98,7 @@ class PipelineResponse(CoreModel):
     cpu_usage: Optional[float] = None
     created_at: datetime
     updated_at: datetime
+    version: int = 1
 
     model_config = CoreModel.model_config.copy()
     model_config.update({"from_attributes": True})
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from src.models.core import CoreModel
 
@@ -22,6 +22,11 @@ class TriggerType(str, Enum):
     WEBHOOK = "WEBHOOK"
 
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class TriggerRunRequest(CoreModel):
     run_config: Optional[Dict[str, Any]] = None
     environment: str = Field(
@@ -32,6 +37,16 @@ class TriggerRunRequest(CoreModel):
     notes: Optional[str] = None
 
 
+class RunFilter(CoreModel):
+    """Filters for run list endpoints; all given conditions must match"""
+
+    status: Optional[RunStatus] = None
+    tags: Optional[List[str]] = None
+    config: Optional[Dict[str, Any]] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
 class PipelineRunCreate(CoreModel):
     pipeline_id: str
     trigger_type: TriggerType = TriggerType.MANUAL
@@ -63,6 +78,7 @@ class PipelineRunResponse(CoreModel):
     notes: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    version: Optional[int] = None  # Not kept for archived runs
 
     model_config = CoreModel.model_config.copy()
     model_config.update({"from_attributes": True})
@@ -79,6 +95,10 @@ class StageRunResponse(CoreModel):
     execution_time: Optional[float] = None
     memory_usage: Optional[float] = None
     cpu_usage: Optional[float] = None
+    cpu_time: Optional[float] = None
+    io_read_bytes: Optional[int] = None
+    io_write_bytes: Optional[int] = None
+    resource_series: Optional[List[List[float]]] = None
     output_data: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
     logs: Optional[str] = None
@@ -91,3 +111,34 @@ class StageRunResponse(CoreModel):
 
 class PipelineRunWithStages(PipelineRunResponse):
     stage_runs: List[StageRunResponse] = []
+
+
+MAX_BATCH_GET_RUNS = 500
+
+
+class RunRef(CoreModel):
+    pipeline_id: str
+    run_id: str
+
+
+class BatchGetRunsRequest(CoreModel):
+    """Runs to fetch, by id alone or as (pipeline, run) pairs"""
+
+    run_ids: List[str] = Field(default_factory=list, max_length=MAX_BATCH_GET_RUNS)
+    runs: List[RunRef] = Field(default_factory=list, max_length=MAX_BATCH_GET_RUNS)
+
+    @model_validator(mode="after")
+    def validate_size(self):
+        total = len(self.run_ids) + len(self.runs)
+        if total == 0:
+            raise ValueError("At least one run id is required")
+        if total > MAX_BATCH_GET_RUNS:
+            raise ValueError(f"At most {MAX_BATCH_GET_RUNS} runs per request")
+        return self
+
+
+class BatchGetRunsResponse(CoreModel):
+    runs: List[PipelineRunWithStages]
+    missing: List[str] = Field(
+        default_factory=list, description="Requested run ids that were not found"
+    )
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import Field
+
+from src.models.core import CoreModel
+
+
+class StageStatsResponse(CoreModel):
+    stage_id: str
+    total_runs: int = 0
+    completed_runs: int = 0
+    failed_runs: int = 0
+    cancelled_runs: int = 0
+    success_rate: Optional[float] = Field(
+        None, description="Completed / (completed + failed); cancelled runs excluded"
+    )
+    mean_duration: Optional[float] = None
+    p50_duration: Optional[float] = None
+    p95_duration: Optional[float] = None
+    last_run_at: Optional[datetime] = None
+
+
+class PipelineStatsResponse(CoreModel):
+    pipeline_id: str
+    total_runs: int = 0
+    completed_runs: int = 0
+    failed_runs: int = 0
+    cancelled_runs: int = 0
+    success_rate: Optional[float] = Field(
+        None, description="Completed / (completed + failed); cancelled runs excluded"
+    )
+    mean_duration: Optional[float] = None
+    p50_duration: Optional[float] = None
+    p95_duration: Optional[float] = None
+    mean_memory_usage: Optional[float] = None
+    mean_cpu_usage: Optional[float] = None
+    last_run_at: Optional[datetime] = None
+    stages: List[StageStatsResponse] = []
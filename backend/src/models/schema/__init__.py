@@ -15,7 +15,15 @@ from src.models.schema.pipeline import (
     StageType,
     get_expected_artifact_types,
 )
-from src.models.schema.run import PipelineRun, RunStatus, StageRun, TriggerType
+from src.models.schema.run import (
+    ArchivedRun,
+    PipelineRun,
+    RunStatus,
+    StageLogChunk,
+    StageRun,
+    TriggerType,
+)
+from src.models.schema.stats import PipelineStats, StageStats
 
 __all__ = [
     "Base",
@@ -29,8 +37,12 @@ __all__ = [
     "get_expected_artifact_types",
     "PipelineRun",
     "StageRun",
+    "StageLogChunk",
+    "ArchivedRun",
     "RunStatus",
     "TriggerType",
+    "PipelineStats",
+    "StageStats",
     "Artifact",
     "ArtifactStatus",
     "Dataset",
@@ -11,11 +11,13 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    event,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
 
 from src.core.database.base import DatabaseModel
+from src.core.database.types import JSONType
 from src.models.schema.artifact import ArtifactType
 
 
@@ -35,7 +37,7 @@ class Pipeline(DatabaseModel):
     status = Column(
         Enum(PipelineStatus), default=PipelineStatus.PENDING, nullable=False, index=True
     )
-    config = Column(JSON)
+    config = Column(JSONType)
 
     # Execution details
     started_at = Column(DateTime)
@@ -46,6 +48,12 @@ class Pipeline(DatabaseModel):
     memory_usage = Column(Float)  # MB
     cpu_usage = Column(Float)  # Percentage
 
+    # Change counter behind the pipeline ETag, incremented in SQL on every
+    # UPDATE (see _bump_pipeline_version). Unlike PipelineRun.version this is
+    # not an optimistic lock, as run completions refresh the summary columns
+    # above concurrently.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Relationships
     stages = relationship(
         "PipelineStage", back_populates="pipeline", cascade="all, delete-orphan"
@@ -53,6 +61,19 @@ class Pipeline(DatabaseModel):
     runs = relationship(
         "PipelineRun", back_populates="pipeline", cascade="all, delete-orphan"
     )
+    stats = relationship(
+        "PipelineStats",
+        back_populates="pipeline",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+
+
+@event.listens_for(Pipeline, "before_update")
+def _bump_pipeline_version(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and session.is_modified(target, include_collections=False):
+        target.version = Pipeline.version + 1
 
 
 class StageType(enum.Enum):
@@ -107,7 +128,7 @@ class PipelineStage(DatabaseModel):
     order = Column(Integer, nullable=False)  # Execution order
 
     # Stage configuration
-    config = Column(JSON)
+    config = Column(JSONType)
     dependencies = Column(JSON)  # List of stage IDs this stage depends on
 
     # Execution details
@@ -117,7 +138,7 @@ class PipelineStage(DatabaseModel):
 
     # Output/Results
     output_path = Column(String(500))
-    metrics = Column(JSON)  # Stage-specific metrics
+    metrics = Column(JSONType)  # Stage-specific metrics
     logs = Column(Text)
 
     # Relationships
@@ -125,6 +146,12 @@ class PipelineStage(DatabaseModel):
     artifacts = relationship(
         "Artifact", back_populates="stage", cascade="all, delete-orphan"
     )
+    stats = relationship(
+        "StageStats",
+        back_populates="stage",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
 
 def get_expected_artifact_types(stage_type: StageType) -> List[ArtifactType]:
@@ -2,20 +2,25 @@ import enum
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from src.core.database.base import DatabaseModel
+from src.core.database.types import JSONType
 from src.models.schema.pipeline import PipelineStatus
 
 
@@ -27,6 +32,15 @@ class RunStatus(enum.Enum):
     CANCELLED = "CANCELLED"
 
 
+# Runs and stage runs in these states never change again
+TERMINAL_RUN_STATUSES = (RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED)
+
+
+def is_terminal(status) -> bool:
+    """Whether a status, the model's or an API one, is final"""
+    return RunStatus(status.value) in TERMINAL_RUN_STATUSES
+
+
 class TriggerType(enum.Enum):
     MANUAL = "MANUAL"
     SCHEDULED = "SCHEDULED"
@@ -35,7 +49,24 @@ class TriggerType(enum.Enum):
 
 
 class PipelineRun(DatabaseModel):
+    # On PostgreSQL this table is range-partitioned by created_at month (see
+    # migration e74c91cf18da), so foreign keys referencing it are ORM-only
     __tablename__ = "pipeline_runs"
+    __table_args__ = (
+        # GIN indexes backing the tags= and config.<key>= run list filters
+        Index(
+            "ix_pipeline_runs_tags",
+            "tags",
+            postgresql_using="gin",
+            postgresql_ops={"tags": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_pipeline_runs_run_config",
+            "run_config",
+            postgresql_using="gin",
+            postgresql_ops={"run_config": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     pipeline_id = Column(UUID(as_uuid=True), ForeignKey("pipelines.id"), nullable=False)
 
@@ -52,7 +83,7 @@ class PipelineRun(DatabaseModel):
     execution_time = Column(Float)  # Total execution time in seconds
 
     # Configuration for this specific run
-    run_config = Column(JSON)  # Run-specific configuration overrides
+    run_config = Column(JSONType)  # Run-specific configuration overrides
     environment = Column(
         String(50), default="development"
     )  # development, staging, production
@@ -65,12 +96,22 @@ class PipelineRun(DatabaseModel):
     success_count = Column(Integer, default=0)  # Number of successful stages
     failed_count = Column(Integer, default=0)  # Number of failed stages
     error_message = Column(Text)  # Error message if run failed
-    output_data = Column(JSON)  # Final output data/results
+    output_data = Column(JSONType)  # Final output data/results
+
+    # Trace context of the trigger, so the executor continues its trace
+    traceparent = Column(String(55))
 
     # Metadata
-    tags = Column(JSON)  # List of tags for categorization
+    tags = Column(JSONType)  # List of tags for categorization
     notes = Column(Text)  # User notes about this run
 
+    # Monotonic change counter bumped by every UPDATE of the row. Stage run
+    # changes touch the run so the counter covers them too. Doubles as an
+    # optimistic lock: a flush based on a stale copy raises StaleDataError.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
     # Relationships
     pipeline = relationship("Pipeline", back_populates="runs")
     stage_runs = relationship(
@@ -79,6 +120,7 @@ class PipelineRun(DatabaseModel):
 
 
 class StageRun(DatabaseModel):
+    # Partitioned like pipeline_runs on PostgreSQL
     __tablename__ = "stage_runs"
 
     pipeline_run_id = Column(
@@ -97,14 +139,18 @@ class StageRun(DatabaseModel):
     completed_at = Column(DateTime)
     execution_time = Column(Float)
 
-    # Resource usage
-    memory_usage = Column(Float)
-    cpu_usage = Column(Float)
+    # Resource usage, measured by ResourceSampler
+    memory_usage = Column(Float)  # Peak RSS in MB
+    cpu_usage = Column(Float)  # Mean CPU percentage over the stage
+    cpu_time = Column(Float)  # CPU seconds, user + system
+    io_read_bytes = Column(BigInteger)
+    io_write_bytes = Column(BigInteger)
+    resource_series = Column(JSONType)  # [[elapsed s, RSS MB, CPU %], ...]
 
     # Output/Results
-    output_data = Column(JSON)
+    output_data = Column(JSONType)
     error_message = Column(Text)
-    logs = Column(Text)  # Execution logs for this stage run
+    logs = Column(Text)  # Legacy inline logs; new output goes to StageLogChunk
 
     # Relationships
     pipeline_run = relationship("PipelineRun", back_populates="stage_runs")
@@ -112,3 +158,48 @@ class StageRun(DatabaseModel):
     artifacts = relationship(
         "Artifact", back_populates="stage_run", cascade="all, delete-orphan"
     )
+
+
+class StageLogChunk(DatabaseModel):
+    """
+    A compressed piece of a stage run's log output.
+
+    Logs are append-only byte streams: each chunk covers
+    ``[byte_offset, byte_offset + byte_length)`` of the uncompressed stream,
+    so tail and range reads only fetch the chunks they overlap. The unique
+    offset per stage run makes concurrent appends at the same position fail
+    instead of interleaving.
+    """
+
+    __tablename__ = "stage_log_chunks"
+    __table_args__ = (
+        UniqueConstraint(
+            "stage_run_id", "byte_offset", name="uq_stage_log_chunks_offset"
+        ),
+    )
+
+    # ORM-only on PostgreSQL, like the other keys into the partitioned run tables
+    stage_run_id = Column(
+        UUID(as_uuid=True), ForeignKey("stage_runs.id"), nullable=False
+    )
+    byte_offset = Column(BigInteger, nullable=False)
+    byte_length = Column(Integer, nullable=False)  # Uncompressed size
+    data = Column(LargeBinary, nullable=False)  # zlib-compressed bytes
+
+
+class ArchivedRun(DatabaseModel):
+    """
+    Index entry of a run that retention moved to the run archive.
+
+    Written in the same transaction that deletes the run from the hot
+    tables, so lookups only open archive files for runs that are really
+    there. ``id`` and ``created_at`` are the run's own; the month of
+    ``created_at`` names the archive file holding it.
+    """
+
+    __tablename__ = "archived_runs"
+    __table_args__ = (
+        Index("ix_archived_runs_pipeline_created", "pipeline_id", "created_at"),
+    )
+
+    pipeline_id = Column(UUID(as_uuid=True), ForeignKey("pipelines.id"), nullable=False)
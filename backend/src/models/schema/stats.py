@@ -0,0 +1,62 @@
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from src.core.database.base import DatabaseModel
+
+
+class PipelineStats(DatabaseModel):
+    """Run statistics for a pipeline, updated as each run reaches a terminal state"""
+
+    __tablename__ = "pipeline_stats"
+
+    pipeline_id = Column(
+        UUID(as_uuid=True), ForeignKey("pipelines.id"), nullable=False, unique=True
+    )
+
+    # Outcome counters
+    total_runs = Column(Integer, default=0, nullable=False)
+    completed_runs = Column(Integer, default=0, nullable=False)
+    failed_runs = Column(Integer, default=0, nullable=False)
+    cancelled_runs = Column(Integer, default=0, nullable=False)
+
+    # Running sums for means
+    total_execution_time = Column(Float, default=0.0, nullable=False)
+    total_memory_usage = Column(Float, default=0.0, nullable=False)
+    total_cpu_usage = Column(Float, default=0.0, nullable=False)
+    resource_samples = Column(Integer, default=0, nullable=False)
+
+    duration_sketch = Column(JSON)  # Serialized QuantileSketch of run durations
+    last_run_at = Column(DateTime)
+
+    # Relationships
+    pipeline = relationship("Pipeline", back_populates="stats")
+
+
+class StageStats(DatabaseModel):
+    """Run statistics for a single pipeline stage"""
+
+    __tablename__ = "stage_stats"
+
+    stage_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("pipeline_stages.id"),
+        nullable=False,
+        unique=True,
+    )
+    pipeline_id = Column(
+        UUID(as_uuid=True), ForeignKey("pipelines.id"), nullable=False, index=True
+    )
+
+    # Outcome counters
+    total_runs = Column(Integer, default=0, nullable=False)
+    completed_runs = Column(Integer, default=0, nullable=False)
+    failed_runs = Column(Integer, default=0, nullable=False)
+    cancelled_runs = Column(Integer, default=0, nullable=False)
+
+    total_execution_time = Column(Float, default=0.0, nullable=False)
+    duration_sketch = Column(JSON)  # Serialized QuantileSketch of stage durations
+    last_run_at = Column(DateTime)
+
+    # Relationships
+    stage = relationship("PipelineStage", back_populates="stats")
@@ -5,15 +5,37 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.controller import router
+from src.core.compression import CompressionMiddleware
 from src.core.config import settings
-from src.core.database import init_database
+from src.core.database import (
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+    init_database,
+)
+from src.core.events import run_events
 from src.core.exceptions import APIException
+from src.core.health import health_sampler
+from src.core.metrics import MetricsMiddleware, is_multiprocess, start_metrics_server
+from src.core.overload import LoadSheddingMiddleware, loop_lag
+from src.core.profiling import ProfilingMiddleware
+from src.core.tracing import TracingMiddleware, tracer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_database()
+    if not is_multiprocess():
+        # Under gunicorn the master serves every worker's metrics
+        start_metrics_server()
+    loop_lag.start()
+    tracer.start()
+    await health_sampler.start()
+    run_events.relay.start()
     yield
+    run_events.relay.stop()
+    await health_sampler.stop()
+    await tracer.stop()
+    await loop_lag.stop()
 
 
 def init_routers(app_: FastAPI) -> None:
@@ -53,6 +75,16 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app_.add_middleware(ReadYourWritesMiddleware)
+    app_.add_middleware(CompressionMiddleware)
+    if settings.enable_metrics:
+        app_.add_middleware(MetricsMiddleware)
+    app_.add_middleware(QueryStatsMiddleware)
+    app_.add_middleware(TracingMiddleware)
+    # Outside QueryStatsMiddleware, which then shares the profile's statements
+    app_.add_middleware(ProfilingMiddleware)
+    # Outermost, so shed requests cost as little as possible
+    app_.add_middleware(LoadSheddingMiddleware)
 
     init_routers(app_)
     init_exception_handlers(app_)
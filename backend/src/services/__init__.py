@@ -1,4 +1,6 @@
 from src.services.pipeline_service import PipelineService
+from src.services.retention_service import RetentionService
 from src.services.run_service import RunService
+from src.services.stats_service import StatsService
 
-__all__ = ["PipelineService", "RunService"]
+__all__ = ["PipelineService", "RetentionService", "RunService", "StatsService"]
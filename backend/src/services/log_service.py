@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import uuid
+import zlib
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple, Union
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.exceptions import StageRunNotFoundError
+from src.models.schema.run import (
+    TERMINAL_RUN_STATUSES,
+    PipelineRun,
+    StageLogChunk,
+    StageRun,
+)
+
+logger = logging.getLogger(__name__)
+
+# Attempts to append at the end of a log another writer is also appending to
+APPEND_ATTEMPTS = 3
+
+# (offset of the first byte returned, bytes, total log size)
+LogRead = Tuple[int, bytes, int]
+
+
+def _uuid(value) -> Optional[uuid.UUID]:
+    try:
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def delete_stage_logs(db: Session, stage_run_ids) -> None:
+    """Delete the log chunks of stage runs (ids or a select of ids)
+
+    Chunks aren't an ORM cascade because deleting them one object at a time
+    would load every chunk first.
+    """
+    db.execute(
+        delete(StageLogChunk).where(StageLogChunk.stage_run_id.in_(stage_run_ids))
+    )
+
+
+class StageLogService:
+    """
+    Append-only, chunked storage of stage run log output.
+
+    Appended bytes are zlib-compressed into chunks of at most
+    ``stage_log_chunk_bytes`` each, keyed by their offset in the stream. Logs
+    never touch the stage run row, so a chatty stage doesn't grow the run
+    detail; clients read logs by byte range, tail or follow them instead.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_stage_run(self, pipeline_id: str, run_id: str, stage_run_id: str):
+        """The stage run, if it belongs to the given pipeline run"""
+        ids = [_uuid(pipeline_id), _uuid(run_id), _uuid(stage_run_id)]
+        if None in ids:
+            raise StageRunNotFoundError(stage_run_id)
+
+        stage_run = (
+            self.db.query(StageRun)
+            .join(PipelineRun, StageRun.pipeline_run_id == PipelineRun.id)
+            .filter(
+                PipelineRun.pipeline_id == ids[0],
+                StageRun.pipeline_run_id == ids[1],
+                StageRun.id == ids[2],
+            )
+            .first()
+        )
+        if not stage_run:
+            raise StageRunNotFoundError(stage_run_id)
+        return stage_run
+
+    def size(self, stage_run_id) -> int:
+        """Total bytes appended to a stage run's log"""
+        end = self.db.execute(
+            select(StageLogChunk.byte_offset + StageLogChunk.byte_length)
+            .where(StageLogChunk.stage_run_id == stage_run_id)
+            .order_by(StageLogChunk.byte_offset.desc())
+            .limit(1)
+        ).scalar()
+        return end or 0
+
+    def append(self, stage_run_id, data: bytes) -> int:
+        """Append bytes at the end of the log; returns the new size
+
+        The chunks are written in a SAVEPOINT and committed with the caller's
+        transaction, so a retry never discards the caller's other changes.
+        """
+        chunk_bytes = settings.stage_log_chunk_bytes
+        for attempt in range(1, APPEND_ATTEMPTS + 1):
+            offset = self.size(stage_run_id)
+            try:
+                with self.db.begin_nested():
+                    for start in range(0, len(data), chunk_bytes):
+                        piece = data[start : start + chunk_bytes]
+                        self.db.add(
+                            StageLogChunk(
+                                stage_run_id=stage_run_id,
+                                byte_offset=offset + start,
+                                byte_length=len(piece),
+                                data=zlib.compress(
+                                    piece, settings.stage_log_compression_level
+                                ),
+                            )
+                        )
+                return offset + len(data)
+            except IntegrityError:
+                # Someone else appended at this offset first
+                if attempt == APPEND_ATTEMPTS:
+                    raise
+
+    def read(
+        self, stage_run_id, offset: int = 0, length: Optional[int] = None
+    ) -> LogRead:
+        """Read up to ``length`` bytes from ``offset``; negative counts from the end"""
+        size = self.size(stage_run_id)
+        start = max(0, size + offset) if offset < 0 else min(offset, size)
+        limit = settings.stage_log_max_read_bytes
+        end = min(size, start + min(limit if length is None else length, limit))
+        if start >= end:
+            return start, b"", size
+
+        # The chunk holding ``start`` and every later one that begins before ``end``
+        first = (
+            select(func.max(StageLogChunk.byte_offset))
+            .where(
+                StageLogChunk.stage_run_id == stage_run_id,
+                StageLogChunk.byte_offset <= start,
+            )
+            .scalar_subquery()
+        )
+        chunks = self.db.execute(
+            select(StageLogChunk.byte_offset, StageLogChunk.data)
+            .where(
+                StageLogChunk.stage_run_id == stage_run_id,
+                StageLogChunk.byte_offset >= first,
+                StageLogChunk.byte_offset < end,
+            )
+            .order_by(StageLogChunk.byte_offset)
+        ).all()
+        if not chunks:
+            return start, b"", size
+
+        base = chunks[0].byte_offset
+        data = b"".join(zlib.decompress(chunk.data) for chunk in chunks)
+        return start, data[start - base : end - base], size
+
+    def tail(self, stage_run_id, lines: int) -> LogRead:
+        """The last ``lines`` lines, limited to ``stage_log_max_read_bytes``"""
+        limit = settings.stage_log_max_read_bytes
+        size = self.size(stage_run_id)
+        chunks = self.db.execute(
+            select(StageLogChunk.byte_offset, StageLogChunk.data)
+            .where(StageLogChunk.stage_run_id == stage_run_id)
+            .order_by(StageLogChunk.byte_offset.desc())
+            .execution_options(yield_per=4)
+        )
+
+        # Walk back from the end until enough lines (or bytes) are collected
+        data = b""
+        base = size
+        for chunk in chunks:
+            data = zlib.decompress(chunk.data) + data
+            base = chunk.byte_offset
+            if data.count(b"\n") > lines or len(data) >= limit:
+                break
+        chunks.close()
+
+        cut = len(data) - 1 if data.endswith(b"\n") else len(data)
+        for _ in range(lines):
+            cut = data.rfind(b"\n", 0, cut)
+            if cut < 0:
+                break
+        begin = max(cut + 1, len(data) - limit, 0)
+        return base + begin, data[begin:], size
+
+    async def follow(
+        self,
+        stage_run_id,
+        offset: int,
+        is_disconnected: Callable[[], Awaitable[bool]],
+    ) -> AsyncIterator[bytes]:
+        """Yield log bytes from ``offset`` as they are appended
+
+        Polls every ``stage_log_follow_poll_seconds`` and ends once the stage
+        run is finished and everything has been sent. The session is closed
+        between polls so an idle follower doesn't hold a connection.
+        """
+        try:
+            while not await is_disconnected():
+                status = self.db.execute(
+                    select(StageRun.status).where(StageRun.id == stage_run_id)
+                ).scalar()
+                _, data, _ = self.read(stage_run_id, offset)
+                if data:
+                    offset += len(data)
+                    yield data
+                    continue
+                if status is None or status in TERMINAL_RUN_STATUSES:
+                    return
+                self.db.close()
+                await asyncio.sleep(settings.stage_log_follow_poll_seconds)
+        finally:
+            self.db.close()
+
+
+class StageLogWriter:
+    """
+    Buffers a stage run's output and appends it in whole chunks.
+
+    Small writes are collected until a chunk is full so the store isn't
+    filled with tiny rows; ``flush`` (or leaving the ``with`` block) stores
+    whatever is buffered. The caller commits.
+    """
+
+    def __init__(self, service: StageLogService, stage_run_id):
+        self.service = service
+        self.stage_run_id = stage_run_id
+        self._buffer = bytearray()
+
+    def write(self, text: Union[str, bytes]) -> None:
+        self._buffer += text.encode("utf-8") if isinstance(text, str) else text
+        chunk_bytes = settings.stage_log_chunk_bytes
+        if len(self._buffer) >= chunk_bytes:
+            full = len(self._buffer) - len(self._buffer) % chunk_bytes
+            self.service.append(self.stage_run_id, bytes(self._buffer[:full]))
+            del self._buffer[:full]
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.service.append(self.stage_run_id, bytes(self._buffer))
+            self._buffer.clear()
+
+    def __enter__(self) -> "StageLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
@@ -1,9 +1,16 @@
 import logging
-from typing import List, Optional
+from operator import attrgetter
+from typing import List, Optional, Set
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session, defer, noload, selectinload
 
+from src.core.archive import RunArchive
+from src.core.cache import cache, pipeline_key, pipeline_runs_prefix
+from src.core.conversion import DTOConverter
+from src.core.database import is_replica_session
 from src.core.exceptions import PipelineValidationError
+from src.core.fields import Projection
 from src.models.dto import (
     PaginationResponse,
     PipelineCreate,
@@ -18,9 +25,29 @@ from src.models.schema.pipeline import (
     StageStatus,
     StageType,
 )
+from src.models.schema.run import ArchivedRun, PipelineRun, StageRun
+from src.services.log_service import delete_stage_logs
 
 logger = logging.getLogger(__name__)
 
+pipeline_response = DTOConverter(PipelineResponse)
+pipeline_with_stages = DTOConverter(
+    PipelineWithStages,
+    nested={
+        "stages": DTOConverter(PipelineStageResponse, sort_key=attrgetter("order"))
+    },
+)
+
+# Columns a field projection may leave unread, keyed by response field path
+PIPELINE_DEFERRABLE = {
+    "description": Pipeline.description,
+    "config": Pipeline.config,
+}
+STAGE_DEFERRABLE = {
+    "stages.config": PipelineStage.config,
+    "stages.metrics": PipelineStage.metrics,
+}
+
 
 class PipelineService:
     def __init__(self, db: Session):
@@ -59,7 +86,7 @@ class PipelineService:
             self.db.refresh(db_pipeline)
 
             logger.info(f"Created pipeline {db_pipeline.id}: {db_pipeline.name}")
-            return self._convert_to_response_with_stages(db_pipeline)
+            return pipeline_with_stages(db_pipeline)
 
         except Exception as e:
             self.db.rollback()
@@ -69,18 +96,25 @@ class PipelineService:
     def list_pipelines(self, skip: int = 0, limit: int = 100) -> List[PipelineResponse]:
         """List all pipelines"""
         pipelines = self.db.query(Pipeline).offset(skip).limit(limit).all()
-        return [self._convert_to_response(p) for p in pipelines]
+        return [pipeline_response(p) for p in pipelines]
 
     def list_pipelines_paginated(
-        self, page: int = 1, size: int = 100
+        self, page: int = 1, size: int = 100, projection: Optional[Projection] = None
     ) -> PaginationResponse[PipelineResponse]:
         """List pipelines with pagination"""
         skip = (page - 1) * size
+        omitted = projection.omitted(PIPELINE_DEFERRABLE) if projection else set()
 
         total = self.db.query(Pipeline).count()
 
-        pipelines = self.db.query(Pipeline).offset(skip).limit(size).all()
-        items = [self._convert_to_response(p) for p in pipelines]
+        pipelines = (
+            self.db.query(Pipeline)
+            .options(*[defer(PIPELINE_DEFERRABLE[name]) for name in omitted])
+            .offset(skip)
+            .limit(size)
+            .all()
+        )
+        items = [pipeline_response(p, omitted) for p in pipelines]
 
         return PaginationResponse.create(
             items=items,
@@ -94,16 +128,65 @@ class PipelineService:
         pipeline = self.db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
         if not pipeline:
             return None
-        return self._convert_to_response(pipeline)
+        return pipeline_response(pipeline)
 
     def get_pipeline_with_stages(
-        self, pipeline_id: str
+        self, pipeline_id: str, projection: Optional[Projection] = None
     ) -> Optional[PipelineWithStages]:
-        """Get a pipeline with all its stages"""
-        pipeline = self.db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+        """Get a pipeline with all its stages, served from the cache when possible
+
+        Columns the projection leaves out are not loaded and come back as
+        None; such partial results are never cached.
+        """
+        cached = self.get_cached_pipeline(pipeline_id)
+        if cached is not None:
+            return cached
+
+        omitted = (
+            projection.omitted([*PIPELINE_DEFERRABLE, *STAGE_DEFERRABLE, "stages"])
+            if projection
+            else set()
+        )
+        # A lagging replica could put a just-invalidated version back
+        cacheable = not omitted and not is_replica_session(self.db)
+        guard = cache.fill_guard(pipeline_key(pipeline_id)) if cacheable else None
+        if "stages" in omitted:
+            stages_option = noload(Pipeline.stages)
+        else:
+            stages_option = selectinload(Pipeline.stages).options(
+                *[defer(STAGE_DEFERRABLE[p]) for p in omitted if p in STAGE_DEFERRABLE]
+            )
+
+        pipeline = (
+            self.db.query(Pipeline)
+            .options(
+                stages_option,
+                *[
+                    defer(PIPELINE_DEFERRABLE[p])
+                    for p in omitted
+                    if p in PIPELINE_DEFERRABLE
+                ],
+            )
+            .filter(Pipeline.id == pipeline_id)
+            .first()
+        )
         if not pipeline:
             return None
-        return self._convert_to_response_with_stages(pipeline)
+
+        response = pipeline_with_stages(pipeline, omitted)
+        if cacheable:
+            cache.set_model(pipeline_key(pipeline_id), response, guard=guard)
+        return response
+
+    def get_cached_pipeline(self, pipeline_id: str) -> Optional[PipelineWithStages]:
+        """Cached pipeline definition, None on a miss"""
+        return cache.get_model(pipeline_key(pipeline_id), PipelineWithStages)
+
+    def get_pipeline_version(self, pipeline_id: str) -> Optional[int]:
+        """Current version of a pipeline without loading it, None if missing"""
+        return self.db.execute(
+            select(Pipeline.version).where(Pipeline.id == pipeline_id)
+        ).scalar()
 
     def delete_pipeline(self, pipeline_id: str) -> bool:
         """Delete a pipeline and all its data"""
@@ -112,8 +195,20 @@ class PipelineService:
             return False
 
         try:
+            delete_stage_logs(
+                self.db,
+                select(StageRun.id)
+                .join(PipelineRun, StageRun.pipeline_run_id == PipelineRun.id)
+                .where(PipelineRun.pipeline_id == pipeline.id),
+            )
+            self.db.execute(
+                delete(ArchivedRun).where(ArchivedRun.pipeline_id == pipeline.id)
+            )
             self.db.delete(pipeline)
             self.db.commit()
+            cache.delete(pipeline_key(pipeline_id))
+            cache.delete_prefix(pipeline_runs_prefix(pipeline_id))
+            RunArchive().delete_pipeline(pipeline_id)
             logger.info(f"Deleted pipeline {pipeline_id}")
             return True
         except Exception as e:
@@ -157,63 +252,3 @@ class PipelineService:
                 raise PipelineValidationError(
                     f"Stage {stage.name} with type CUSTOM must have a custom_name"
                 )
-
-    def _convert_to_response(self, pipeline: Pipeline) -> PipelineResponse:
-        """Convert Pipeline model to response schema"""
-        return PipelineResponse(
-            id=str(pipeline.id),
-            name=pipeline.name,
-            description=pipeline.description,
-            status=pipeline.status.value,
-            config=pipeline.config,
-            started_at=pipeline.started_at,
-            completed_at=pipeline.completed_at,
-            execution_time=pipeline.execution_time,
-            memory_usage=pipeline.memory_usage,
-            cpu_usage=pipeline.cpu_usage,
-            created_at=pipeline.created_at,
-            updated_at=pipeline.updated_at,
-        )
-
-    def _convert_to_response_with_stages(
-        self, pipeline: Pipeline
-    ) -> PipelineWithStages:
-        """Convert Pipeline model to response schema with stages"""
-        stage_responses = []
-        for stage in pipeline.stages:
-            stage_response = PipelineStageResponse(
-                id=str(stage.id),
-                name=stage.name,
-                stage_type=stage.stage_type,
-                custom_name=stage.custom_name,
-                status=stage.status,
-                order=stage.order,
-                config=stage.config,
-                dependencies=stage.dependencies,
-                started_at=stage.started_at,
-                completed_at=stage.completed_at,
-                execution_time=stage.execution_time,
-                output_path=stage.output_path,
-                metrics=stage.metrics,
-                created_at=stage.created_at,
-                updated_at=stage.updated_at,
-            )
-            stage_responses.append(stage_response)
-
-        stage_responses.sort(key=lambda x: x.order)
-
-        return PipelineWithStages(
-            id=str(pipeline.id),
-            name=pipeline.name,
-            description=pipeline.description,
-            status=pipeline.status.value,
-            config=pipeline.config,
-            started_at=pipeline.started_at,
-            completed_at=pipeline.completed_at,
-            execution_time=pipeline.execution_time,
-            memory_usage=pipeline.memory_usage,
-            cpu_usage=pipeline.cpu_usage,
-            created_at=pipeline.created_at,
-            updated_at=pipeline.updated_at,
-            stages=stage_responses,
-        )
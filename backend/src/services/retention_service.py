@@ -0,0 +1,127 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, selectinload
+
+from src.core.archive import RunArchive
+from src.core.config import settings
+from src.core.database import SessionLocal
+from src.core.database.partitions import (
+    drop_expired_partitions,
+    ensure_run_partitions,
+)
+from src.models.schema.run import (
+    TERMINAL_RUN_STATUSES,
+    ArchivedRun,
+    PipelineRun,
+    StageRun,
+)
+from src.services.log_service import delete_stage_logs
+from src.services.run_service import run_with_stages
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionService:
+    def __init__(self, db: Session, archive: Optional[RunArchive] = None):
+        self.db = db
+        self.archive = archive or RunArchive()
+
+    def archive_expired_runs(
+        self, retention_days: Optional[int] = None, batch_size: Optional[int] = None
+    ) -> int:
+        """Move terminal runs older than the retention policy into the archive
+
+        Each batch is written to the archive before it is deleted from the hot
+        tables, so a failure part way through can only leave a run in both
+        places, never in neither. The ``archived_runs`` index is written in
+        the transaction that deletes them, so it only names runs the archive
+        holds. Runs referenced by artifacts stay in the
+        database. Stage logs are not archived; they are deleted with the run.
+        """
+        retention_days = (
+            settings.run_retention_days if retention_days is None else retention_days
+        )
+        batch_size = batch_size or settings.run_archive_batch_size
+        if retention_days <= 0:
+            logger.info("Run retention disabled, nothing to archive")
+            return 0
+
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        archived = 0
+
+        while True:
+            runs = (
+                self.db.query(PipelineRun)
+                .options(selectinload(PipelineRun.stage_runs))
+                .filter(
+                    PipelineRun.status.in_(TERMINAL_RUN_STATUSES),
+                    PipelineRun.created_at < cutoff,
+                    ~PipelineRun.stage_runs.any(StageRun.artifacts.any()),
+                )
+                .order_by(PipelineRun.created_at)
+                .limit(batch_size)
+                .all()
+            )
+            if not runs:
+                break
+
+            try:
+                self.archive.write_runs([run_with_stages(run) for run in runs])
+
+                run_ids = [run.id for run in runs]
+                now = datetime.utcnow()
+                self.db.execute(
+                    insert(ArchivedRun),
+                    [
+                        {
+                            "id": run.id,
+                            "pipeline_id": run.pipeline_id,
+                            "created_at": run.created_at,
+                            "updated_at": now,
+                        }
+                        for run in runs
+                    ],
+                )
+                delete_stage_logs(
+                    self.db,
+                    select(StageRun.id).where(StageRun.pipeline_run_id.in_(run_ids)),
+                )
+                self.db.execute(
+                    delete(StageRun).where(StageRun.pipeline_run_id.in_(run_ids))
+                )
+                self.db.execute(delete(PipelineRun).where(PipelineRun.id.in_(run_ids)))
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Failed to archive runs: {e}")
+                raise
+
+            archived += len(runs)
+            logger.info(f"Archived {len(runs)} runs older than {cutoff.isoformat()}")
+
+        self._maintain_partitions(cutoff)
+        return archived
+
+    def _maintain_partitions(self, cutoff: datetime) -> None:
+        """Keep future monthly partitions ahead and drop emptied old ones"""
+        connection = self.db.connection()
+        if connection.dialect.name != "postgresql":
+            return
+
+        ensure_run_partitions(connection)
+        drop_expired_partitions(connection, cutoff)
+        self.db.commit()
+
+
+def run_retention() -> int:
+    """Apply the configured run retention policy once"""
+    db = SessionLocal()
+    try:
+        archived = RetentionService(db).archive_expired_runs()
+        logger.info(f"Run retention complete, archived {archived} runs")
+        return archived
+    finally:
+        db.close()
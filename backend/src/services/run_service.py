@@ -1,16 +1,42 @@
 import asyncio
+import json
 import logging
 import random
-from datetime import datetime
-from typing import List, Optional
-
-from sqlalchemy.orm import Session
-
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session, defer, noload, selectinload
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.core.archive import RunArchive, archive_month
+from src.core.cache import cache, pipeline_key, pipeline_runs_prefix, run_key
+from src.core.config import settings
+from src.core.conversion import DTOConverter
+from src.core.database import is_replica_session
+from src.core.events import run_events
 from src.core.exceptions import PipelineNotFoundError, PipelineRunNotFoundError
+from src.core.fields import Projection
+from src.core.metrics import (
+    RUN_ADMISSION_WAIT,
+    RUN_DURATION,
+    RUNS_QUEUED,
+    RUNS_RUNNING,
+    STAGE_DURATION,
+)
+from src.core.resources import ResourceSampler
+from src.core.tracing import CONSUMER, PRODUCER, parse_traceparent, tracer
 from src.models.dto import (
     PaginationResponse,
     PipelineRunResponse,
     PipelineRunWithStages,
+    RunEventType,
+    RunFilter,
     StageRunResponse,
     TriggerRunRequest,
 )
@@ -19,10 +45,83 @@ from src.models.schema.pipeline import (
     PipelineStage,
     get_expected_artifact_types,
 )
-from src.models.schema.run import PipelineRun, RunStatus, StageRun, TriggerType
+from src.models.schema.run import (
+    TERMINAL_RUN_STATUSES,
+    ArchivedRun,
+    PipelineRun,
+    RunStatus,
+    StageRun,
+    TriggerType,
+)
+from src.services.log_service import StageLogService, StageLogWriter
+from src.services.stats_service import StatsService
 
 logger = logging.getLogger(__name__)
 
+run_response = DTOConverter(PipelineRunResponse)
+run_with_stages = DTOConverter(
+    PipelineRunWithStages,
+    nested={
+        "stage_runs": DTOConverter(StageRunResponse, sort_key=attrgetter("stage_id"))
+    },
+)
+
+# Columns a field projection may leave unread, keyed by response field path
+RUN_DEFERRABLE = {
+    "run_config": PipelineRun.run_config,
+    "error_message": PipelineRun.error_message,
+    "output_data": PipelineRun.output_data,
+    "notes": PipelineRun.notes,
+}
+STAGE_RUN_DEFERRABLE = {
+    "stage_runs.output_data": StageRun.output_data,
+    "stage_runs.error_message": StageRun.error_message,
+    "stage_runs.logs": StageRun.logs,
+    "stage_runs.resource_series": StageRun.resource_series,
+}
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Run timestamps are stored as naive UTC"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _unix_ns(value: datetime) -> int:
+    """Nanoseconds since the epoch of a stored (naive UTC) timestamp"""
+    return int(_naive_utc(value).replace(tzinfo=timezone.utc).timestamp() * 1e9)
+
+
+def _json_paths(
+    document: Dict[str, Any], prefix: str = "$"
+) -> Iterator[Tuple[str, Any]]:
+    """Flatten a nested config filter into (JSON path, leaf value) pairs"""
+    for key, value in document.items():
+        path = f'{prefix}."{key}"'
+        if isinstance(value, dict):
+            yield from _json_paths(value, path)
+        else:
+            yield path, value
+
+
+def _json_leaf_matches(path: str, value: Any):
+    """JSON1 condition for one config filter leaf on non-PostgreSQL databases
+
+    Lists are compared as whole JSON documents, so unlike ``@>`` a list only
+    matches an identical list. null matches an explicit null, not a missing
+    key.
+    """
+    if value is None:
+        return func.json_type(PipelineRun.run_config, path) == "null"
+    if isinstance(value, list):
+        return func.json(func.json_extract(PipelineRun.run_config, path)) == func.json(
+            json.dumps(value)
+        )
+    if isinstance(value, bool):
+        value = int(value)
+    return func.json_extract(PipelineRun.run_config, path) == value
+
 
 class RunService:
     def __init__(self, db: Session):
@@ -32,52 +131,74 @@ class RunService:
         self, pipeline_id: str, trigger_data: TriggerRunRequest
     ) -> PipelineRunResponse:
         """Trigger a new pipeline run"""
-        pipeline = self.db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
-        if not pipeline:
-            raise PipelineNotFoundError(pipeline_id)
-
-        try:
-            db_run = PipelineRun(
-                pipeline_id=pipeline_id,
-                trigger_type=TriggerType.MANUAL,
-                triggered_by=trigger_data.triggered_by,
-                run_config=trigger_data.run_config,
-                environment=trigger_data.environment,
-                tags=trigger_data.tags,
-                notes=trigger_data.notes,
-                status=RunStatus.PENDING,
+        with tracer.span(
+            "trigger_run", attributes={"pipeline.id": str(pipeline_id)}
+        ) as span:
+            pipeline = (
+                self.db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
             )
+            if not pipeline:
+                raise PipelineNotFoundError(pipeline_id)
+
+            try:
+                db_run = PipelineRun(
+                    id=uuid.uuid4(),
+                    pipeline_id=pipeline_id,
+                    trigger_type=TriggerType.MANUAL,
+                    triggered_by=trigger_data.triggered_by,
+                    run_config=trigger_data.run_config,
+                    environment=trigger_data.environment,
+                    tags=trigger_data.tags,
+                    notes=trigger_data.notes,
+                    status=RunStatus.PENDING,
+                )
 
-            self.db.add(db_run)
-            self.db.flush()
+                self.db.add(db_run)
+                self.db.flush()
 
-            stages = (
-                self.db.query(PipelineStage)
-                .filter(PipelineStage.pipeline_id == pipeline_id)
-                .all()
-            )
-
-            for stage in stages:
-                stage_run = StageRun(
-                    pipeline_run_id=db_run.id,
-                    stage_id=stage.id,
-                    status=RunStatus.PENDING,
+                stage_ids = (
+                    self.db.execute(
+                        select(PipelineStage.id).where(
+                            PipelineStage.pipeline_id == pipeline_id
+                        )
+                    )
+                    .scalars()
+                    .all()
                 )
-                self.db.add(stage_run)
 
-            self.db.commit()
-            self.db.refresh(db_run)
+                if stage_ids:
+                    self.db.execute(
+                        insert(StageRun),
+                        [
+                            {
+                                "id": uuid.uuid4(),
+                                "pipeline_run_id": db_run.id,
+                                "stage_id": stage_id,
+                                "status": RunStatus.PENDING,
+                            }
+                            for stage_id in stage_ids
+                        ],
+                    )
 
-            logger.info(f"Triggered run {db_run.id} for pipeline {pipeline_id}")
+                # Committing the PENDING run queues it for the executor
+                with tracer.span("run.enqueue", PRODUCER) as enqueue:
+                    db_run.traceparent = enqueue.traceparent
+                    self.db.commit()
+                    self.db.refresh(db_run)
 
-            asyncio.create_task(self._simulate_execution(db_run.id))
+                    logger.info(f"Triggered run {db_run.id} for pipeline {pipeline_id}")
+                    self._publish_run(db_run)
 
-            return self._convert_to_response(db_run)
+                    RUNS_QUEUED.inc()
+                    asyncio.create_task(self._simulate_execution(db_run.id))
 
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Failed to trigger run for pipeline {pipeline_id}: {e}")
-            raise
+                span.set_attribute("run.id", str(db_run.id))
+                return run_response(db_run)
+
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Failed to trigger run for pipeline {pipeline_id}: {e}")
+                raise
 
     def list_pipeline_runs(
         self, pipeline_id: str, skip: int = 0, limit: int = 100
@@ -96,34 +217,57 @@ class RunService:
             .all()
         )
 
-        return [self._convert_to_response(run) for run in runs]
+        return [run_response(run) for run in runs]
 
     def list_pipeline_runs_paginated(
-        self, pipeline_id: str, page: int = 1, size: int = 100
+        self,
+        pipeline_id: str,
+        page: int = 1,
+        size: int = 100,
+        filters: Optional[RunFilter] = None,
+        projection: Optional[Projection] = None,
     ) -> PaginationResponse[PipelineRunResponse]:
         """List pipeline runs with pagination"""
         pipeline = self.db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
         if not pipeline:
             raise PipelineNotFoundError(pipeline_id)
 
+        return self.list_runs_paginated(
+            page=page,
+            size=size,
+            filters=filters,
+            pipeline_id=pipeline.id,
+            projection=projection,
+        )
+
+    def list_runs_paginated(
+        self,
+        page: int = 1,
+        size: int = 100,
+        filters: Optional[RunFilter] = None,
+        pipeline_id=None,
+        projection: Optional[Projection] = None,
+    ) -> PaginationResponse[PipelineRunResponse]:
+        """List runs across pipelines, optionally filtered by status, time, tags and config"""
         skip = (page - 1) * size
+        omitted = projection.omitted(RUN_DEFERRABLE) if projection else set()
 
-        total = (
-            self.db.query(PipelineRun)
-            .filter(PipelineRun.pipeline_id == pipeline_id)
-            .count()
-        )
+        query = self.db.query(PipelineRun)
+        if pipeline_id is not None:
+            query = query.filter(PipelineRun.pipeline_id == pipeline_id)
+        if filters:
+            query = self._apply_filters(query, filters)
 
+        total = query.count()
         runs = (
-            self.db.query(PipelineRun)
-            .filter(PipelineRun.pipeline_id == pipeline_id)
+            query.options(*[defer(RUN_DEFERRABLE[name]) for name in omitted])
             .order_by(PipelineRun.created_at.desc())
             .offset(skip)
             .limit(size)
             .all()
         )
 
-        items = [self._convert_to_response(run) for run in runs]
+        items = [run_response(run, omitted) for run in runs]
 
         return PaginationResponse.create(
             items=items,
@@ -132,20 +276,341 @@ class RunService:
             size=size,
         )
 
+    def iter_pipeline_runs(
+        self,
+        pipeline_id: str,
+        filters: Optional[RunFilter] = None,
+        projection: Optional[Projection] = None,
+        include_stages: bool = False,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[PipelineRunResponse]:
+        """Stream every run of a pipeline, oldest first, in constant memory
+
+        Rows are fetched ``batch_size`` at a time through a server-side cursor
+        (``yield_per``) and stage runs, when included, are loaded per batch.
+        The pipeline is checked up front so a missing one raises before the
+        first row is produced. Runs are yielded as PipelineRunWithStages when
+        ``include_stages`` is set.
+        """
+        pipeline = self.db.query(Pipeline.id).filter(Pipeline.id == pipeline_id).first()
+        if not pipeline:
+            raise PipelineNotFoundError(pipeline_id)
+
+        omitted = (
+            projection.omitted([*RUN_DEFERRABLE, *STAGE_RUN_DEFERRABLE])
+            if projection
+            else set()
+        )
+        query = self.db.query(PipelineRun).filter(
+            PipelineRun.pipeline_id == pipeline.id
+        )
+        if filters:
+            query = self._apply_filters(query, filters)
+        options = [defer(RUN_DEFERRABLE[p]) for p in omitted if p in RUN_DEFERRABLE]
+        if include_stages:
+            options.append(
+                selectinload(PipelineRun.stage_runs).options(
+                    *[
+                        defer(STAGE_RUN_DEFERRABLE[p])
+                        for p in omitted
+                        if p in STAGE_RUN_DEFERRABLE
+                    ]
+                )
+            )
+
+        return self._iter_runs(
+            query.options(*options)
+            .order_by(PipelineRun.created_at, PipelineRun.id)
+            .yield_per(batch_size or settings.run_export_batch_size),
+            omitted,
+            include_stages,
+        )
+
+    def _iter_runs(
+        self, query, omitted: Set[str], include_stages: bool
+    ) -> Iterator[PipelineRunResponse]:
+        convert = run_with_stages if include_stages else run_response
+        try:
+            for run in query:
+                yield convert(run, omitted)
+        finally:
+            # Ends the read transaction and releases the cursor, also when the
+            # client disconnects half way
+            self.db.rollback()
+
     def get_run_with_stages(
-        self, pipeline_id: str, run_id: str
+        self, pipeline_id: str, run_id: str, projection: Optional[Projection] = None
     ) -> Optional[PipelineRunWithStages]:
-        """Get a pipeline run with all stage runs"""
+        """Get a pipeline run with all stage runs, falling back to the archive
+
+        Finished runs no longer change, so they are cached once read. Columns
+        the projection leaves out are not loaded and come back as None; such
+        partial results are never cached.
+        """
+        cached = self.get_cached_run(pipeline_id, run_id)
+        if cached is not None:
+            return cached
+
+        omitted = (
+            projection.omitted([*RUN_DEFERRABLE, *STAGE_RUN_DEFERRABLE, "stage_runs"])
+            if projection
+            else set()
+        )
+        guard = cache.fill_guard(
+            run_key(pipeline_id, run_id), pipeline_runs_prefix(pipeline_id)
+        )
+        if "stage_runs" in omitted:
+            stage_runs_option = noload(PipelineRun.stage_runs)
+        else:
+            stage_runs_option = selectinload(PipelineRun.stage_runs).options(
+                *[
+                    defer(STAGE_RUN_DEFERRABLE[path])
+                    for path in omitted
+                    if path in STAGE_RUN_DEFERRABLE
+                ]
+            )
+
         run = (
             self.db.query(PipelineRun)
+            .options(
+                stage_runs_option,
+                *[defer(RUN_DEFERRABLE[p]) for p in omitted if p in RUN_DEFERRABLE],
+            )
             .filter(PipelineRun.pipeline_id == pipeline_id, PipelineRun.id == run_id)
             .first()
         )
 
         if not run:
-            return None
+            archived = self._load_archived({run_id: pipeline_id})
+            response = next(iter(archived.values()), None)
+        else:
+            response = run_with_stages(run, omitted)
+            if (
+                omitted
+                or run.status not in TERMINAL_RUN_STATUSES
+                or is_replica_session(self.db)
+            ):
+                return response
+
+        if response is not None:
+            cache.set_model(run_key(pipeline_id, run_id), response, guard=guard)
+        return response
+
+    def get_cached_run(
+        self, pipeline_id: str, run_id: str
+    ) -> Optional[PipelineRunWithStages]:
+        """Cached finished run, None on a miss"""
+        return cache.get_model(run_key(pipeline_id, run_id), PipelineRunWithStages)
+
+    def get_runs_with_stages(
+        self,
+        refs: List[Tuple[Optional[str], str]],
+        projection: Optional[Projection] = None,
+    ) -> Tuple[List[PipelineRunWithStages], List[str]]:
+        """Get many runs with their stage runs at once
+
+        ``refs`` are (pipeline_id, run_id) pairs; the pipeline may be None
+        when only the run id is known. Cached runs are served from the cache,
+        the rest come from one IN query plus one query for all their stage
+        runs, and runs of known pipelines that are not in the database are
+        looked up in the archive. Returns the runs in request order and the
+        run ids that were not found.
+        """
+        wanted: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+        for pipeline_id, run_id in refs:
+            try:
+                key = str(uuid.UUID(str(run_id)))
+                if pipeline_id is not None:
+                    pipeline_id = str(uuid.UUID(str(pipeline_id)))
+            except ValueError:
+                missing.append(str(run_id))
+                continue
+            wanted.setdefault(key, pipeline_id)
+
+        found: Dict[str, PipelineRunWithStages] = {}
+        for run_id, pipeline_id in wanted.items():
+            if pipeline_id is not None:
+                cached = self.get_cached_run(pipeline_id, run_id)
+                if cached is not None:
+                    found[run_id] = cached
+
+        pending = [uuid.UUID(run_id) for run_id in wanted if run_id not in found]
+        # Only runs asked for with their pipeline have known keys to guard
+        guarded = {
+            run_id: (run_key(pipeline_id, run_id), pipeline_runs_prefix(pipeline_id))
+            for run_id, pipeline_id in wanted.items()
+            if run_id not in found and pipeline_id is not None
+        }
+        guards = dict(zip(guarded, cache.fill_guards(list(guarded.values()))))
+        omitted = (
+            projection.omitted([*RUN_DEFERRABLE, *STAGE_RUN_DEFERRABLE, "stage_runs"])
+            if projection
+            else set()
+        )
+        if pending:
+            if "stage_runs" in omitted:
+                stage_runs_option = noload(PipelineRun.stage_runs)
+            else:
+                stage_runs_option = selectinload(PipelineRun.stage_runs).options(
+                    *[
+                        defer(STAGE_RUN_DEFERRABLE[path])
+                        for path in omitted
+                        if path in STAGE_RUN_DEFERRABLE
+                    ]
+                )
+            runs = (
+                self.db.query(PipelineRun)
+                .options(
+                    stage_runs_option,
+                    *[defer(RUN_DEFERRABLE[p]) for p in omitted if p in RUN_DEFERRABLE],
+                )
+                .filter(PipelineRun.id.in_(pending))
+                .all()
+            )
+            cacheable = not omitted and not is_replica_session(self.db)
+            for run in runs:
+                run_id = str(run.id)
+                pipeline_id = wanted[run_id]
+                if pipeline_id is not None and pipeline_id != str(run.pipeline_id):
+                    continue
+                found[run_id] = run_with_stages(run, omitted)
+                if (
+                    cacheable
+                    and run_id in guards
+                    and run.status in TERMINAL_RUN_STATUSES
+                ):
+                    cache.set_model(
+                        run_key(run.pipeline_id, run.id),
+                        found[run_id],
+                        guard=guards[run_id],
+                    )
 
-        return self._convert_to_response_with_stages(run)
+        # Runs moved out by retention
+        found.update(
+            self._load_archived(
+                {
+                    run_id: pipeline_id
+                    for run_id, pipeline_id in wanted.items()
+                    if run_id not in found
+                }
+            )
+        )
+
+        missing.extend(run_id for run_id in wanted if run_id not in found)
+        return [found[run_id] for run_id in wanted if run_id in found], missing
+
+    def get_run_version(self, pipeline_id: str, run_id: str) -> Optional[int]:
+        """Current version of a run without loading it, None if not in the database"""
+        return self.db.execute(
+            select(PipelineRun.version).where(
+                PipelineRun.pipeline_id == pipeline_id, PipelineRun.id == run_id
+            )
+        ).scalar()
+
+    async def wait_for_run_change(
+        self,
+        pipeline_id: str,
+        run_id: str,
+        version: Optional[int],
+        timeout: float,
+    ) -> Optional[PipelineRunWithStages]:
+        """Long-poll for a run newer than ``version``
+
+        Returns the run as soon as its version exceeds ``version`` (at once if
+        it already does), or None when it is still unchanged after
+        ``timeout``. Waiting is driven by the run event bus rather than
+        re-querying; the version is read once more when the timeout expires,
+        so a change whose event never reached this process isn't reported as
+        unchanged.
+        """
+        with run_events.subscribe(run_id) as subscription:
+            current = self.get_run_version(pipeline_id, run_id)
+            if current is None or version is None or current > version:
+                # Missing and archived runs fall through to the normal lookup
+                return self.get_run_with_stages(pipeline_id, run_id)
+
+            # Give the connection back to the pool while waiting
+            self.db.rollback()
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                event = await subscription.get(timeout=deadline - loop.time())
+                if event is None:
+                    current = self.get_run_version(pipeline_id, run_id)
+                    if current is not None and current <= version:
+                        return None
+                    break
+                if event.version is None or event.version > version:
+                    break
+
+        return self.get_run_with_stages(pipeline_id, run_id)
+
+    def list_archived_runs_paginated(
+        self, pipeline_id: str, page: int = 1, size: int = 100
+    ) -> PaginationResponse[PipelineRunWithStages]:
+        """List runs that retention moved out of the database"""
+        pipeline = self.db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+        if not pipeline:
+            raise PipelineNotFoundError(pipeline_id)
+
+        skip = (page - 1) * size
+        query = self.db.query(ArchivedRun).filter(
+            ArchivedRun.pipeline_id == pipeline.id
+        )
+        total = query.count()
+        entries = (
+            query.order_by(ArchivedRun.created_at.desc(), ArchivedRun.id)
+            .offset(skip)
+            .limit(size)
+            .all()
+        )
+
+        months: Dict[str, Set[str]] = defaultdict(set)
+        for entry in entries:
+            months[archive_month(entry.created_at)].add(str(entry.id))
+        runs = RunArchive().read_runs(str(pipeline.id), months)
+        items = [runs[str(entry.id)] for entry in entries if str(entry.id) in runs]
+
+        return PaginationResponse.create(items=items, total=total, page=page, size=size)
+
+    def _load_archived(
+        self, refs: Dict[str, Optional[str]]
+    ) -> Dict[str, PipelineRunWithStages]:
+        """Archived runs among ``refs`` (run id -> pipeline id or None)
+
+        The archived run index says which runs retention moved out and in
+        which monthly file; ids it doesn't know never touch the archive.
+        """
+        try:
+            wanted = {
+                uuid.UUID(str(run_id)): (
+                    None if pipeline_id is None else uuid.UUID(str(pipeline_id))
+                )
+                for run_id, pipeline_id in refs.items()
+            }
+        except ValueError:
+            return {}
+        if not wanted:
+            return {}
+
+        entries = (
+            self.db.query(ArchivedRun).filter(ArchivedRun.id.in_(list(wanted))).all()
+        )
+        grouped: Dict[str, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        for entry in entries:
+            if wanted[entry.id] not in (None, entry.pipeline_id):
+                continue
+            grouped[str(entry.pipeline_id)][archive_month(entry.created_at)].add(
+                str(entry.id)
+            )
+
+        archive = RunArchive()
+        found: Dict[str, PipelineRunWithStages] = {}
+        for pipeline_id, months in grouped.items():
+            found.update(archive.read_runs(pipeline_id, months))
+        return found
 
     def cancel_run(self, pipeline_id: str, run_id: str) -> bool:
         """Cancel a pipeline run"""
@@ -159,6 +624,8 @@ class RunService:
             return False
 
         try:
+            was_active = run.status in [RunStatus.PENDING, RunStatus.RUNNING]
+            cancelled_stages = []
             run.status = RunStatus.CANCELLED
             run.completed_at = datetime.utcnow()
             run.execution_time = (
@@ -171,13 +638,22 @@ class RunService:
                 if stage_run.status in [RunStatus.PENDING, RunStatus.RUNNING]:
                     stage_run.status = RunStatus.CANCELLED
                     stage_run.completed_at = datetime.utcnow()
+                    cancelled_stages.append(stage_run)
                     if stage_run.started_at:
                         stage_run.execution_time = (
                             stage_run.completed_at - stage_run.started_at
                         ).total_seconds()
 
+            if was_active:
+                StatsService(self.db).record_terminal_run(run)
             self.db.commit()
+            cache.delete(run_key(pipeline_id, run_id))
+            if was_active:
+                cache.delete(pipeline_key(pipeline_id))
             logger.info(f"Cancelled run {run_id}")
+            for stage_run in cancelled_stages:
+                self._publish_stage(run, stage_run)
+            self._publish_run(run)
             return True
 
         except Exception as e:
@@ -196,6 +672,7 @@ class RunService:
         - Update the pipeline run status based on the stage run status
         - Update the pipeline run status based on the stage run status
         """
+        queued, running = True, False
         try:
             await asyncio.sleep(1)
 
@@ -203,143 +680,232 @@ class RunService:
             if not run:
                 return
 
-            run.status = RunStatus.RUNNING
-            self.db.commit()
+            # Continue the trace of the request that triggered the run
+            parent = parse_traceparent(run.traceparent)
+            attributes = {"run.id": str(run.id), "pipeline.id": str(run.pipeline_id)}
+            tracer.record(
+                "run.queued",
+                _unix_ns(run.created_at),
+                time.time_ns(),
+                CONSUMER,
+                attributes,
+                parent,
+            )
 
-            stages = sorted(run.stage_runs, key=lambda x: x.stage.order)
+            with tracer.span("run.execute", CONSUMER, attributes, parent) as span:
+                with tracer.span("db.commit", attributes={"run.status": "RUNNING"}):
+                    run.status = RunStatus.RUNNING
+                    run.started_at = datetime.utcnow()
+                    self.db.commit()
+                self._publish_run(run)
+
+                RUNS_QUEUED.dec()
+                RUNS_RUNNING.inc()
+                queued, running = False, True
+                RUN_ADMISSION_WAIT.observe(
+                    (run.started_at - _naive_utc(run.created_at)).total_seconds()
+                )
 
-            for stage_run in stages:
-                stage_run.status = RunStatus.RUNNING
-                stage_run.started_at = datetime.utcnow()
-                self.db.commit()
+                stages = sorted(run.stage_runs, key=lambda x: x.stage.order)
 
-                execution_time = random.uniform(1, 5)
-                await asyncio.sleep(execution_time)
+                for stage_run in stages:
+                    await self._execute_stage(run, stage_run)
 
-                if random.random() < 0.9:
-                    stage_run.status = RunStatus.COMPLETED
+                    if stage_run.status == RunStatus.FAILED:
+                        run.status = RunStatus.FAILED
+                        run.error_message = (
+                            f"Pipeline failed at stage: {stage_run.stage.name}"
+                        )
+                        break
 
-                    expected_artifacts = get_expected_artifact_types(
-                        stage_run.stage.stage_type
-                    )
+                if run.status == RunStatus.RUNNING:
+                    run.status = RunStatus.COMPLETED
+                    run.output_data = {"message": "Pipeline completed successfully"}
 
-                    stage_run.output_data = {
-                        "result": f"Stage {stage_run.stage.name} completed successfully",
-                        "stage_type": stage_run.stage.stage_type.value,
-                        "custom_name": stage_run.stage.custom_name,
-                        "expected_artifacts": [
-                            artifact.value for artifact in expected_artifacts
-                        ],
-                    }
-                    run.success_count += 1
-                else:
-                    stage_run.status = RunStatus.FAILED
-                    stage_run.error_message = (
-                        f"Simulated failure in stage {stage_run.stage.name}"
-                    )
-                    run.failed_count += 1
+                run.completed_at = datetime.utcnow()
+                run.execution_time = (run.completed_at - run.started_at).total_seconds()
+                run.max_memory_usage = max(
+                    [sr.memory_usage or 0 for sr in run.stage_runs]
+                )
+                run.max_cpu_usage = max([sr.cpu_usage or 0 for sr in run.stage_runs])
 
-                stage_run.completed_at = datetime.utcnow()
-                stage_run.execution_time = execution_time
-                stage_run.memory_usage = random.uniform(100, 500)
-                stage_run.cpu_usage = random.uniform(20, 80)
+                with tracer.span(
+                    "db.commit", attributes={"run.status": run.status.value}
+                ):
+                    StatsService(self.db).record_terminal_run(run)
+                    self.db.commit()
+                span.set_attribute("run.status", run.status.value)
 
-                self.db.commit()
+            # The pipeline's execution and resource summary just changed
+            cache.delete(pipeline_key(run.pipeline_id))
+            logger.info(f"Completed run {run.id} with status {run.status}")
+            self._publish_run(run)
+            RUN_DURATION.labels(run.status.value).observe(run.execution_time)
 
-                if stage_run.status == RunStatus.FAILED:
-                    run.status = RunStatus.FAILED
-                    run.error_message = (
-                        f"Pipeline failed at stage: {stage_run.stage.name}"
-                    )
-                    break
+        except StaleDataError:
+            self.db.rollback()
+            logger.info(f"Run {run_id} was changed elsewhere, stopping execution")
+        except Exception as e:
+            logger.error(f"Error in simulated execution for run {run_id}: {e}")
+        finally:
+            if queued:
+                RUNS_QUEUED.dec()
+            if running:
+                RUNS_RUNNING.dec()
+
+    async def _execute_stage(self, run: PipelineRun, stage_run: StageRun) -> None:
+        """Run one stage attempt (simulated) and record its outcome"""
+        stage = stage_run.stage
+        with tracer.span(
+            "stage",
+            attributes={
+                "stage.name": stage.name,
+                "stage.type": stage.stage_type.value,
+                "stage.order": stage.order,
+                "stage.attempt": stage_run.attempt_number,
+            },
+        ) as span:
+            with tracer.span("db.commit", attributes={"stage.status": "RUNNING"}):
+                stage_run.status = RunStatus.RUNNING
+                stage_run.started_at = datetime.utcnow()
+                run.updated_at = stage_run.started_at  # Bumps run.version
+                self.db.commit()
+            self._publish_stage(run, stage_run)
 
-            if run.status == RunStatus.RUNNING:
-                run.status = RunStatus.COMPLETED
-                run.output_data = {"message": "Pipeline completed successfully"}
+            log = StageLogWriter(StageLogService(self.db), stage_run.id)
+            log.write(
+                f"{stage_run.started_at.isoformat()} Starting stage "
+                f"{stage.name} ({stage.stage_type.value})\n"
+            )
 
-            run.completed_at = datetime.utcnow()
-            run.execution_time = (run.completed_at - run.started_at).total_seconds()
-            run.max_memory_usage = max([sr.memory_usage or 0 for sr in run.stage_runs])
-            run.max_cpu_usage = max([sr.cpu_usage or 0 for sr in run.stage_runs])
+            sampler = ResourceSampler()
+            with tracer.span("stage.execute"):
+                sampler.start()
+                try:
+                    await asyncio.sleep(random.uniform(1, 5))
+                finally:
+                    await sampler.stop()
+            execution_time = sampler.elapsed
+
+            if random.random() < 0.9:
+                stage_run.status = RunStatus.COMPLETED
+
+                expected_artifacts = get_expected_artifact_types(stage.stage_type)
+
+                stage_run.output_data = {
+                    "result": f"Stage {stage.name} completed successfully",
+                    "stage_type": stage.stage_type.value,
+                    "custom_name": stage.custom_name,
+                    "expected_artifacts": [
+                        artifact.value for artifact in expected_artifacts
+                    ],
+                }
+                run.success_count += 1
+            else:
+                stage_run.status = RunStatus.FAILED
+                stage_run.error_message = f"Simulated failure in stage {stage.name}"
+                run.failed_count += 1
+
+            stage_run.completed_at = datetime.utcnow()
+            stage_run.execution_time = execution_time
+            log.write(
+                f"{stage_run.completed_at.isoformat()} Stage "
+                f"{stage_run.status.value.lower()} after {execution_time:.2f}s\n"
+            )
+            stage_run.memory_usage = sampler.peak_rss_mb
+            stage_run.cpu_usage = sampler.cpu_percent
+            stage_run.cpu_time = round(sampler.cpu_time, 3)
+            stage_run.io_read_bytes = sampler.read_bytes
+            stage_run.io_write_bytes = sampler.write_bytes
+            stage_run.resource_series = sampler.series
+
+            with tracer.span(
+                "db.commit", attributes={"stage.status": stage_run.status.value}
+            ):
+                # Same transaction as the status change, so a finished stage
+                # is never seen without its whole log
+                log.flush()
+                self.db.commit()
+            self._publish_stage(run, stage_run)
+            span.set_attribute("stage.status", stage_run.status.value)
+            STAGE_DURATION.labels(
+                stage.stage_type.value, stage_run.status.value
+            ).observe(execution_time)
+
+    def _apply_filters(self, query, filters: RunFilter):
+        """Translate a RunFilter into WHERE clauses
+
+        On PostgreSQL tag and config filters are JSONB containment (``@>``)
+        checks, which the GIN indexes on tags and run_config serve. Other
+        databases fall back to the JSON1 functions.
+        """
+        if filters.status:
+            query = query.filter(PipelineRun.status == RunStatus(filters.status.value))
+        if filters.created_after:
+            query = query.filter(
+                PipelineRun.created_at >= _naive_utc(filters.created_after)
+            )
+        if filters.created_before:
+            query = query.filter(
+                PipelineRun.created_at < _naive_utc(filters.created_before)
+            )
 
-            self.db.commit()
-            logger.info(f"Completed run {run.id} with status {run.status}")
+        postgres = self.db.get_bind().dialect.name == "postgresql"
 
-        except Exception as e:
-            logger.error(f"Error in simulated execution for run {run_id}: {e}")
+        if filters.tags:
+            if postgres:
+                query = query.filter(
+                    PipelineRun.tags.op("@>")(type_coerce(filters.tags, JSONB))
+                )
+            else:
+                for tag in filters.tags:
+                    elements = func.json_each(PipelineRun.tags).table_valued("value")
+                    query = query.filter(
+                        select(1)
+                        .select_from(elements)
+                        .where(elements.c.value == tag)
+                        .exists()
+                    )
 
-    def _convert_to_response(self, run: PipelineRun) -> PipelineRunResponse:
-        """Convert PipelineRun model to response schema"""
-        return PipelineRunResponse(
-            id=str(run.id),
-            pipeline_id=str(run.pipeline_id),
-            status=run.status,
-            trigger_type=run.trigger_type,
-            triggered_by=run.triggered_by,
-            started_at=run.started_at,
-            completed_at=run.completed_at,
-            execution_time=run.execution_time,
-            run_config=run.run_config,
-            environment=run.environment,
-            max_memory_usage=run.max_memory_usage,
-            max_cpu_usage=run.max_cpu_usage,
-            success_count=run.success_count,
-            failed_count=run.failed_count,
-            error_message=run.error_message,
-            output_data=run.output_data,
-            tags=run.tags,
-            notes=run.notes,
-            created_at=run.created_at,
-            updated_at=run.updated_at,
+        if filters.config:
+            if postgres:
+                query = query.filter(
+                    PipelineRun.run_config.op("@>")(type_coerce(filters.config, JSONB))
+                )
+            else:
+                for path, value in _json_paths(filters.config):
+                    query = query.filter(_json_leaf_matches(path, value))
+
+        return query
+
+    def _publish_run(self, run: PipelineRun) -> None:
+        """Announce a committed run state change to stream subscribers"""
+        run_events.publish(
+            RunEventType.RUN,
+            run.pipeline_id,
+            run.id,
+            run.status,
+            version=run.version,
+            data={
+                "successCount": run.success_count,
+                "failedCount": run.failed_count,
+                "executionTime": run.execution_time,
+                "errorMessage": run.error_message,
+            },
         )
 
-    def _convert_to_response_with_stages(
-        self, run: PipelineRun
-    ) -> PipelineRunWithStages:
-        """Convert PipelineRun model to response schema with stage runs"""
-        stage_responses = []
-        for stage_run in run.stage_runs:
-            stage_response = StageRunResponse(
-                id=str(stage_run.id),
-                pipeline_run_id=str(stage_run.pipeline_run_id),
-                stage_id=str(stage_run.stage_id),
-                status=stage_run.status,
-                attempt_number=stage_run.attempt_number,
-                started_at=stage_run.started_at,
-                completed_at=stage_run.completed_at,
-                execution_time=stage_run.execution_time,
-                memory_usage=stage_run.memory_usage,
-                cpu_usage=stage_run.cpu_usage,
-                output_data=stage_run.output_data,
-                error_message=stage_run.error_message,
-                logs=stage_run.logs,
-                created_at=stage_run.created_at,
-                updated_at=stage_run.updated_at,
-            )
-            stage_responses.append(stage_response)
-
-        stage_responses.sort(key=lambda x: x.stage_id)
-
-        return PipelineRunWithStages(
-            id=str(run.id),
-            pipeline_id=str(run.pipeline_id),
-            status=run.status,
-            trigger_type=run.trigger_type,
-            triggered_by=run.triggered_by,
-            started_at=run.started_at,
-            completed_at=run.completed_at,
-            execution_time=run.execution_time,
-            run_config=run.run_config,
-            environment=run.environment,
-            max_memory_usage=run.max_memory_usage,
-            max_cpu_usage=run.max_cpu_usage,
-            success_count=run.success_count,
-            failed_count=run.failed_count,
-            error_message=run.error_message,
-            output_data=run.output_data,
-            tags=run.tags,
-            notes=run.notes,
-            created_at=run.created_at,
-            updated_at=run.updated_at,
-            stage_runs=stage_responses,
+    def _publish_stage(self, run: PipelineRun, stage_run: StageRun) -> None:
+        """Announce a committed stage run state change to stream subscribers"""
+        run_events.publish(
+            RunEventType.STAGE,
+            run.pipeline_id,
+            run.id,
+            stage_run.status,
+            stage_run_id=stage_run.id,
+            stage_id=stage_run.stage_id,
+            version=run.version,
+            data={
+                "executionTime": stage_run.execution_time,
+                "errorMessage": stage_run.error_message,
+            },
         )
@@ -0,0 +1,205 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from src.core.cache import cache, pipeline_key
+from src.core.database import SessionLocal
+from src.core.exceptions import PipelineNotFoundError
+from src.core.sketch import QuantileSketch
+from src.models.dto import PipelineStatsResponse, StageStatsResponse
+from src.models.schema.pipeline import Pipeline
+from src.models.schema.run import TERMINAL_RUN_STATUSES, PipelineRun, RunStatus
+from src.models.schema.stats import PipelineStats, StageStats
+
+logger = logging.getLogger(__name__)
+
+
+class StatsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_terminal_run(self, run: PipelineRun) -> None:
+        """Fold a run that just reached a terminal state into the statistics
+
+        Runs inside the caller's transaction, so the counters commit together
+        with the status change that triggered them. Stats rows are locked while
+        they are updated to keep concurrent completions from losing updates.
+        """
+        if run.status not in TERMINAL_RUN_STATUSES:
+            return
+
+        stats = self._get_or_create(
+            PipelineStats, PipelineStats.pipeline_id, run.pipeline_id
+        )
+        self._count_outcome(stats, run.status, run.execution_time)
+        stats.last_run_at = run.completed_at
+
+        if run.max_memory_usage is not None or run.max_cpu_usage is not None:
+            stats.total_memory_usage += run.max_memory_usage or 0.0
+            stats.total_cpu_usage += run.max_cpu_usage or 0.0
+            stats.resource_samples += 1
+
+        for stage_run in run.stage_runs:
+            if stage_run.status not in TERMINAL_RUN_STATUSES:
+                continue
+            stage_stats = self._get_or_create(
+                StageStats,
+                StageStats.stage_id,
+                stage_run.stage_id,
+                pipeline_id=run.pipeline_id,
+            )
+            self._count_outcome(stage_stats, stage_run.status, stage_run.execution_time)
+            stage_stats.last_run_at = stage_run.completed_at
+
+        self._update_pipeline_summary(run.pipeline, stats)
+
+    def get_pipeline_stats(self, pipeline_id: str) -> PipelineStatsResponse:
+        """Read the maintained statistics for a pipeline and its stages"""
+        pipeline = self.db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+        if not pipeline:
+            raise PipelineNotFoundError(pipeline_id)
+
+        stats = (
+            self.db.query(PipelineStats)
+            .filter(PipelineStats.pipeline_id == pipeline.id)
+            .first()
+        )
+        stage_stats = (
+            self.db.query(StageStats)
+            .filter(StageStats.pipeline_id == pipeline.id)
+            .all()
+        )
+
+        if not stats:
+            return PipelineStatsResponse(pipeline_id=str(pipeline.id))
+
+        sketch = QuantileSketch.from_dict(stats.duration_sketch)
+        return PipelineStatsResponse(
+            pipeline_id=str(pipeline.id),
+            total_runs=stats.total_runs,
+            completed_runs=stats.completed_runs,
+            failed_runs=stats.failed_runs,
+            cancelled_runs=stats.cancelled_runs,
+            success_rate=self._success_rate(stats),
+            mean_duration=self._mean(stats.total_execution_time, sketch.count),
+            p50_duration=sketch.quantile(0.5),
+            p95_duration=sketch.quantile(0.95),
+            mean_memory_usage=self._mean(
+                stats.total_memory_usage, stats.resource_samples
+            ),
+            mean_cpu_usage=self._mean(stats.total_cpu_usage, stats.resource_samples),
+            last_run_at=stats.last_run_at,
+            stages=[self._convert_stage_stats(s) for s in stage_stats],
+        )
+
+    def rebuild_pipeline_stats(self, pipeline_id) -> None:
+        """Recompute a pipeline's statistics from the runs still in the database
+
+        Only needed to backfill history recorded before statistics existed.
+        Runs already moved to the archive by retention are not counted again.
+        """
+        self.db.execute(delete(StageStats).where(StageStats.pipeline_id == pipeline_id))
+        self.db.execute(
+            delete(PipelineStats).where(PipelineStats.pipeline_id == pipeline_id)
+        )
+        self.db.flush()
+
+        runs = (
+            self.db.query(PipelineRun)
+            .options(selectinload(PipelineRun.stage_runs))
+            .filter(
+                PipelineRun.pipeline_id == pipeline_id,
+                PipelineRun.status.in_(TERMINAL_RUN_STATUSES),
+            )
+            .order_by(PipelineRun.created_at)
+            .yield_per(500)
+        )
+        for run in runs:
+            self.record_terminal_run(run)
+        self.db.commit()
+        cache.delete(pipeline_key(pipeline_id))
+
+    def _get_or_create(self, model, key_column, key, **values):
+        row = self.db.query(model).filter(key_column == key).with_for_update().first()
+        if row:
+            return row
+
+        try:
+            with self.db.begin_nested():
+                row = model(
+                    **{key_column.key: key},
+                    **values,
+                    total_runs=0,
+                    completed_runs=0,
+                    failed_runs=0,
+                    cancelled_runs=0,
+                    total_execution_time=0.0,
+                )
+                self.db.add(row)
+        except IntegrityError:
+            # Another worker created the row first
+            row = self.db.query(model).filter(key_column == key).with_for_update().one()
+        return row
+
+    def _count_outcome(self, stats, status: RunStatus, execution_time) -> None:
+        stats.total_runs += 1
+        if status == RunStatus.COMPLETED:
+            stats.completed_runs += 1
+        elif status == RunStatus.FAILED:
+            stats.failed_runs += 1
+        else:
+            stats.cancelled_runs += 1
+
+        if execution_time is not None and status != RunStatus.CANCELLED:
+            sketch = QuantileSketch.from_dict(stats.duration_sketch)
+            sketch.add(execution_time)
+            stats.duration_sketch = sketch.to_dict()
+            stats.total_execution_time += execution_time
+
+    def _update_pipeline_summary(self, pipeline: Pipeline, stats: PipelineStats):
+        """Keep the pipeline's own execution and resource columns current"""
+        sketch = QuantileSketch.from_dict(stats.duration_sketch)
+        pipeline.execution_time = self._mean(stats.total_execution_time, sketch.count)
+        pipeline.memory_usage = self._mean(
+            stats.total_memory_usage, stats.resource_samples
+        )
+        pipeline.cpu_usage = self._mean(stats.total_cpu_usage, stats.resource_samples)
+
+    def _convert_stage_stats(self, stats: StageStats) -> StageStatsResponse:
+        sketch = QuantileSketch.from_dict(stats.duration_sketch)
+        return StageStatsResponse(
+            stage_id=str(stats.stage_id),
+            total_runs=stats.total_runs,
+            completed_runs=stats.completed_runs,
+            failed_runs=stats.failed_runs,
+            cancelled_runs=stats.cancelled_runs,
+            success_rate=self._success_rate(stats),
+            mean_duration=self._mean(stats.total_execution_time, sketch.count),
+            p50_duration=sketch.quantile(0.5),
+            p95_duration=sketch.quantile(0.95),
+            last_run_at=stats.last_run_at,
+        )
+
+    @staticmethod
+    def _success_rate(stats) -> Optional[float]:
+        finished = stats.completed_runs + stats.failed_runs
+        return stats.completed_runs / finished if finished else None
+
+    @staticmethod
+    def _mean(total: float, count: int) -> Optional[float]:
+        return total / count if count else None
+
+
+def rebuild_all_stats() -> None:
+    """Backfill statistics for every pipeline from the runs in the database"""
+    db = SessionLocal()
+    try:
+        service = StatsService(db)
+        for (pipeline_id,) in db.query(Pipeline.id).all():
+            service.rebuild_pipeline_stats(pipeline_id)
+        logger.info("Rebuilt pipeline statistics")
+    finally:
+        db.close()
@@ -4,9 +4,18 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from src.core.database import Base, get_db
+from src.core.cache import cache
+from src.core.config import settings
+from src.core.database import Base, get_db, get_read_db
+from src.core.ratelimit import read_limiter, trigger_limiter
 from src.server import app
 
+# Keep tests away from any local Redis; cache tests build their own Cache
+cache.enabled = False
+settings.run_event_relay_enabled = False
+# Metrics are still recorded, just not served on a real port
+settings.metrics_port = 0
+
 engine = create_engine(
     "sqlite:///:memory:",
     connect_args={"check_same_thread": False},
@@ -29,6 +38,10 @@ def client():
     """Create test client with test database"""
     Base.metadata.create_all(bind=engine)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Every test starts with full rate limit buckets
+    for limiter in (read_limiter, trigger_limiter):
+        limiter._buckets.clear()
 
     with TestClient(app) as test_client:
         yield test_client
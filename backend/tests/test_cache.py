@@ -0,0 +1,256 @@
+import fnmatch
+import time
+
+import pytest
+
+import src.services.pipeline_service as pipeline_service_module
+from src.core.cache import KEY_PREFIX, Cache, LRUCache, cache, pipeline_key, run_key
+from src.core.config import settings
+from src.models.schema.pipeline import Pipeline
+from src.models.schema.run import PipelineRun, RunStatus
+from src.services.pipeline_service import PipelineService
+from src.services.run_service import RunService
+from src.services.stats_service import StatsService
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client calls the cache uses"""
+
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("fake redis is down")
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value if isinstance(value, bytes) else value.encode()
+
+    def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match, count=None):
+        self._check()
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+    def register_script(self, script):
+        """Runs the guarded set the way its Lua script does"""
+
+        def guarded_set(keys, args):
+            self._check()
+            entry, generations = keys[0], keys[1:]
+            value, ttl, expected = args[0], args[1], args[2:]
+            for key, generation in zip(generations, expected):
+                if (self.data.get(key) or b"").decode() != generation:
+                    return 0
+            self.set(entry, value, ex=ttl)
+            return 1
+
+        return guarded_set
+
+
+@pytest.fixture
+def fake_cache():
+    return Cache(redis_client=FakeRedis(), enabled=True)
+
+
+@pytest.fixture
+def local_tier(monkeypatch):
+    """The application's cache with only its in-memory tier"""
+    monkeypatch.setattr(cache, "enabled", True)
+    monkeypatch.setattr(cache, "_redis_disabled_until", float("inf"))
+    cache.local.clear()
+    yield cache
+    cache.local.clear()
+
+
+def test_lru_evicts_least_recently_used_and_expires():
+    """The local tier is bounded by size and entry age"""
+    lru = LRUCache(max_entries=2, ttl=60)
+    lru.set("a", "1")
+    lru.set("b", "2")
+    lru.get("a")
+    lru.set("c", "3")
+
+    assert lru.get("b") is None
+    assert lru.get("a") == "1"
+
+    lru.set("d", "4", ttl=0.01)
+    time.sleep(0.02)
+    assert lru.get("d") is None
+
+
+def test_redis_tier_refills_local_tier(fake_cache):
+    """A Redis hit is served and copied into the local tier"""
+    fake_cache.set("pipeline:1", "payload")
+    fake_cache.local.clear()
+
+    assert fake_cache.get("pipeline:1") == "payload"
+    assert fake_cache.local.get("pipeline:1") == "payload"
+
+
+def test_falls_back_to_local_tier_when_redis_is_down(fake_cache):
+    """Redis errors never surface; missed invalidations replay on recovery"""
+    redis = fake_cache._redis
+    fake_cache.set("run:p:1", "old")
+    redis.down = True
+
+    fake_cache.delete("run:p:1")
+    fake_cache.set("run:p:2", "local only")
+
+    assert fake_cache.get("run:p:2") == "local only"
+    assert KEY_PREFIX + "run:p:1" in redis.data
+
+    redis.down = False
+    fake_cache._redis_disabled_until = 0.0
+    fake_cache.local.clear()
+
+    assert fake_cache.get("run:p:1") is None
+    assert KEY_PREFIX + "run:p:1" not in redis.data
+
+
+def test_delete_prefix_clears_both_tiers(fake_cache):
+    """Prefix invalidation removes every run of a pipeline"""
+    fake_cache.set("run:p:1", "a")
+    fake_cache.set("run:p:2", "b")
+    fake_cache.set("run:q:1", "c")
+
+    fake_cache.delete_prefix("run:p:")
+    fake_cache.local.clear()
+
+    assert fake_cache.get("run:p:1") is None
+    assert fake_cache.get("run:p:2") is None
+    assert fake_cache.get("run:q:1") == "c"
+
+
+def test_pipeline_reads_are_cached_until_deleted(db_session, fake_cache, monkeypatch):
+    """Repeated reads skip the database; deleting the pipeline invalidates"""
+    monkeypatch.setattr(pipeline_service_module, "cache", fake_cache)
+    pipeline = Pipeline(name="Hot Pipeline")
+    db_session.add(pipeline)
+    db_session.commit()
+    service = PipelineService(db_session)
+
+    first = service.get_pipeline_with_stages(pipeline.id)
+    db_session.query(Pipeline).filter(Pipeline.id == pipeline.id).update(
+        {"name": "Renamed behind the cache"}
+    )
+    db_session.commit()
+
+    assert service.get_pipeline_with_stages(pipeline.id).name == first.name
+    assert fake_cache.get(pipeline_key(pipeline.id)) is not None
+
+    service.delete_pipeline(pipeline.id)
+
+    assert fake_cache.get(pipeline_key(pipeline.id)) is None
+
+
+def test_guarded_fill_is_dropped_after_an_invalidation(fake_cache):
+    """A read that raced a write can't put the old value back"""
+    other_worker = Cache(redis_client=fake_cache._redis, enabled=True)
+
+    guard = fake_cache.fill_guard("pipeline:1")
+    fake_cache.delete("pipeline:1")
+    fake_cache.set("pipeline:1", "stale", guard=guard)
+    assert fake_cache.get("pipeline:1") is None
+
+    # Invalidated by another worker: Redis refuses, so the local tier does too
+    guard = fake_cache.fill_guard("run:p:1", "run:p:")
+    other_worker.delete_prefix("run:p:")
+    fake_cache.set("run:p:1", "stale", guard=guard)
+    assert fake_cache.get("run:p:1") is None
+    assert other_worker.get("run:p:1") is None
+
+    guard = fake_cache.fill_guard("pipeline:1")
+    fake_cache.set("pipeline:1", "fresh", guard=guard)
+    assert other_worker.get("pipeline:1") == "fresh"
+
+
+def test_pipeline_fill_racing_a_write_is_not_cached(
+    db_session, fake_cache, monkeypatch
+):
+    """A definition loaded before a concurrent invalidation isn't stored"""
+    monkeypatch.setattr(pipeline_service_module, "cache", fake_cache)
+    pipeline = Pipeline(name="Raced Pipeline")
+    db_session.add(pipeline)
+    db_session.commit()
+    convert = pipeline_service_module.pipeline_with_stages
+
+    def convert_then_invalidate(*args):
+        response = convert(*args)
+        # Another request changes the pipeline after this one read it
+        fake_cache.delete(pipeline_key(pipeline.id))
+        return response
+
+    monkeypatch.setattr(
+        pipeline_service_module, "pipeline_with_stages", convert_then_invalidate
+    )
+    PipelineService(db_session).get_pipeline_with_stages(pipeline.id)
+
+    assert fake_cache.get(pipeline_key(pipeline.id)) is None
+
+
+def test_pipeline_endpoint_serves_cache_until_invalidated(
+    client, db_session, local_tier
+):
+    """Cached definitions answer GETs and 304s; a write evicts them"""
+    pipeline = Pipeline(name="Cached Pipeline")
+    db_session.add(pipeline)
+    db_session.commit()
+    PipelineService(db_session).get_pipeline_with_stages(pipeline.id)
+    url = f"/v1/pipelines/{pipeline.id}"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Cached Pipeline"
+    etag = response.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    pipeline.name = "Renamed Pipeline"
+    db_session.commit()
+    assert client.get(url).json()["name"] == "Cached Pipeline"
+
+    StatsService(db_session).rebuild_pipeline_stats(pipeline.id)
+    assert local_tier.get(pipeline_key(pipeline.id)) is None
+
+    PipelineService(db_session).get_pipeline_with_stages(pipeline.id)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed Pipeline"
+    assert response.headers["etag"] != etag
+
+
+def test_finished_run_endpoint_is_served_from_cache(
+    client, db_session, local_tier, monkeypatch
+):
+    """A cached finished run answers GETs, 304s and keeps its compressed body"""
+    monkeypatch.setattr(settings, "compression_minimum_size", 0)
+    pipeline = Pipeline(name="Run Cache Pipeline")
+    db_session.add(pipeline)
+    db_session.flush()
+    run = PipelineRun(pipeline_id=pipeline.id, status=RunStatus.COMPLETED)
+    db_session.add(run)
+    db_session.commit()
+    RunService(db_session).get_run_with_stages(pipeline.id, run.id)
+    url = f"/v1/pipelines/{pipeline.id}/runs/{run.id}"
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "COMPLETED"
+    assert response.headers["content-encoding"] == "gzip"
+    body = f"{run_key(pipeline.id, run.id)}:v{run.version}:body:gzip"
+    assert local_tier.get_bytes(body) is not None
+    etag = response.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,68 @@
+import gzip
+
+from fastapi.testclient import TestClient
+
+import src.core.compression as compression_module
+from src.core.cache import Cache
+from src.core.compression import choose_encoding
+from src.core.serialization import serialized_response
+from src.models.dto import PipelineResponse
+
+
+def test_choose_encoding_honours_q_values():
+    """Client q-values win; unsupported and refused encodings are skipped"""
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*") is not None
+    assert choose_encoding(None) is None
+
+
+def test_large_json_is_compressed_small_is_not(
+    client: TestClient, sample_pipeline_data: dict
+):
+    """Bodies over the threshold are gzipped, small ones go out as-is"""
+    response = client.get("/v1/pipelines/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    for i in range(10):
+        client.post("/v1/pipelines/", json={**sample_pipeline_data, "name": f"p{i}"})
+    response = client.get("/v1/pipelines/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["total"] == 10
+
+
+def test_cached_body_is_compressed_once(monkeypatch):
+    """A response with a cache key is served pre-compressed from the cache"""
+    local_cache = Cache(enabled=True)
+    local_cache._redis_disabled_until = float("inf")
+    monkeypatch.setattr(compression_module, "cache", local_cache)
+    calls = []
+    gzip_encoder = compression_module.ENCODERS["gzip"]
+    monkeypatch.setitem(
+        compression_module.ENCODERS,
+        "gzip",
+        lambda data: calls.append(len(data)) or gzip_encoder(data),
+    )
+    payload = PipelineResponse(
+        id="p1",
+        name="Cached",
+        description="x" * 4096,
+        status="PENDING",
+        created_at="2024-01-01T00:00:00",
+        updated_at="2024-01-01T00:00:00",
+    )
+
+    for _ in range(3):
+        response = serialized_response(
+            payload,
+            PipelineResponse,
+            cache_key="pipeline:p1:v1:body",
+            accept_encoding="gzip",
+        )
+
+    assert len(calls) == 1
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body).startswith(b'{"id":"p1"')
@@ -0,0 +1,63 @@
+from sqlalchemy import select
+
+from src.models.dto import PipelineResponse
+from src.models.dto.run import RunStatus as RunStatusDTO
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.models.schema.run import PipelineRun, RunStatus
+from src.services.pipeline_service import pipeline_response, pipeline_with_stages
+from src.services.run_service import run_response
+
+
+def test_converter_matches_validated_dto(db_session):
+    """Converted DTOs equal the validated ones, after expiry too"""
+    pipeline = Pipeline(name="Converted Pipeline", config={"timeout": 60})
+    db_session.add_all(
+        [
+            pipeline,
+            PipelineStage(
+                pipeline=pipeline,
+                name="Train",
+                stage_type=StageType.MODEL_TRAINING,
+                order=1,
+            ),
+            PipelineStage(
+                pipeline=pipeline,
+                name="Ingest",
+                stage_type=StageType.DATA_INGESTION,
+                order=0,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    # Expired by the commit, so values are loaded on first access
+    response = pipeline_with_stages(pipeline)
+
+    assert response.id == str(pipeline.id)
+    assert [stage.name for stage in response.stages] == ["Ingest", "Train"]
+    assert PipelineResponse.model_validate(
+        response.model_dump(exclude={"stages"})
+    ) == pipeline_response(pipeline)
+
+
+def test_converter_reads_rows_and_skips_fields(db_session):
+    """Result rows convert like ORM objects; skipped fields come back empty"""
+    pipeline = Pipeline(name="Row Pipeline")
+    db_session.add(pipeline)
+    db_session.flush()
+    run = PipelineRun(
+        pipeline_id=pipeline.id, status=RunStatus.FAILED, error_message="boom"
+    )
+    db_session.add(run)
+    db_session.commit()
+
+    row = db_session.execute(
+        select(*PipelineRun.__table__.columns).where(PipelineRun.id == run.id)
+    ).one()
+    response = run_response(row, skip={"error_message"})
+
+    assert response.id == str(run.id)
+    assert response.pipeline_id == str(pipeline.id)
+    assert response.status is RunStatusDTO.FAILED
+    assert response.error_message is None
+    assert run_response(run).error_message == "boom"
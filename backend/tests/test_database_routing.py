@@ -0,0 +1,140 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import src.core.database.routing as routing
+from src.core.config import settings
+from src.core.database.routing import (
+    CLIENT_ID_HEADER,
+    STICKY_COOKIE_NAME,
+    ReadYourWritesMiddleware,
+    ReadYourWritesTracker,
+    ReplicaMonitor,
+    get_read_db,
+    is_replica_session,
+)
+
+
+def test_tracker_is_sticky_after_write():
+    """A client reads from the primary right after its own write"""
+    tracker = ReadYourWritesTracker(window_seconds=5)
+    tracker.mark_write("client-a")
+
+    assert tracker.is_sticky("client-a")
+    assert not tracker.is_sticky("client-b")
+
+
+def test_tracker_window_expires():
+    """Stickiness ends once the window has passed"""
+    tracker = ReadYourWritesTracker(window_seconds=0)
+    tracker.mark_write("client-a")
+
+    assert not tracker.is_sticky("client-a")
+
+
+def _replica(monkeypatch, url: str = "sqlite://"):
+    """Route reads to a second SQLite database as the replica"""
+    replica_engine = create_engine(url)
+    monkeypatch.setattr(routing, "replica_engine", replica_engine)
+    monkeypatch.setattr(
+        routing, "ReplicaSessionLocal", sessionmaker(bind=replica_engine)
+    )
+    monkeypatch.setattr(routing, "replica_monitor", ReplicaMonitor(check_interval=0))
+    monkeypatch.setattr(routing, "read_your_writes", ReadYourWritesTracker(5))
+
+
+@pytest.fixture
+def primary_sessions(monkeypatch):
+    """Sessions opened on the primary, which is its own SQLite database"""
+    primary = sessionmaker(bind=create_engine("sqlite://"))
+    opened = []
+
+    def session_local():
+        opened.append(primary())
+        return opened[-1]
+
+    monkeypatch.setattr(routing, "SessionLocal", session_local)
+    return opened
+
+
+@pytest.fixture
+def routed_client(primary_sessions):
+    """App with one read and one write endpoint"""
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/read")
+    def read(db: Session = Depends(get_read_db)):
+        return {"replica": is_replica_session(db)}
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    with TestClient(app) as client:
+        yield client
+
+
+def _reads_replica(client: TestClient, **kwargs) -> bool:
+    return client.get("/read", **kwargs).json()["replica"]
+
+
+def test_reads_use_the_primary_without_a_replica(routed_client):
+    assert routing.ReplicaSessionLocal is None
+    assert not _reads_replica(routed_client)
+
+
+def test_reads_go_to_a_healthy_replica(routed_client, primary_sessions, monkeypatch):
+    """Replica reads don't open a primary session at all"""
+    _replica(monkeypatch)
+
+    assert _reads_replica(routed_client)
+    assert primary_sessions == []
+
+
+def test_writes_make_the_clients_reads_sticky(routed_client, monkeypatch):
+    """After a write the cookie keeps reads on the primary, on any worker"""
+    _replica(monkeypatch)
+
+    response = routed_client.post("/write")
+    assert STICKY_COOKIE_NAME in response.cookies
+    # Another worker doesn't know about the write, only the cookie does
+    monkeypatch.setattr(routing, "read_your_writes", ReadYourWritesTracker(5))
+    assert not _reads_replica(routed_client)
+
+    routed_client.cookies.clear()
+    assert _reads_replica(routed_client)
+
+
+def test_client_id_header_keeps_reads_sticky(routed_client, monkeypatch):
+    """Clients that drop cookies stay sticky through X-Client-Id"""
+    _replica(monkeypatch)
+    headers = {CLIENT_ID_HEADER: "pipeline-ui"}
+
+    routed_client.post("/write", headers=headers)
+    routed_client.cookies.clear()
+
+    assert not _reads_replica(routed_client, headers=headers)
+    assert _reads_replica(routed_client, headers={CLIENT_ID_HEADER: "other"})
+
+
+def test_lagging_replica_falls_back_to_the_primary(
+    routed_client, primary_sessions, monkeypatch
+):
+    _replica(monkeypatch)
+    monkeypatch.setattr(settings, "database_replica_max_lag_seconds", -1)
+
+    assert not _reads_replica(routed_client)
+    assert len(primary_sessions) == 1
+    assert routing.replica_monitor.status()["status"] == "lagging"
+
+
+def test_unreachable_replica_falls_back_to_the_primary(
+    routed_client, monkeypatch, tmp_path
+):
+    _replica(monkeypatch, f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+
+    assert not _reads_replica(routed_client)
+    assert routing.replica_monitor.status()["status"].startswith("failed")
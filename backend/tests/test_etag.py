@@ -0,0 +1,36 @@
+from starlette.requests import Request
+
+from src.core.etag import etag_matches, make_etag
+from src.models.schema.pipeline import Pipeline
+from src.services.pipeline_service import PipelineService
+
+
+def _request(if_none_match):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_etag_matches_weak_and_listed_tags():
+    """If-None-Match uses weak comparison and accepts lists and *"""
+    etag = make_etag(3)
+
+    assert etag_matches(_request('W/"3"'), etag)
+    assert etag_matches(_request('"2", "3"'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('W/"2"'), etag)
+    assert not etag_matches(_request(None), etag)
+
+
+def test_pipeline_version_bumps_on_update(db_session):
+    """Updating a pipeline moves its version, and so its ETag"""
+    pipeline = Pipeline(name="Versioned Pipeline")
+    db_session.add(pipeline)
+    db_session.commit()
+    service = PipelineService(db_session)
+    assert service.get_pipeline_version(pipeline.id) == 1
+
+    pipeline.description = "changed"
+    db_session.commit()
+
+    assert service.get_pipeline_version(pipeline.id) == 2
+    assert pipeline.updated_at > pipeline.created_at
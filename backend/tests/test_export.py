@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import uuid
+
+import pytest
+
+from src.core.exceptions import PipelineNotFoundError
+from src.core.export import export_stream
+from src.core.fields import FieldSelection
+from src.models.dto import ExportFormat, PipelineRunResponse, PipelineRunWithStages
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.models.schema.run import PipelineRun, RunStatus, StageRun
+from src.services.run_service import RunService
+
+
+def _seed(db_session, count=5):
+    pipeline = Pipeline(name="Export Pipeline")
+    stage = PipelineStage(
+        pipeline=pipeline, name="Train", stage_type=StageType.MODEL_TRAINING, order=0
+    )
+    db_session.add_all([pipeline, stage])
+    db_session.flush()
+    for i in range(count):
+        run = PipelineRun(
+            pipeline_id=pipeline.id,
+            status=RunStatus.COMPLETED,
+            tags=["nightly"],
+            run_config={"batchSize": i},
+        )
+        db_session.add(run)
+        db_session.flush()
+        db_session.add(
+            StageRun(
+                pipeline_run_id=run.id,
+                stage_id=stage.id,
+                status=RunStatus.COMPLETED,
+                logs=f"log {i}",
+            )
+        )
+    db_session.commit()
+    return pipeline.id
+
+
+def test_export_ndjson_with_inline_stage_runs(db_session):
+    """Every run is exported across several cursor batches, oldest first"""
+    pipeline_id = _seed(db_session)
+
+    runs = RunService(db_session).iter_pipeline_runs(
+        pipeline_id, include_stages=True, batch_size=2
+    )
+    body = b"".join(export_stream(runs, PipelineRunWithStages, ExportFormat.NDJSON))
+
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert [row["runConfig"]["batchSize"] for row in rows] == [0, 1, 2, 3, 4]
+    assert [row["stageRuns"][0]["logs"] for row in rows][-1] == "log 4"
+
+
+def test_export_csv_columns_follow_projection(db_session):
+    """CSV has one column per selected field and JSON-encodes documents"""
+    pipeline_id = _seed(db_session, count=2)
+    projection = FieldSelection.parse("id,status,tags", None).project(
+        PipelineRunResponse
+    )
+
+    runs = RunService(db_session).iter_pipeline_runs(pipeline_id, projection=projection)
+    body = b"".join(
+        export_stream(
+            runs, PipelineRunResponse, ExportFormat.CSV, exclude=projection.exclude
+        )
+    )
+
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert len(rows) == 2
+    assert set(rows[0]) == {"id", "status", "tags"}
+    assert json.loads(rows[0]["tags"]) == ["nightly"]
+
+
+def test_export_unknown_pipeline(db_session):
+    """A missing pipeline is reported before streaming starts"""
+    with pytest.raises(PipelineNotFoundError):
+        RunService(db_session).iter_pipeline_runs(uuid.uuid4())
@@ -0,0 +1,88 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from src.core.fields import FieldSelection
+from src.models.dto import PipelineResponse, PipelineRunWithStages
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.models.schema.run import PipelineRun, RunStatus, StageRun
+from src.services.run_service import RunService
+
+
+def test_field_selection_resolves_camel_case_and_nesting():
+    """fields keeps the named fields, exclude drops nested ones"""
+    selection = FieldSelection.parse("id,status,stageRuns", "stageRuns.logs")
+
+    projection = selection.project(PipelineRunWithStages)
+
+    assert projection.omits("run_config")
+    assert projection.omits("stage_runs.logs")
+    assert not projection.omits("status")
+    assert not projection.omits("stage_runs.status")
+    assert projection.exclude["stage_runs"] == {"__all__": {"logs": True}}
+
+
+def test_field_selection_rejects_unknown_fields():
+    """Typos are reported instead of silently returning everything"""
+    with pytest.raises(ValueError, match="nope"):
+        FieldSelection.parse("id,nope", None).project(PipelineResponse)
+    with pytest.raises(ValueError, match="stage_runs.nope"):
+        FieldSelection.parse(None, "stageRuns.nope").project(PipelineRunWithStages)
+
+
+def test_run_detail_defers_excluded_columns(db_session):
+    """Excluded heavy columns are neither returned nor loaded"""
+    pipeline = Pipeline(name="Projected Pipeline")
+    stage = PipelineStage(
+        pipeline=pipeline, name="Train", stage_type=StageType.MODEL_TRAINING, order=0
+    )
+    run = PipelineRun(
+        pipeline=pipeline, status=RunStatus.COMPLETED, output_data={"auc": 0.9}
+    )
+    db_session.add_all([pipeline, stage, run])
+    db_session.flush()
+    db_session.add(
+        StageRun(
+            pipeline_run_id=run.id,
+            stage_id=stage.id,
+            status=RunStatus.COMPLETED,
+            logs="x" * 10_000,
+        )
+    )
+    db_session.commit()
+    pipeline_id, run_id = pipeline.id, run.id
+    db_session.expunge_all()
+
+    projection = FieldSelection.parse(None, "outputData,stageRuns.logs").project(
+        PipelineRunWithStages
+    )
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = RunService(db_session).get_run_with_stages(
+            pipeline_id, run_id, projection
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert response.output_data is None
+    assert response.stage_runs[0].logs is None
+    assert response.stage_runs[0].status.value == "COMPLETED"
+    assert not any("stage_runs.logs" in statement for statement in statements)
+    assert not any("pipeline_runs.output_data" in statement for statement in statements)
+
+
+def test_list_pipelines_sparse_fieldset(client: TestClient, sample_pipeline_data: dict):
+    """Only the requested fields are serialized; unknown fields are a 400"""
+    client.post("/v1/pipelines/", json=sample_pipeline_data)
+
+    response = client.get("/v1/pipelines/", params={"fields": "id,name"})
+
+    assert response.status_code == 200
+    assert set(response.json()["items"][0]) == {"id", "name"}
+    assert response.json()["total"] == 1
+
+    response = client.get("/v1/pipelines/", params={"exclude": "bogus"})
+    assert response.status_code == 400
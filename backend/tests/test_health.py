@@ -1,4 +1,10 @@
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+
+import src.core.database.pool as pool_module
+from src.core.database import engine as app_engine
+from src.core.database.pool import PoolWaitTracker, TimedQueuePool
+from src.core.health import HealthSampler
 
 
 def test_health_check(client: TestClient):
@@ -22,6 +28,10 @@ def test_health_check(client: TestClient):
     assert "available" in memory_usage
     assert "percent" in memory_usage
 
+    # No replica is configured in tests, so reads stay on the primary
+    assert data["replica"]["status"] == "not_configured"
+    assert data["replica"]["lagSeconds"] is None
+
 
 def test_api_docs_accessible(client: TestClient):
     """Test that API documentation is accessible"""
@@ -47,3 +57,64 @@ def test_openapi_spec(client: TestClient):
     assert "/v1/pipelines/" in paths
     assert "/v1/pipelines/{pipeline_id}" in paths
     assert "/v1/pipelines/{pipeline_id}/trigger_run" in paths
+
+
+def test_probes_read_the_snapshot_without_database_access(client: TestClient):
+    """Probes never check out a pool connection, however often they run"""
+    checkouts = []
+
+    def count(*args):
+        checkouts.append(1)
+
+    event.listen(app_engine, "checkout", count)
+    try:
+        for _ in range(20):
+            assert client.get("/health/").status_code == 200
+            assert client.get("/health/live").json() == {
+                "status": "alive",
+                "reason": None,
+            }
+            assert client.get("/health/ready").status_code == 200
+    finally:
+        event.remove(app_engine, "checkout", count)
+    assert checkouts == []
+
+
+def test_uptime_counts_from_process_start(client: TestClient):
+    """uptime is seconds the process has been up, not the wall clock"""
+    assert 0 <= client.get("/health/").json()["uptime"] < 24 * 3600
+
+
+def test_readiness_fails_while_database_is_unreachable(tmp_path):
+    """A failed ping marks the snapshot degraded and readiness not ready"""
+    sampler = HealthSampler(engine=create_engine(f"sqlite:///{tmp_path}/no/such.db"))
+
+    snapshot = sampler.sample()
+    sampler.snapshot = snapshot
+
+    assert snapshot.status == "degraded"
+    assert snapshot.database.startswith("failed")
+    assert sampler.not_ready_reason().startswith("database failed")
+    assert HealthSampler().not_ready_reason() == "starting"
+
+
+def test_exhausted_pool_does_not_fail_the_ping(tmp_path, monkeypatch):
+    """The ping bypasses the pool, so pool pressure isn't an outage"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    held = engine.connect()
+    tracker = PoolWaitTracker()
+    monkeypatch.setattr(pool_module, "pool_wait", tracker)
+    try:
+        snapshot = HealthSampler(engine=engine).sample()
+    finally:
+        held.close()
+
+    assert snapshot.database == "connected"
+    assert snapshot.pool.checked_out == 1
+    assert tracker.recent_max() == 0.0
@@ -0,0 +1,91 @@
+import asyncio
+import random
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY, generate_latest
+
+from src.core.metrics import collector_registry
+from src.models.dto import TriggerRunRequest
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.services.run_service import RunService
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_request_latency_is_recorded_per_route_template(
+    client: TestClient, sample_pipeline_data
+):
+    """Concrete URLs collapse into their route template; unknown paths into one"""
+    pipeline_id = client.post("/v1/pipelines/", json=sample_pipeline_data).json()["id"]
+    url = f"/v1/pipelines/{pipeline_id}/runs"
+    labels = {
+        "method": "GET",
+        "route": "/v1/pipelines/{pipeline_id}/runs",
+        "status": str(client.get(url).status_code),
+    }
+    before = _value("http_request_duration_seconds_count", **labels)
+    unmatched = {"method": "GET", "route": "unmatched", "status": "404"}
+    before_unmatched = _value("http_request_duration_seconds_count", **unmatched)
+
+    for _ in range(3):
+        client.get(url)
+    client.get("/no/such/path")
+
+    assert _value("http_request_duration_seconds_count", **labels) == before + 3
+    assert (
+        _value("http_request_duration_seconds_count", **unmatched)
+        == before_unmatched + 1
+    )
+    assert pipeline_id.encode() not in generate_latest(collector_registry())
+
+
+def test_run_and_stage_durations_are_recorded(db_session, monkeypatch):
+    """A finished run observes its stages, its total time and its queue wait"""
+
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda seconds: sleep(min(seconds, 0.01)))
+    monkeypatch.setattr(random, "random", lambda: 0.0)
+    pipeline = Pipeline(name="Measured Pipeline")
+    db_session.add_all(
+        [
+            pipeline,
+            PipelineStage(
+                pipeline=pipeline,
+                name="Train",
+                stage_type=StageType.MODEL_TRAINING,
+                order=0,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    stage_labels = {"stage_type": "MODEL_TRAINING", "status": "COMPLETED"}
+    stages_before = _value("pipeline_stage_duration_seconds_count", **stage_labels)
+    runs_before = _value("pipeline_run_duration_seconds_count", status="COMPLETED")
+    waits_before = _value("pipeline_run_admission_wait_seconds_count")
+    queued = []
+
+    async def scenario():
+        RunService(db_session).trigger_run(
+            pipeline.id, TriggerRunRequest(triggered_by="metrics_test")
+        )
+        queued.append(_value("pipeline_runs_queued"))
+        current = asyncio.current_task()
+        await asyncio.gather(*(t for t in asyncio.all_tasks() if t is not current))
+
+    asyncio.run(scenario())
+
+    assert queued == [1.0]
+    assert _value("pipeline_runs_queued") == 0.0
+    assert _value("pipeline_runs_running") == 0.0
+    assert (
+        _value("pipeline_stage_duration_seconds_count", **stage_labels)
+        == stages_before + 1
+    )
+    assert (
+        _value("pipeline_run_duration_seconds_count", status="COMPLETED")
+        == runs_before + 1
+    )
+    assert _value("pipeline_run_admission_wait_seconds_count") == waits_before + 1
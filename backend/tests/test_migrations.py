@@ -0,0 +1,15 @@
+from sqlalchemy import create_engine, inspect
+
+from src.core.database.migrate import current_heads, script_heads, upgrade_database
+
+
+def test_upgrade_runs_in_process_once(tmp_path):
+    """The first call migrates to head, later calls only check the version"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+
+    assert upgrade_database(engine) is True
+    assert upgrade_database(engine) is False
+
+    with engine.connect() as connection:
+        assert current_heads(connection) == script_heads()
+    assert "stage_log_chunks" in inspect(engine).get_table_names()
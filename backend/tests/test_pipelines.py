@@ -103,3 +103,17 @@ class TestPipelineEndpoints:
         }
         response = client.post("/v1/pipelines/", json=duplicate_order_data)
         assert response.status_code == 422
+
+    def test_list_pipelines(self, client: TestClient, sample_pipeline_data: dict):
+        """Test the paginated pipeline list keeps the camelCase payload shape"""
+        created = client.post("/v1/pipelines/", json=sample_pipeline_data).json()
+
+        response = client.get("/v1/pipelines/")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["total"] == 1
+        assert data["hasNext"] is False
+        assert data["items"][0]["id"] == created["id"]
+        assert data["items"][0]["createdAt"] == created["createdAt"]
@@ -0,0 +1,61 @@
+import pstats
+
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+
+TOKEN = "profiling-test-token"
+
+
+def test_profile_flag_is_ignored_without_access(client: TestClient):
+    """Outside debug mode and without the admin token requests run as usual"""
+    response = client.get("/v1/pipelines/", params={"profile": "1"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_profile_report_lists_sql_and_functions(
+    client: TestClient, sample_pipeline_data, monkeypatch
+):
+    """The admin token turns ?profile=1 into a cProfile and SQL report"""
+    monkeypatch.setattr(settings, "profiling_admin_token", TOKEN)
+    client.post("/v1/pipelines/", json=sample_pipeline_data)
+
+    response = client.get(
+        "/v1/pipelines/", params={"profile": "1"}, headers={"X-Profile-Token": TOKEN}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    report = response.text
+    assert report.startswith("GET /v1/pipelines/ -> 200 in ")
+    assert "SQL: 0 queries" not in report
+    assert "FROM pipelines" in report
+    assert "function calls" in report
+    wrong = client.get(
+        "/v1/pipelines/", params={"profile": "1"}, headers={"X-Profile-Token": "no"}
+    )
+    assert wrong.headers["content-type"] == "application/json"
+
+
+def test_stored_profiles_can_be_downloaded(client: TestClient, tmp_path, monkeypatch):
+    """In debug mode a stored profile is served as a report and as pstats data"""
+    monkeypatch.setattr(settings, "debug", True)
+    monkeypatch.setattr(settings, "profiling_output_path", str(tmp_path))
+
+    response = client.get("/v1/pipelines/", headers={"X-Profile": "store"})
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+    profile_id = response.headers["x-profile-id"]
+
+    report = client.get(f"/debug/profiles/{profile_id}")
+    assert report.text.startswith("GET /v1/pipelines/ -> 200")
+    download = client.get(f"/debug/profiles/{profile_id}/pstats")
+    path = tmp_path / "downloaded.prof"
+    path.write_bytes(download.content)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+    assert client.get("/debug/profiles/..%2F..%2Fetc%2Fpasswd").status_code == 404
+    monkeypatch.setattr(settings, "debug", False)
+    assert client.get(f"/debug/profiles/{profile_id}").status_code == 404
@@ -0,0 +1,50 @@
+import logging
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.core.config import settings
+from src.core.database import track_queries
+from src.core.database.queries import normalize_statement
+from src.services.pipeline_service import PipelineService
+
+
+def test_requests_report_their_queries(client: TestClient, sample_pipeline_data):
+    """Query totals come back in Server-Timing and feed per-route metrics"""
+    client.post("/v1/pipelines/", json=sample_pipeline_data)
+    labels = {"route": "/v1/pipelines/"}
+    before = REGISTRY.get_sample_value("http_request_db_queries_sum", labels) or 0
+
+    response = client.get("/v1/pipelines/")
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    queries = int(timing.split('desc="')[1].split()[0])
+    assert queries >= 2  # The page and its total count
+    after = REGISTRY.get_sample_value("http_request_db_queries_sum", labels)
+    assert after == before + queries
+
+
+def test_slow_queries_are_logged_with_their_call_site(db_session, caplog, monkeypatch):
+    """A slow statement is logged in normalized form with the service method"""
+    monkeypatch.setattr(settings, "database_slow_query_seconds", 1e-9)
+
+    with caplog.at_level(logging.WARNING, logger="src.core.database.queries"):
+        with track_queries() as stats:
+            PipelineService(db_session).list_pipelines()
+
+    assert stats.count >= 1
+    message = caplog.records[-1].getMessage()
+    assert "src/services/pipeline_service.py:" in message
+    assert "in PipelineService.list_pipelines" in message
+    assert "SELECT … FROM pipelines" in message
+
+
+def test_statements_normalize_to_their_shape():
+    """Column lists and expanded IN lists don't tell statements apart"""
+    statement = """SELECT pipelines.id, pipelines.name
+        FROM pipelines WHERE pipelines.id IN (%(id_1_1)s, %(id_1_2)s)"""
+
+    assert normalize_statement(statement) == (
+        "SELECT … FROM pipelines WHERE pipelines.id IN (…)"
+    )
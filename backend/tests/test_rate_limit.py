@@ -0,0 +1,92 @@
+from fastapi.testclient import TestClient
+
+import src.core.overload as overload_module
+import src.core.ratelimit as ratelimit_module
+from src.core.database.pool import PoolWaitTracker
+from src.core.ratelimit import TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills():
+    """A burst is allowed at once, then requests wait for the refill"""
+    clock = FakeClock()
+    limiter = TokenBucketLimiter("test", rate=1.0, burst=3, shared=False, clock=clock)
+
+    assert [limiter.take("a") for _ in range(3)] == [0, 0, 0]
+    assert limiter.take("a") == 1.0
+    assert limiter.take("b") == 0
+
+    clock.now = 2.0
+    assert limiter.take("a") == 0
+
+
+def test_shared_limiter_falls_back_to_local_buckets():
+    """With Redis down the shared limiter still limits, per process"""
+
+    class DownRedis:
+        def register_script(self, script):
+            raise ConnectionError("redis is down")
+
+    limiter = TokenBucketLimiter(
+        "test", rate=1.0, burst=1, shared=True, redis_client=DownRedis()
+    )
+
+    assert limiter.take("a") == 0
+    assert limiter.take("a") > 0
+
+
+def test_trigger_run_is_rate_limited(client: TestClient, monkeypatch):
+    """Over the limit triggering answers 429 with Retry-After"""
+    limiter = TokenBucketLimiter("trigger", rate=0.1, burst=1, shared=False)
+    monkeypatch.setattr(ratelimit_module, "trigger_limiter", limiter)
+    monkeypatch.setattr("src.controller.v1.runs.trigger_limiter", limiter)
+    url = "/v1/pipelines/00000000-0000-0000-0000-000000000000/trigger_run"
+    body = {"triggeredBy": "runaway-script"}
+
+    assert client.post(url, json=body).status_code != 429
+    response = client.post(url, json=body)
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "10"
+
+
+def test_trigger_limit_holds_across_triggered_by(client: TestClient, monkeypatch):
+    """Changing or dropping triggeredBy doesn't get one IP a fresh bucket"""
+    limiter = TokenBucketLimiter("trigger", rate=0.1, burst=2, shared=False)
+    monkeypatch.setattr("src.controller.v1.runs.trigger_limiter", limiter)
+    url = "/v1/pipelines/00000000-0000-0000-0000-000000000000/trigger_run"
+
+    statuses = [
+        client.post(url, json=body).status_code
+        for body in (
+            {"triggeredBy": "a"},
+            {},
+            {"triggeredBy": "b"},
+            {"triggeredBy": "c"},
+        )
+    ]
+
+    assert [code == 429 for code in statuses] == [False, False, True, True]
+    # The caller's own bucket still counts when the IP has tokens left
+    limiter._buckets.pop("ip:testclient")
+    assert client.post(url, json={"triggeredBy": "a"}).status_code != 429
+    assert client.post(url, json={"triggeredBy": "a"}).status_code == 429
+
+
+def test_overloaded_process_sheds_requests(client: TestClient, monkeypatch):
+    """Long pool waits turn requests into 503s; health checks still answer"""
+    tracker = PoolWaitTracker()
+    tracker.record(5.0)
+    monkeypatch.setattr(overload_module, "pool_wait", tracker)
+
+    response = client.get("/v1/pipelines/")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert client.get("/health/").status_code != 503
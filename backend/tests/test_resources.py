@@ -0,0 +1,83 @@
+import asyncio
+import random
+import subprocess
+import sys
+
+from src.core.resources import ResourceSampler
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.models.schema.run import PipelineRun, RunStatus, StageRun
+from src.services.run_service import RunService
+
+CHILD = """
+import subprocess, sys, time
+# A grandchild does the work, so only a process tree scan can see it
+subprocess.run([sys.executable, "-c", "import time\\nend = time.process_time() + 0.3\\nwhile time.process_time() < end: pass"])
+time.sleep(0.2)
+"""
+
+
+def test_in_process_sampling_is_downsampled_to_a_fixed_size():
+    """A long stage keeps at most max_points evenly spread points"""
+    sampler = ResourceSampler(interval=0.001, max_points=8)
+
+    async def stage():
+        sampler.start()
+        end = asyncio.get_running_loop().time() + 0.3
+        while asyncio.get_running_loop().time() < end:
+            sum(range(10_000))  # Keep the CPU busy between sleeps
+            await asyncio.sleep(0)
+        await sampler.stop()
+
+    asyncio.run(stage())
+
+    assert sampler.cpu_time > 0.05
+    assert 0 < sampler.cpu_percent <= 100 * 64
+    assert sampler.peak_rss_mb > 0
+    assert 2 <= len(sampler.series) <= 8
+    times = [point[0] for point in sampler.series]
+    assert times == sorted(times)
+    assert times[-1] <= sampler.elapsed
+
+
+def test_process_tree_sampling_counts_exited_children():
+    """CPU time of a grandchild is kept after it exits"""
+    process = subprocess.Popen([sys.executable, "-c", CHILD])
+    sampler = ResourceSampler(pid=process.pid, interval=0.02)
+
+    async def stage():
+        sampler.start()
+        await asyncio.to_thread(process.wait)
+        await sampler.stop()
+
+    asyncio.run(stage())
+
+    # Counted once, although both the grandchild and its parent report it
+    assert 0.2 <= sampler.cpu_time < 0.6
+    assert sampler.peak_rss_mb > 0
+    assert sampler.read_bytes >= 0 and sampler.write_bytes >= 0
+
+
+def test_stage_runs_store_measured_usage(db_session, monkeypatch):
+    """Executed stages record what they used instead of made up numbers"""
+    monkeypatch.setattr(random, "uniform", lambda a, b: 0.05)
+    monkeypatch.setattr(random, "random", lambda: 0.0)
+    pipeline = Pipeline(name="Sampled Pipeline")
+    stage = PipelineStage(
+        pipeline=pipeline, name="Train", stage_type=StageType.MODEL_TRAINING, order=0
+    )
+    run = PipelineRun(pipeline=pipeline, status=RunStatus.PENDING)
+    db_session.add_all([pipeline, stage, run])
+    db_session.flush()
+    db_session.add(StageRun(pipeline_run_id=run.id, stage_id=stage.id))
+    db_session.commit()
+
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda seconds: sleep(min(seconds, 0.05)))
+    asyncio.run(RunService(db_session)._simulate_execution(run.id))
+
+    stage_run = db_session.query(StageRun).one()
+    assert stage_run.status == RunStatus.COMPLETED
+    assert stage_run.memory_usage > 0
+    assert stage_run.cpu_time >= 0 and stage_run.io_read_bytes >= 0
+    assert stage_run.resource_series and len(stage_run.resource_series[0]) == 3
+    assert run.max_memory_usage == stage_run.memory_usage
@@ -0,0 +1,121 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.archive import RunArchive
+from src.core.config import settings
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.models.schema.run import ArchivedRun, PipelineRun, RunStatus, StageRun
+from src.services.retention_service import RetentionService
+from src.services.run_service import RunService
+
+
+def _create_run(db_session, pipeline, stage, status, age_days):
+    created_at = datetime.utcnow() - timedelta(days=age_days)
+    run = PipelineRun(pipeline_id=pipeline.id, status=status, created_at=created_at)
+    db_session.add(run)
+    db_session.flush()
+    db_session.add(
+        StageRun(
+            pipeline_run_id=run.id,
+            stage_id=stage.id,
+            status=status,
+            created_at=created_at,
+        )
+    )
+    db_session.commit()
+    return run
+
+
+def _create_pipeline(db_session):
+    pipeline = Pipeline(name="Retention Pipeline")
+    db_session.add(pipeline)
+    db_session.flush()
+    stage = PipelineStage(
+        pipeline_id=pipeline.id,
+        name="Ingest",
+        stage_type=StageType.DATA_INGESTION,
+        order=0,
+    )
+    db_session.add(stage)
+    db_session.commit()
+    return pipeline, stage
+
+
+def test_archive_expired_runs(db_session, tmp_path, monkeypatch):
+    """Old terminal runs move to the archive, recent and active runs stay"""
+    monkeypatch.setattr(settings, "run_archive_path", str(tmp_path))
+    pipeline, stage = _create_pipeline(db_session)
+    old_run = _create_run(db_session, pipeline, stage, RunStatus.COMPLETED, 60)
+    active_run = _create_run(db_session, pipeline, stage, RunStatus.RUNNING, 60)
+    recent_run = _create_run(db_session, pipeline, stage, RunStatus.FAILED, 1)
+    old_run_id = str(old_run.id)
+
+    archived = RetentionService(db_session).archive_expired_runs(retention_days=30)
+
+    assert archived == 1
+    remaining = {run.id for run in db_session.query(PipelineRun).all()}
+    assert remaining == {active_run.id, recent_run.id}
+    assert db_session.query(StageRun).count() == 2
+
+    assert [str(entry.id) for entry in db_session.query(ArchivedRun)] == [old_run_id]
+
+    service = RunService(db_session)
+    archived_run = service.get_run_with_stages(pipeline.id, old_run.id)
+    assert archived_run is not None
+    assert archived_run.status.value == "COMPLETED"
+    assert len(archived_run.stage_runs) == 1
+
+    page = service.list_archived_runs_paginated(pipeline.id)
+    assert page.total == 1
+    assert [run.id for run in page.items] == [old_run_id]
+
+
+def test_archive_is_only_read_for_indexed_runs(db_session, tmp_path, monkeypatch):
+    """Missing runs are answered from the index without opening the archive"""
+    monkeypatch.setattr(settings, "run_archive_path", str(tmp_path))
+    pipeline, stage = _create_pipeline(db_session)
+    runs = [
+        str(_create_run(db_session, pipeline, stage, RunStatus.COMPLETED, 60).id)
+        for _ in range(3)
+    ]
+    RetentionService(db_session).archive_expired_runs(retention_days=30)
+
+    reads = []
+    read_runs = RunArchive.read_runs
+    monkeypatch.setattr(
+        RunArchive,
+        "read_runs",
+        lambda self, pipeline_id, months: reads.append(months)
+        or read_runs(self, pipeline_id, months),
+    )
+    service = RunService(db_session)
+
+    assert service.get_run_with_stages(pipeline.id, uuid.uuid4()) is None
+    assert reads == []
+
+    # A page only parses the runs on it
+    page = service.list_archived_runs_paginated(pipeline.id, page=2, size=2)
+    assert page.total == 3 and len(page.items) == 1
+    assert sum(len(ids) for months in reads for ids in months.values()) == 1
+    assert page.items[0].id in runs
+
+    # Batch gets find archived runs by id alone; unknown ids read nothing
+    reads.clear()
+    unknown = str(uuid.uuid4())
+    found, missing = service.get_runs_with_stages(
+        [(None, runs[0]), (str(pipeline.id), unknown)]
+    )
+    assert [run.id for run in found] == [runs[0]]
+    assert missing == [unknown]
+    assert sum(len(ids) for months in reads for ids in months.values()) == 1
+
+
+def test_archive_rejects_paths_outside_its_root(tmp_path):
+    archive = RunArchive(str(tmp_path / "runs"))
+
+    with pytest.raises(ValueError):
+        archive.read_runs("..", {"2026-01": {"x"}})
+    with pytest.raises(ValueError):
+        archive.delete_pipeline("../runs")
@@ -0,0 +1,108 @@
+import asyncio
+
+from src.core.events import RunEventBus, RunEventRelay, sse_stream
+from src.models.dto import RunEventType
+from src.models.dto.run import RunStatus
+
+
+def test_replay_returns_missed_events_for_run():
+    """Resuming from an event id returns only newer events for that run"""
+    bus = RunEventBus(history_size=10)
+    first = bus.publish(RunEventType.RUN, "p", "run-1", RunStatus.RUNNING)
+    bus.publish(RunEventType.RUN, "p", "run-2", RunStatus.RUNNING)
+    third = bus.publish(RunEventType.RUN, "p", "run-1", RunStatus.COMPLETED)
+
+    assert [e.id for e in bus.replay("run-1", first.id)] == [third.id]
+
+
+def test_replay_requires_snapshot_after_gap():
+    """Ids older than the history or from another process can't be replayed"""
+    bus = RunEventBus(history_size=2)
+    for _ in range(5):
+        bus.publish(RunEventType.RUN, "p", "run-1", RunStatus.RUNNING)
+
+    assert bus.replay("run-1", f"{bus.boot_id}-1") is None
+    assert bus.replay("run-1", f"{bus.boot_id}-99") is None
+    assert bus.replay("run-1", f"{bus.boot_id}-4") is not None
+    assert bus.replay("run-1", "4") is None
+
+
+def test_replay_requires_snapshot_for_another_workers_id():
+    """An id from another process needs a snapshot even inside the local range"""
+    bus, other_worker = RunEventBus(), RunEventBus()
+    for _ in range(3):
+        bus.publish(RunEventType.RUN, "p", "run-1", RunStatus.RUNNING)
+    foreign = other_worker.publish(RunEventType.RUN, "p", "run-1", RunStatus.RUNNING)
+
+    assert bus.sequence(foreign.id) is None
+    assert bus.replay("run-1", foreign.id) is None
+    assert bus.replay("run-1", bus.last_id) == []
+
+
+def test_sse_stream_delivers_live_events_until_run_finishes():
+    """Subscribers receive transitions as they are published"""
+    bus = RunEventBus()
+
+    async def scenario():
+        subscription = bus.subscribe("run-1")
+
+        async def disconnected():
+            return False
+
+        async def publish_later():
+            await asyncio.sleep(0.01)
+            bus.publish(
+                RunEventType.STAGE, "p", "run-1", RunStatus.RUNNING, stage_run_id="s"
+            )
+            bus.publish(RunEventType.RUN, "p", "run-1", RunStatus.COMPLETED)
+
+        asyncio.ensure_future(publish_later())
+        return [
+            message
+            async for message in sse_stream(
+                subscription, [], bus.last_id, disconnected, keepalive=1
+            )
+        ]
+
+    messages = asyncio.run(scenario())
+
+    assert messages[0].startswith(f"id: {bus.boot_id}-1\nevent: stage\n")
+    assert '"stageRunId":"s"' in messages[0]
+    assert messages[1].startswith(f"id: {bus.boot_id}-2\nevent: run\n")
+    assert not bus._subscribers
+
+
+def test_relay_delivers_events_to_other_workers():
+    """A run's events wake subscribers in other processes, not the sender"""
+
+    class FakeRedis:
+        def __init__(self):
+            self.published = []
+
+        def publish(self, channel, message):
+            self.published.append(message)
+
+    redis = FakeRedis()
+    worker, other_worker = RunEventBus(), RunEventBus()
+    worker.relay = RunEventRelay(worker, redis_client=redis)
+    other_worker.relay = RunEventRelay(other_worker, redis_client=redis)
+
+    async def scenario():
+        with worker.subscribe("run-1") as own, other_worker.subscribe(
+            "run-1"
+        ) as remote:
+            sent = worker.publish(
+                RunEventType.RUN, "p", "run-1", RunStatus.COMPLETED, version=3
+            )
+            for message in redis.published:
+                worker.relay.receive(message)
+                other_worker.relay.receive(message)
+            relayed = await remote.get(timeout=1)
+            assert await own.get(timeout=1) == sent
+            assert await own.get(timeout=0.01) is None
+            return sent, relayed
+
+    sent, relayed = asyncio.run(scenario())
+
+    assert relayed == sent
+    assert other_worker.replay("run-1", sent.id) is None
@@ -0,0 +1,236 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from src.models.dto import RunFilter
+from src.models.schema.pipeline import Pipeline
+from src.models.schema.run import PipelineRun, RunStatus
+from src.services.run_service import RunService
+
+
+def _seed_runs(db_session):
+    pipeline = Pipeline(name="Filter Pipeline")
+    db_session.add(pipeline)
+    db_session.flush()
+
+    now = datetime.utcnow()
+    for status, tags, config, age in [
+        (RunStatus.FAILED, ["nightly", "gpu"], {"batchSize": 64}, 2),
+        (RunStatus.FAILED, ["nightly"], {"batchSize": 32}, 20),
+        (RunStatus.COMPLETED, ["nightly"], {"batchSize": 64}, 1),
+        (RunStatus.FAILED, ["adhoc"], {"optimizer": {"name": "adam"}}, 3),
+    ]:
+        db_session.add(
+            PipelineRun(
+                pipeline_id=pipeline.id,
+                status=status,
+                tags=tags,
+                run_config=config,
+                created_at=now - timedelta(days=age),
+            )
+        )
+    db_session.commit()
+    return pipeline
+
+
+def test_filter_runs_by_tag_status_and_time(db_session):
+    """All runs tagged nightly that failed in the last week"""
+    _seed_runs(db_session)
+
+    page = RunService(db_session).list_runs_paginated(
+        filters=RunFilter(
+            status="FAILED",
+            tags=["nightly"],
+            created_after=datetime.utcnow() - timedelta(days=7),
+        )
+    )
+
+    assert page.total == 1
+    assert page.items[0].tags == ["nightly", "gpu"]
+
+
+def test_filter_runs_requires_every_tag(db_session):
+    """Multiple tags are combined with AND"""
+    _seed_runs(db_session)
+
+    page = RunService(db_session).list_runs_paginated(
+        filters=RunFilter(tags=["nightly", "gpu"])
+    )
+
+    assert page.total == 1
+
+
+def test_filter_runs_by_config(db_session):
+    """Config filters match top-level and nested run_config values"""
+    _seed_runs(db_session)
+    service = RunService(db_session)
+
+    by_batch = service.list_runs_paginated(filters=RunFilter(config={"batchSize": 64}))
+    nested = service.list_runs_paginated(
+        filters=RunFilter(config={"optimizer": {"name": "adam"}})
+    )
+
+    assert by_batch.total == 2
+    assert nested.total == 1
+
+
+def test_filter_runs_by_config_list_and_null(db_session):
+    """List leaves compare as JSON; null matches only an explicit null"""
+    pipeline = _seed_runs(db_session)
+    for config in [{"layers": [1, 2], "seed": None}, {"layers": [2, 1]}]:
+        db_session.add(PipelineRun(pipeline_id=pipeline.id, run_config=config))
+    db_session.commit()
+    service = RunService(db_session)
+
+    layers = service.list_runs_paginated(filters=RunFilter(config={"layers": [1, 2]}))
+    seed = service.list_runs_paginated(filters=RunFilter(config={"seed": None}))
+
+    assert [run.run_config for run in layers.items] == [
+        {"layers": [1, 2], "seed": None}
+    ]
+    assert seed.total == 1
+
+
+def test_list_runs_endpoint_parses_filters(client):
+    """tags= and config.key=value query parameters reach the service"""
+    response = client.get(
+        "/v1/runs",
+        params={"tags": "nightly,gpu", "config.batchSize": "64", "status": "FAILED"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
+
+def test_conflicting_config_filters_are_rejected(client):
+    """A key that is both a value and a prefix, in either order, is a 400"""
+    for query in (
+        "config.a=1&config.a.b=2",
+        "config.a.b=2&config.a=1",
+        "config.a..b=1",
+        "config.=1",
+    ):
+        response = client.get(f"/v1/runs?{query}")
+        assert response.status_code == 400, query
+
+    assert client.get("/v1/runs?config.a.b=1&config.a.c=2").status_code == 200
+
+
+def _create_run(db_session):
+    pipeline = Pipeline(name="Wait Pipeline")
+    db_session.add(pipeline)
+    db_session.flush()
+    run = PipelineRun(pipeline_id=pipeline.id, status=RunStatus.PENDING)
+    db_session.add(run)
+    db_session.commit()
+    return run
+
+
+def test_run_version_increments_on_update(db_session):
+    """Every update of a run bumps its version"""
+    run = _create_run(db_session)
+    assert run.version == 1
+
+    run.status = RunStatus.RUNNING
+    db_session.commit()
+
+    assert run.version == 2
+
+
+def test_wait_for_run_change_returns_newer_run_immediately(db_session):
+    """A client holding an old version gets the current run without waiting"""
+    run = _create_run(db_session)
+    service = RunService(db_session)
+
+    result = asyncio.run(
+        service.wait_for_run_change(run.pipeline_id, run.id, 0, timeout=5)
+    )
+
+    assert result.version == 1
+
+
+def test_wait_for_run_change_times_out_when_unchanged(db_session):
+    """Without a change the long-poll gives up after the timeout"""
+    run = _create_run(db_session)
+    service = RunService(db_session)
+
+    result = asyncio.run(
+        service.wait_for_run_change(run.pipeline_id, run.id, 1, timeout=0.05)
+    )
+
+    assert result is None
+
+
+def test_wait_for_run_change_rechecks_on_timeout(db_session):
+    """A change made by another process is returned, not reported unchanged"""
+    run = _create_run(db_session)
+    service = RunService(db_session)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(
+            service.wait_for_run_change(run.pipeline_id, run.id, 1, timeout=0.1)
+        )
+        await asyncio.sleep(0.02)
+        # Committed without an event, as by a worker this process can't hear
+        run.status = RunStatus.RUNNING
+        db_session.commit()
+        return await waiter
+
+    result = asyncio.run(scenario())
+
+    assert result.version == 2
+
+
+def test_wait_for_run_change_wakes_on_run_event(db_session):
+    """A published change wakes the waiter, which returns the new version"""
+    run = _create_run(db_session)
+    service = RunService(db_session)
+
+    async def change_later():
+        await asyncio.sleep(0.05)
+        run.status = RunStatus.RUNNING
+        db_session.commit()
+        service._publish_run(run)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(
+            service.wait_for_run_change(run.pipeline_id, run.id, 1, timeout=5)
+        )
+        await change_later()
+        return await waiter
+
+    result = asyncio.run(scenario())
+
+    assert result.version == 2
+    assert result.status.value == "RUNNING"
+
+
+def test_batch_get_runs_reports_misses(client, db_session):
+    """Runs come back in one request with their stage runs; misses are listed"""
+    pipeline = _seed_runs(db_session)
+    other = Pipeline(name="Other Pipeline")
+    db_session.add(other)
+    db_session.commit()
+    run_ids = [str(run.id) for run in pipeline.runs]
+    unknown = "00000000-0000-0000-0000-000000000000"
+
+    response = client.post(
+        "/v1/runs/batch_get",
+        json={
+            "runIds": run_ids[:2] + [unknown, "not-a-uuid"],
+            "runs": [
+                {"pipelineId": str(pipeline.id), "runId": run_ids[2]},
+                {"pipelineId": str(other.id), "runId": run_ids[3]},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [run["id"] for run in data["runs"]] == run_ids[:3]
+    assert all(run["stageRuns"] == [] for run in data["runs"])
+    assert set(data["missing"]) == {unknown, "not-a-uuid", run_ids[3]}
+
+
+def test_batch_get_runs_requires_ids(client):
+    """An empty batch is rejected"""
+    assert client.post("/v1/runs/batch_get", json={}).status_code == 422
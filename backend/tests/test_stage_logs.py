@@ -0,0 +1,105 @@
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.models.schema.run import PipelineRun, RunStatus, StageLogChunk, StageRun
+from src.services.log_service import StageLogService, StageLogWriter
+
+LOG = b"".join(f"line {i}\n".encode() for i in range(20))
+
+
+@pytest.fixture
+def stage_run(db_session, monkeypatch):
+    """A finished stage run whose log is split over many small chunks"""
+    monkeypatch.setattr(settings, "stage_log_chunk_bytes", 16)
+    pipeline = Pipeline(name="Chatty Pipeline")
+    stage = PipelineStage(
+        pipeline=pipeline, name="Train", stage_type=StageType.MODEL_TRAINING, order=0
+    )
+    run = PipelineRun(pipeline=pipeline, status=RunStatus.COMPLETED)
+    db_session.add_all([pipeline, stage, run])
+    db_session.flush()
+    stage_run = StageRun(
+        pipeline_run_id=run.id, stage_id=stage.id, status=RunStatus.COMPLETED
+    )
+    db_session.add(stage_run)
+    db_session.commit()
+
+    with StageLogWriter(StageLogService(db_session), stage_run.id) as log:
+        for i in range(20):
+            log.write(f"line {i}\n")
+    db_session.commit()
+    return stage_run
+
+
+def test_logs_are_stored_as_compressed_chunks(db_session, stage_run):
+    """Appends become bounded chunks that read back as one stream"""
+    service = StageLogService(db_session)
+    chunks = (
+        db_session.query(StageLogChunk)
+        .filter(StageLogChunk.stage_run_id == stage_run.id)
+        .order_by(StageLogChunk.byte_offset)
+        .all()
+    )
+
+    assert all(chunk.byte_length <= 16 for chunk in chunks)
+    assert b"".join(zlib.decompress(chunk.data) for chunk in chunks) == LOG
+    assert service.size(stage_run.id) == len(LOG)
+    assert service.read(stage_run.id, 10, 30) == (10, LOG[10:40], len(LOG))
+    assert service.read(stage_run.id, -8) == (len(LOG) - 8, LOG[-8:], len(LOG))
+    assert service.tail(stage_run.id, 3)[1] == b"line 17\nline 18\nline 19\n"
+    # The run row itself stays small
+    assert db_session.get(StageRun, stage_run.id).logs is None
+
+
+def test_stage_log_endpoints(client: TestClient, stage_run):
+    """Range, tail and follow reads of a stage run's log"""
+    run = stage_run.pipeline_run
+    url = f"/v1/pipelines/{run.pipeline_id}/runs/{run.id}/stages/{stage_run.id}/logs"
+
+    response = client.get(url, headers={"Range": "bytes=7-20"})
+    assert response.status_code == 206
+    assert response.content == LOG[7:21]
+    assert response.headers["content-range"] == f"bytes 7-20/{len(LOG)}"
+
+    response = client.get(url, headers={"Range": f"bytes={len(LOG)}-"})
+    assert response.status_code == 416
+    response = client.get(url, headers={"Range": "bytes=-0"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(LOG)}"
+
+    response = client.get(f"{url}/tail", params={"lines": 2})
+    assert response.text == "line 18\nline 19\n"
+    assert response.headers["x-log-size"] == str(len(LOG))
+
+    # The stage run is finished, so following ends after the last byte
+    response = client.get(f"{url}/follow", params={"offset": 0})
+    assert response.content == LOG
+
+    missing = url.replace(str(stage_run.id), str(run.id))
+    assert client.get(f"{missing}/tail").status_code == 404
+
+
+def test_append_retry_keeps_the_callers_changes(db_session, stage_run, monkeypatch):
+    """A conflicting append is retried without rolling back other changes"""
+    service = StageLogService(db_session)
+    real_size = service.size
+    stale = [0]  # Another writer already stored this offset
+
+    def size(stage_run_id):
+        return stale.pop() if stale else real_size(stage_run_id)
+
+    monkeypatch.setattr(service, "size", size)
+    stage_run.error_message = "pending with the log"
+
+    assert service.append(stage_run.id, b"more\n") == len(LOG) + 5
+    db_session.commit()
+    db_session.expire_all()
+
+    assert db_session.get(StageRun, stage_run.id).error_message == (
+        "pending with the log"
+    )
+    assert service.tail(stage_run.id, 1)[1] == b"more\n"
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+
+def test_server_import_leaves_rarely_used_modules_unloaded():
+    """Migrations, psutil and artifact DTOs load on first use, not at import"""
+    lazy = [
+        "alembic",
+        "psutil",
+        "src.models.dto.artifact",
+        "src.core.config.environments",
+    ]
+    code = (
+        "import sys, src.server; "
+        f"print([name for name in {lazy!r} if name in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+from src.core.sketch import QuantileSketch
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.models.schema.run import PipelineRun, RunStatus, StageRun
+from src.services.stats_service import StatsService
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    """Sketch quantiles stay within the configured relative error"""
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in range(1, 1001):
+        sketch.add(float(value))
+
+    assert abs(sketch.quantile(0.5) - 500) / 500 <= 0.01
+    assert abs(sketch.quantile(0.95) - 950) / 950 <= 0.01
+
+
+def test_sketch_merge_matches_single_sketch():
+    """Merging two sketches equals sketching all samples at once"""
+    left, right, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in range(1, 501):
+        left.add(float(value))
+        combined.add(float(value))
+    for value in range(501, 1001):
+        right.add(float(value))
+        combined.add(float(value))
+
+    left.merge(QuantileSketch.from_dict(right.to_dict()))
+
+    assert left.count == combined.count
+    assert left.quantile(0.95) == combined.quantile(0.95)
+
+
+def test_record_terminal_run_updates_stats(db_session):
+    """Each terminal run is folded into pipeline and stage statistics"""
+    pipeline = Pipeline(name="Stats Pipeline")
+    db_session.add(pipeline)
+    db_session.flush()
+    stage = PipelineStage(
+        pipeline_id=pipeline.id,
+        name="Train",
+        stage_type=StageType.MODEL_TRAINING,
+        order=0,
+    )
+    db_session.add(stage)
+    db_session.flush()
+
+    service = StatsService(db_session)
+    for status, duration in [
+        (RunStatus.COMPLETED, 10.0),
+        (RunStatus.COMPLETED, 20.0),
+        (RunStatus.FAILED, 30.0),
+    ]:
+        run = PipelineRun(
+            pipeline_id=pipeline.id,
+            status=status,
+            execution_time=duration,
+            completed_at=datetime.utcnow(),
+            max_memory_usage=200.0,
+            max_cpu_usage=50.0,
+        )
+        db_session.add(run)
+        db_session.flush()
+        db_session.add(
+            StageRun(
+                pipeline_run_id=run.id,
+                stage_id=stage.id,
+                status=status,
+                execution_time=duration,
+            )
+        )
+        db_session.flush()
+        db_session.refresh(run)
+        service.record_terminal_run(run)
+        db_session.commit()
+
+    stats = service.get_pipeline_stats(pipeline.id)
+
+    assert stats.total_runs == 3
+    assert stats.completed_runs == 2
+    assert stats.failed_runs == 1
+    assert abs(stats.success_rate - 2 / 3) < 1e-9
+    assert abs(stats.p50_duration - 20.0) / 20.0 <= 0.01
+    assert stats.mean_memory_usage == 200.0
+    assert len(stats.stages) == 1
+    assert stats.stages[0].total_runs == 3
+
+    db_session.refresh(pipeline)
+    assert pipeline.execution_time == 20.0
+    assert pipeline.cpu_usage == 50.0
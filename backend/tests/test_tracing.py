@@ -0,0 +1,110 @@
+import asyncio
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+from src.core.tracing import FileSpanExporter, parse_traceparent, tracer
+from src.models.dto import TriggerRunRequest
+from src.models.schema.pipeline import Pipeline, PipelineStage, StageType
+from src.models.schema.run import PipelineRun
+from src.services.run_service import RunService
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def traces(tmp_path, monkeypatch):
+    """Trace into a file; returns a function reading back the exported spans"""
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(tracer, "_exporter", FileSpanExporter(str(path)))
+
+    def spans():
+        tracer.flush()
+        return [
+            span
+            for line in path.read_text().splitlines()
+            for resource in json.loads(line)["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+    return spans
+
+
+def test_traceparent_parsing():
+    context = parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01")
+
+    assert (context.trace_id, context.span_id) == (TRACE_ID, PARENT_ID)
+    assert context.traceparent == f"00-{TRACE_ID}-{PARENT_ID}-01"
+    assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_requests_continue_the_callers_trace(client: TestClient, traces):
+    response = client.get(
+        "/health/live", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+    )
+
+    assert response.headers["x-trace-id"] == TRACE_ID
+    (span,) = [span for span in traces() if span["kind"] == 2]
+    assert span["name"] == "GET /health/live"
+    assert span["traceId"] == TRACE_ID
+    assert span["parentSpanId"] == PARENT_ID
+    assert {"key": "http.status_code", "value": {"intValue": "200"}} in span[
+        "attributes"
+    ]
+
+
+def test_a_run_is_traced_from_trigger_to_stages(db_session, traces, monkeypatch):
+    """Queue wait, execution, stage attempts and DB writes share one trace"""
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda seconds: sleep(min(seconds, 0.01)))
+    monkeypatch.setattr(random, "random", lambda: 0.0)
+    pipeline = Pipeline(name="Traced Pipeline")
+    db_session.add_all(
+        [
+            pipeline,
+            PipelineStage(
+                pipeline=pipeline,
+                name="Train",
+                stage_type=StageType.MODEL_TRAINING,
+                order=0,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    async def scenario():
+        RunService(db_session).trigger_run(
+            pipeline.id, TriggerRunRequest(triggered_by="tracing_test")
+        )
+        current = asyncio.current_task()
+        await asyncio.gather(*(t for t in asyncio.all_tasks() if t is not current))
+
+    asyncio.run(scenario())
+
+    spans = traces()
+    by_name = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+    assert {span["traceId"] for span in spans} == {by_name["trigger_run"][0]["traceId"]}
+
+    enqueue = by_name["run.enqueue"][0]
+    assert enqueue["parentSpanId"] == by_name["trigger_run"][0]["spanId"]
+    run = db_session.query(PipelineRun).one()
+    assert parse_traceparent(run.traceparent).span_id == enqueue["spanId"]
+
+    # The executor picks the trace up from the run, as another process would
+    execute = by_name["run.execute"][0]
+    assert execute["parentSpanId"] == enqueue["spanId"]
+    assert by_name["run.queued"][0]["parentSpanId"] == enqueue["spanId"]
+    stage = by_name["stage"][0]
+    assert stage["parentSpanId"] == execute["spanId"]
+    assert by_name["stage.execute"][0]["parentSpanId"] == stage["spanId"]
+    assert len(by_name["db.commit"]) == 4  # Run start and end, stage start and end